@@ -0,0 +1,46 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3d7b1c9e5a21
+Revises: a4f925a89714
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7b1c9e5a21'
+down_revision: Union[str, None] = 'a4f925a89714'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY so listings keep serving writes while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index('idx_annotations_updated_at_id', 'annotations', ['updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_annotations_created_at_id', 'annotations', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_annotations_area_id', 'annotations', [sa.text('area DESC NULLS LAST'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_images_created_at_id', 'images', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_images_file_name_id', 'images', ['file_name', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_images_dataset_created_at_id', 'images', ['dataset_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_images_status_created_at_id', 'images', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_datasets_created_at_id', 'datasets', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_datasets_name_id', 'datasets', ['name', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_user_rewards_user_created_at_id', 'user_rewards', ['user_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_user_rewards_user_created_at_id', table_name='user_rewards', postgresql_concurrently=True)
+        op.drop_index('idx_datasets_name_id', table_name='datasets', postgresql_concurrently=True)
+        op.drop_index('idx_datasets_created_at_id', table_name='datasets', postgresql_concurrently=True)
+        op.drop_index('idx_images_status_created_at_id', table_name='images', postgresql_concurrently=True)
+        op.drop_index('idx_images_dataset_created_at_id', table_name='images', postgresql_concurrently=True)
+        op.drop_index('idx_images_file_name_id', table_name='images', postgresql_concurrently=True)
+        op.drop_index('idx_images_created_at_id', table_name='images', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_area_id', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_created_at_id', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_updated_at_id', table_name='annotations', postgresql_concurrently=True)
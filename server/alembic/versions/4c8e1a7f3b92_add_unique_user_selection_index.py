@@ -0,0 +1,48 @@
+"""Add unique (user, image, key, category) index on user_annotation_selections
+
+Revision ID: 4c8e1a7f3b92
+Revises: 7b2f9d4e6a15
+Create Date: 2026-10-17 21:14:47.630915
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1a7f3b92'
+down_revision: Union[str, None] = '7b2f9d4e6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the oldest of any duplicate selections so the unique index can be built
+    op.execute(
+        """
+        DELETE FROM user_annotation_selections duplicate
+        USING user_annotation_selections original
+        WHERE duplicate.user_id = original.user_id
+          AND duplicate.image_id = original.image_id
+          AND duplicate.selected_annotation_ids_key = original.selected_annotation_ids_key
+          AND duplicate.category_id IS NOT DISTINCT FROM original.category_id
+          AND duplicate.id > original.id
+        """
+    )
+
+    # NULLS NOT DISTINCT (Postgres 15+): selections without a category are unique too
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_selection_user_choice',
+            'user_annotation_selections',
+            ['user_id', 'image_id', 'selected_annotation_ids_key', 'category_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            postgresql_nulls_not_distinct=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_selection_user_choice', table_name='user_annotation_selections', postgresql_concurrently=True)
@@ -0,0 +1,120 @@
+"""Replace selected_annotation_ids_key with selection_hash and an id array
+
+Revision ID: 5e7b3d9a1c64
+Revises: 9d3a6c2e8f41
+Create Date: 2026-10-17 22:41:06.218504
+
+Runs without blocking writes for the length of the table: the new columns are
+backfilled in batches of BACKFILL_BATCH_SIZE rows (one transaction each), NOT
+NULL is set through a validated CHECK constraint (no table scan under the
+ACCESS EXCLUSIVE lock), and the indexes are built CONCURRENTLY under temporary
+names before the old ones are dropped and the new ones renamed.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7b3d9a1c64'
+down_revision: Union[str, None] = '9d3a6c2e8f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+# Same value as app.utils.annotation_selection.selection_fingerprint(ids)
+# for a normalized key "1,3,4": first 8 bytes of its SHA-256 as a signed BIGINT
+SELECTION_FINGERPRINT_SQL = (
+    "('x' || left(encode(sha256(convert_to(selected_annotation_ids_key, 'UTF8')), 'hex'), 16))::bit(64)::bigint"
+)
+
+# (table, {index name: (columns, unique)}) whose key column is replaced
+KEYED_INDEXES = [
+    ('user_annotation_selections', {
+        'idx_selection_lookup': (['image_id', '{key}', 'category_id'], False),
+        'uq_selection_user_choice': (['user_id', 'image_id', '{key}', 'category_id'], True),
+    }),
+    ('selection_consensus', {
+        'uq_selection_consensus_group': (['image_id', '{key}', 'category_id'], True),
+    }),
+]
+
+
+def _backfill(table: str, assignments: str, missing: str) -> None:
+    """UPDATE rows matching `missing` in batches, each committed on its own (autocommit block)"""
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(
+            f"""
+            UPDATE {table}
+            SET {assignments}
+            WHERE id IN (SELECT id FROM {table} WHERE {missing} LIMIT {BACKFILL_BATCH_SIZE})
+            """
+        ))
+        if result.rowcount == 0:
+            break
+
+
+def _set_not_null(table: str, column: str) -> None:
+    """SET NOT NULL backed by a CHECK constraint validated without blocking writes"""
+    constraint = f"ck_{table}_{column}_not_null"[:63]
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID")
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+    op.alter_column(table, column, nullable=False)
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}")
+
+
+def _replace_indexes(table: str, indexes: dict, key_column: str) -> None:
+    """Build the indexes on key_column CONCURRENTLY, then swap them in for the old ones (autocommit block)"""
+    for name, (columns, unique) in indexes.items():
+        op.create_index(
+            f'{name}_new',
+            table,
+            [column.format(key=key_column) for column in columns],
+            unique=unique,
+            postgresql_concurrently=True,
+            postgresql_nulls_not_distinct=unique or None
+        )
+    for name in indexes:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    for table, indexes in KEYED_INDEXES:
+        op.add_column(table, sa.Column('selected_annotation_ids', sa.ARRAY(sa.BigInteger(), dimensions=1), nullable=True, comment='Sorted, de-duplicated annotation IDs'))
+        op.add_column(table, sa.Column('selection_hash', sa.BigInteger(), nullable=True, comment='64-bit fingerprint of selected_annotation_ids (selection_fingerprint)'))
+
+        with op.get_context().autocommit_block():
+            # Keys are already sorted and de-duplicated by normalize_annotation_ids
+            _backfill(
+                table,
+                "selected_annotation_ids = string_to_array(selected_annotation_ids_key, ',')::bigint[], "
+                f"selection_hash = {SELECTION_FINGERPRINT_SQL}",
+                "selection_hash IS NULL"
+            )
+            _set_not_null(table, 'selected_annotation_ids')
+            _set_not_null(table, 'selection_hash')
+            _replace_indexes(table, indexes, 'selection_hash')
+
+        op.drop_column(table, 'selected_annotation_ids_key')
+
+
+def downgrade() -> None:
+    for table, indexes in KEYED_INDEXES:
+        op.add_column(table, sa.Column('selected_annotation_ids_key', sa.String(length=500), nullable=True, comment="Comma-separated sorted annotation IDs (e.g., '1,3,4')"))
+
+        with op.get_context().autocommit_block():
+            _backfill(
+                table,
+                "selected_annotation_ids_key = array_to_string(selected_annotation_ids, ',')",
+                "selected_annotation_ids_key IS NULL"
+            )
+            _set_not_null(table, 'selected_annotation_ids_key')
+            _replace_indexes(table, indexes, 'selected_annotation_ids_key')
+
+        op.drop_column(table, 'selection_hash')
+        op.drop_column(table, 'selected_annotation_ids')
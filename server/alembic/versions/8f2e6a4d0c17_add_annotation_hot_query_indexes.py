@@ -0,0 +1,37 @@
+"""Add composite and partial indexes for annotation hot queries
+
+Revision ID: 8f2e6a4d0c17
+Revises: 3d7b1c9e5a21
+Create Date: 2026-10-17 14:03:27.902415
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2e6a4d0c17'
+down_revision: Union[str, None] = '3d7b1c9e5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plans using these indexes are checked by scripts/check_annotation_query_plans.py
+    with op.get_context().autocommit_block():
+        op.create_index('idx_annotations_image_source_status', 'annotations', ['image_id', 'source_type', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_annotations_source_status_updated_at', 'annotations', ['source_type', 'status', 'updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_annotations_user_approved_updated_at', 'annotations', ['updated_at', 'id'], unique=False, postgresql_where=sa.text("source_type = 'USER' AND status = 'APPROVED'"), postgresql_concurrently=True)
+        op.create_index('idx_annotations_category_updated_at_id', 'annotations', ['category_id', 'updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_annotations_category_area_id', 'annotations', ['category_id', sa.text('area DESC NULLS LAST'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+    op.execute('ANALYZE annotations')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_annotations_category_area_id', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_category_updated_at_id', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_user_approved_updated_at', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_source_status_updated_at', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('idx_annotations_image_source_status', table_name='annotations', postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""Add (dataset_id, id) index on images
+
+Revision ID: e1d4b8a26f93
+Revises: c5a9e3f17b42
+Create Date: 2026-10-17 18:22:51.104738
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1d4b8a26f93'
+down_revision: Union[str, None] = 'c5a9e3f17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_images_dataset_id_id', 'images', ['dataset_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_images_dataset_id_id', table_name='images', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""Add derivative_format to images
+
+Revision ID: f2c7a9d41e86
+Revises: d83a5c1f7e29
+Create Date: 2026-10-17 23:48:12.604317
+
+Derivative blob names end in their format, so the format is stored per image
+instead of being read from the (mutable) image_derivative_format setting.
+Images that already have derivatives were rendered with the setting's default,
+webp; deployments that changed it must pass the format they used, e.g.
+`alembic -x derivative_format=jpeg upgrade head`.
+
+"""
+from typing import Sequence, Union
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7a9d41e86'
+down_revision: Union[str, None] = 'd83a5c1f7e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    derivative_format = context.get_x_argument(as_dictionary=True).get('derivative_format', 'webp')
+    if derivative_format not in ('webp', 'jpeg'):
+        raise ValueError("derivative_format must be 'webp' or 'jpeg'")
+
+    op.add_column('images', sa.Column('derivative_format', sa.String(length=10), nullable=True))
+    op.execute(
+        sa.text("UPDATE images SET derivative_format = :derivative_format WHERE has_derivatives")
+        .bindparams(derivative_format=derivative_format)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('images', 'derivative_format')
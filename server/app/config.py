@@ -84,6 +84,77 @@ class Settings(BaseSettings):
     google_application_credentials: Optional[str] = None
     google_cloud_project: Optional[str] = None
     gcs_bucket_name: str = "noyes_test"
+    storage_backend: str = "gcs"  # gcs | local (files under local_storage_root, for development, tests and benchmarks)
+    local_storage_root: str = "./storage"
+    storage_http_pool_size: int = 32  # Connections the shared GCS client keeps open
+    storage_io_workers: int = 8  # Threads running blocking uploads and deletes
+    max_image_upload_bytes: int = 20 * 1024 * 1024  # Largest image accepted by POST /images/first-person
+    image_derivatives_on_upload: bool = True  # Render thumbnail/medium variants after each first-person upload
+    image_derivative_format: str = "webp"  # webp | jpeg
+    image_derivative_quality: int = 80
+    image_thumbnail_size: int = 256  # Long side in pixels
+    image_medium_size: int = 1024
+    signed_url_signer: str = "storage"  # storage (the storage backend) | fake (offline URLs for development and tests)
+    signed_url_expiration_seconds: float = 3600.0
+    signed_url_refresh_margin_seconds: float = 600.0  # Re-sign cached URLs this long before they expire
+    signed_url_cache_max_entries: int = 50000
+    
+    # Annotation processing
+    polygon_write_through: bool = True  # Persist polygons computed on read back to annotations.polygon
+    image_annotations_cache_max_bytes: int = 64 * 1024 * 1024  # Per-worker response cache size (0 disables)
+    image_annotations_cache_ttl_seconds: float = 60.0
+    mask_result_transport: str = "pickle"  # Process pool result transport: pickle | shared_memory
+    mask_dispatch_inline_max_ms: float = 5.0  # Estimated cost up to which masks are converted on the event loop
+    mask_dispatch_thread_max_ms: float = 50.0  # Up to this cost on the thread pool, above it on the process pool
+    mask_dispatch_min_chunk_ms: float = 20.0  # Smallest estimated cost worth one process pool call
+    process_pool_workers: int = 0  # Mask process pool size (0 = min(CPU cores, 10))
+    process_pool_max_tasks_per_child: int = 500  # Recycle the pool after workers * this many tasks (0 = never)
+    
+    # Selection merges
+    selection_merge_mode: str = "inline"  # inline (in the approving request) | queue (merge_jobs; requires a running scripts/merge_worker.py)
+    merge_job_max_attempts: int = 5
+    merge_job_retry_delay_seconds: float = 10.0  # Doubles after every failed attempt
+    merge_job_lease_seconds: float = 300.0  # RUNNING jobs older than this are requeued (worker died)
+    
+    # Listing counts
+    count_estimate_threshold: int = 10000  # Totals above this planner estimate are returned as estimates (0 = always exact)
+    count_cache_ttl_seconds: float = 30.0  # Exact totals are cached per table and filters for this long (0 disables)
+    count_cache_max_entries: int = 1024
+    
+    @validator("storage_backend")
+    def validate_storage_backend(cls, v: str) -> str:
+        """이미지 저장소 backend 검증"""
+        if v not in ("gcs", "local"):
+            raise ValueError("storage_backend must be 'gcs' or 'local'")
+        return v
+    
+    @validator("image_derivative_format")
+    def validate_image_derivative_format(cls, v: str) -> str:
+        """이미지 파생본 포맷 검증"""
+        if v not in ("webp", "jpeg"):
+            raise ValueError("image_derivative_format must be 'webp' or 'jpeg'")
+        return v
+    
+    @validator("signed_url_signer")
+    def validate_signed_url_signer(cls, v: str) -> str:
+        """Signed URL 서명 방식 검증"""
+        if v not in ("storage", "fake"):
+            raise ValueError("signed_url_signer must be 'storage' or 'fake'")
+        return v
+    
+    @validator("mask_result_transport")
+    def validate_mask_result_transport(cls, v: str) -> str:
+        """마스크 처리 결과 전송 방식 검증"""
+        if v not in ("pickle", "shared_memory"):
+            raise ValueError("mask_result_transport must be 'pickle' or 'shared_memory'")
+        return v
+    
+    @validator("selection_merge_mode")
+    def validate_selection_merge_mode(cls, v: str) -> str:
+        """선택 병합 실행 방식 검증"""
+        if v not in ("queue", "inline"):
+            raise ValueError("selection_merge_mode must be 'queue' or 'inline'")
+        return v
     
     class Config:
         """Pydantic 설정"""
@@ -8,13 +8,17 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import time
 from prometheus_fastapi_instrumentator import Instrumentator
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
 from .config import settings
-from .database import test_db_connection
+from .database import get_database_url, test_db_connection
+from .services.annotation_service import start_image_annotations_listener, stop_image_annotations_listener
+from .utils.process_manager import start_process_pool, shutdown_process_pool, shutdown_thread_pool
+from .utils.storage import LOCAL_STORAGE_URL_PATH, get_storage_backend_name, start_storage, shutdown_storage
 from .routers import (
     user_router,
     dataset_router,
@@ -71,11 +75,28 @@ async def lifespan(app: FastAPI):
         print("❌ Database connection failed")
         DATABASE_CONNECTION_STATUS.set(0)
     
+    # Start and warm up mask processing workers before serving requests
+    await start_process_pool()
+    
+    # Create the shared storage client (one pooled HTTP session per process)
+    try:
+        backend = start_storage()
+        print(f"✅ Storage backend ready ({backend.name})")
+    except Exception as e:
+        print(f"❌ Storage backend initialization failed: {e}")
+    
+    # Drop cached image annotations changed by other processes (merge worker)
+    start_image_annotations_listener(get_database_url().replace("postgresql+asyncpg", "postgresql"))
+    
     yield
     
     # Shutdown
     print("🔄 Shutting down OpenGraph API Server...")
     DATABASE_CONNECTION_STATUS.set(0)
+    await stop_image_annotations_listener()
+    shutdown_process_pool()
+    shutdown_thread_pool()
+    shutdown_storage()
 
 
 app = FastAPI(
@@ -205,6 +226,10 @@ app.include_router(task_router, prefix="/api/v1")
 app.include_router(admin_router, prefix="/api/v1")
 app.include_router(user_reward_router, prefix="/api/v1")
 
+# Serve blobs of the local storage backend (development, tests and benchmarks)
+if get_storage_backend_name() == "local":
+    app.mount(LOCAL_STORAGE_URL_PATH, StaticFiles(directory=settings.local_storage_root, check_dir=False), name="storage")
+
 
 @app.get("/")
 async def root():
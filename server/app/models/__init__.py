@@ -13,6 +13,8 @@ from .category import Category
 from .dictionary_category import DictionaryCategory
 from .annotation import Annotation
 from .user_annotation_selection import UserAnnotationSelection
+from .selection_consensus import SelectionConsensus
+from .merge_job import MergeJob
 from .user_reward import UserReward, RewardType
 
 __all__ = [
@@ -26,6 +28,8 @@ __all__ = [
     "DictionaryCategory",
     "Annotation",
     "UserAnnotationSelection",
+    "SelectionConsensus",
+    "MergeJob",
     "UserReward",
     "RewardType"
 ] 
\ No newline at end of file
@@ -6,7 +6,7 @@ SQLAlchemy model for unified annotation management (both auto-generated and user
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, BigInteger, String, DateTime, func, ForeignKey, Boolean, ARRAY, Float, CheckConstraint, Text
+from sqlalchemy import Column, BigInteger, String, DateTime, func, ForeignKey, Boolean, ARRAY, Float, CheckConstraint, Text, Index, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from ..database import Base
@@ -94,6 +94,23 @@ class Annotation(Base):
             "source_type IN ('AUTO', 'USER')",
             name="check_annotation_source_type"
         ),
+        # 커서 페이지네이션 정렬 순서별 인덱스 (정렬 컬럼, id)
+        Index('idx_annotations_updated_at_id', 'updated_at', 'id'),
+        Index('idx_annotations_created_at_id', 'created_at', 'id'),
+        Index('idx_annotations_area_id', text('area DESC NULLS LAST'), text('id DESC')),
+        # 이미지별 어노테이션 조회 (image_id + source_type/status 필터)
+        Index('idx_annotations_image_source_status', 'image_id', 'source_type', 'status'),
+        # source_type/status 필터 + updated_at 정렬 목록
+        Index('idx_annotations_source_status_updated_at', 'source_type', 'status', 'updated_at', 'id'),
+        # 승인된 사용자 어노테이션 목록 (가장 많이 조회되는 조합, 부분 인덱스)
+        Index(
+            'idx_annotations_user_approved_updated_at',
+            'updated_at', 'id',
+            postgresql_where=text("source_type = 'USER' AND status = 'APPROVED'")
+        ),
+        # 카테고리 필터 + 정렬
+        Index('idx_annotations_category_updated_at_id', 'category_id', 'updated_at', 'id'),
+        Index('idx_annotations_category_area_id', 'category_id', text('area DESC NULLS LAST'), text('id DESC')),
     )
     
     def __repr__(self) -> str:
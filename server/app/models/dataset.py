@@ -6,7 +6,7 @@
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, BigInteger, String, DateTime, func, ForeignKey, ARRAY, Text
+from sqlalchemy import Column, BigInteger, String, DateTime, func, ForeignKey, ARRAY, Text, Index, Integer
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from ..database import Base
@@ -23,6 +23,10 @@ class Dataset(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     tags: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True)
     
+    # 통계 필드 (이미지/어노테이션 쓰기 경로에서 갱신, DatasetService.refresh_counts 로 재계산)
+    image_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    annotation_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    
     # 외래 키
     created_by: Mapped[Optional[int]] = mapped_column(
         BigInteger, 
@@ -62,6 +66,12 @@ class Dataset(Base):
         cascade="all, delete-orphan"
     )
     
+    # 커서 페이지네이션 정렬 순서별 인덱스 (정렬 컬럼, id)
+    __table_args__ = (
+        Index('idx_datasets_created_at_id', 'created_at', 'id'),
+        Index('idx_datasets_name_id', 'name', 'id'),
+    )
+    
     def __repr__(self) -> str:
         return f"<Dataset(id={self.id}, name={self.name}, created_by={self.created_by})>"
     
@@ -6,7 +6,7 @@ SQLAlchemy model for image information management
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, BigInteger, String, DateTime, func, ForeignKey, Integer, Enum
+from sqlalchemy import Column, BigInteger, Boolean, String, DateTime, func, ForeignKey, Integer, Enum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
 
@@ -32,6 +32,16 @@ class Image(Base):
     width: Mapped[int] = mapped_column(Integer, nullable=False)
     height: Mapped[int] = mapped_column(Integer, nullable=False)
     
+    # Thumbnail/medium variants stored next to the original (utils.image_derivatives)
+    has_derivatives: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false"
+    )
+    # Format the variants were rendered in (part of their blob names)
+    derivative_format: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    
     # Status field for approval workflow
     status: Mapped[ImageStatus] = mapped_column(
         Enum(ImageStatus),
@@ -95,6 +105,16 @@ class Image(Base):
         cascade="all, delete-orphan"
     )
     
+    # 커서 페이지네이션 정렬 순서별 인덱스 (정렬 컬럼, id)
+    __table_args__ = (
+        Index('idx_images_created_at_id', 'created_at', 'id'),
+        Index('idx_images_file_name_id', 'file_name', 'id'),
+        Index('idx_images_dataset_created_at_id', 'dataset_id', 'created_at', 'id'),
+        Index('idx_images_status_created_at_id', 'status', 'created_at', 'id'),
+        # 데이터셋 이미지 목록 (id 순서 페이지네이션)
+        Index('idx_images_dataset_id_id', 'dataset_id', 'id'),
+    )
+    
     def __repr__(self) -> str:
         return f"<Image(id={self.id}, file_name={self.file_name}, dataset_id={self.dataset_id})>"
     
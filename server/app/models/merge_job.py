@@ -0,0 +1,106 @@
+"""
+Merge Job 모델
+
+승인된 어노테이션 선택 그룹의 마스크 병합 작업 큐입니다. 승인 트랜잭션에서
+PENDING 작업이 추가되고, scripts/merge_worker.py 가 FOR UPDATE SKIP LOCKED로
+작업을 가져가 병합 어노테이션을 생성합니다.
+
+    PENDING -> RUNNING -> DONE
+                       -> PENDING (재시도, run_after 이후) -> ... -> FAILED
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import ARRAY, BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class MergeJob(Base):
+    __tablename__ = "merge_jobs"
+
+    # Primary Key
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    # 같은 키의 작업은 한 번만 추가됨 (e.g. "selection_consensus:42")
+    idempotency_key: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+
+    # Payload
+    consensus_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("selection_consensus.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    image_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("images.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    annotation_ids: Mapped[List[int]] = mapped_column(
+        ARRAY(BigInteger, dimensions=1),
+        nullable=False,
+        comment="Annotations whose masks are merged"
+    )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("categories.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Execution state
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="PENDING",
+        server_default="PENDING",
+        comment="PENDING, RUNNING, DONE, FAILED"
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="Not claimed before this time (retry backoff)"
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Result
+    merged_annotation_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("annotations.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Claim query: PENDING jobs in run_after order
+        Index(
+            'idx_merge_jobs_pending',
+            'run_after', 'id',
+            postgresql_where=text("status = 'PENDING'")
+        ),
+        # Lease expiry of jobs whose worker died
+        Index(
+            'idx_merge_jobs_running',
+            'locked_at',
+            postgresql_where=text("status = 'RUNNING'")
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MergeJob(id={self.id}, key={self.idempotency_key}, "
+            f"status={self.status}, attempts={self.attempts})>"
+        )
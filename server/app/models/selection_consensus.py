@@ -0,0 +1,113 @@
+"""
+Selection Consensus 모델
+
+동일한 어노테이션 선택 (image_id, selection_hash, category_id) 그룹별
+집계 테이블입니다. 선택 생성/삭제/승인 시 같은 트랜잭션에서 upsert로 갱신되어,
+자동 승인 임계값 확인과 이미지별 선택 통계가 GROUP BY 없이 조회됩니다.
+
+그룹 승인은 이 행의 status를 PENDING -> APPROVED로 바꾸는 조건부 UPDATE로
+한 요청만 가져가므로, 병합 어노테이션은 그룹당 한 번만 생성됩니다.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import ARRAY, BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+if TYPE_CHECKING:
+    from .category import Category
+
+
+class SelectionConsensus(Base):
+    __tablename__ = "selection_consensus"
+
+    # Primary Key
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    # Group key (same columns as the selections it aggregates)
+    image_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("images.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    selected_annotation_ids: Mapped[List[int]] = mapped_column(
+        ARRAY(BigInteger, dimensions=1),
+        nullable=False,
+        comment="Sorted, de-duplicated annotation IDs"
+    )
+    selection_hash: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="64-bit fingerprint of selected_annotation_ids (selection_fingerprint)"
+    )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    # Aggregates
+    selection_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="All selections in the group"
+    )
+    pending_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="PENDING selections in the group (compared to the approval threshold)"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="PENDING",
+        server_default="PENDING",
+        comment="PENDING, APPROVED"
+    )
+
+    merged_annotation_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("annotations.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Annotation merged from the selected masks when the group was approved"
+    )
+
+    # Timestamps
+    first_selected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    last_selected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Relationships
+    category: Mapped[Optional["Category"]] = relationship("Category")
+
+    __table_args__ = (
+        # 그룹당 1행 (upsert 대상), 이미지별 통계 조회에도 사용
+        Index(
+            'uq_selection_consensus_group',
+            'image_id', 'selection_hash', 'category_id',
+            unique=True,
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SelectionConsensus(image_id={self.image_id}, "
+            f"annotations={self.selected_annotation_ids}, category_id={self.category_id}, "
+            f"pending_count={self.pending_count}, status={self.status})>"
+        )
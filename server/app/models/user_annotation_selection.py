@@ -5,10 +5,10 @@ User Annotation Selection 모델
 여러 AUTO 어노테이션을 조합하여 유의미한 entity를 만드는 사용자의 선택을 추적합니다.
 """
 
-from sqlalchemy import BigInteger, String, ForeignKey, DateTime, Index
+from sqlalchemy import ARRAY, BigInteger, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from ..database import Base
 
@@ -42,10 +42,15 @@ class UserAnnotationSelection(Base):
     )
     
     # Selection Data
-    selected_annotation_ids_key: Mapped[str] = mapped_column(
-        String(500),  # 충분한 길이로 설정 (예: "1,2,3,4,5,...")
+    selected_annotation_ids: Mapped[List[int]] = mapped_column(
+        ARRAY(BigInteger, dimensions=1),
         nullable=False,
-        comment="Comma-separated sorted annotation IDs (e.g., '1,3,4')"
+        comment="Sorted, de-duplicated annotation IDs"
+    )
+    selection_hash: Mapped[int] = mapped_column(
+        BigInteger,  # 고정 폭 인덱스 키 (선택 크기와 무관)
+        nullable=False,
+        comment="64-bit fingerprint of selected_annotation_ids (selection_fingerprint)"
     )
     
     # Status
@@ -78,7 +83,14 @@ class UserAnnotationSelection(Base):
         # 동일한 선택을 빠르게 찾기 위한 인덱스
         Index(
             'idx_selection_lookup', 
-            'image_id', 'selected_annotation_ids_key', 'category_id'
+            'image_id', 'selection_hash', 'category_id'
+        ),
+        # 사용자당 동일한 선택은 하나만 (배치 생성의 ON CONFLICT DO NOTHING 대상)
+        Index(
+            'uq_selection_user_choice',
+            'user_id', 'image_id', 'selection_hash', 'category_id',
+            unique=True,
+            postgresql_nulls_not_distinct=True
         ),
         # 사용자별 선택 조회를 위한 인덱스
         Index('idx_user_selections', 'user_id', 'created_at'),
@@ -92,6 +104,6 @@ class UserAnnotationSelection(Base):
         return (
             f"<UserAnnotationSelection(id={self.id}, "
             f"user_id={self.user_id}, image_id={self.image_id}, "
-            f"annotations={self.selected_annotation_ids_key}, "
+            f"annotations={self.selected_annotation_ids}, "
             f"category_id={self.category_id}, status={self.status})>"
         )
\ No newline at end of file
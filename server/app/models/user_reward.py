@@ -6,7 +6,7 @@ UserReward Model
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import BigInteger, String, DateTime, func, Integer, Enum, ForeignKey, Text
+from sqlalchemy import BigInteger, String, DateTime, func, Integer, Enum, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
 
@@ -80,6 +80,11 @@ class UserReward(Base):
         foreign_keys=[task_id]
     )
     
+    # 사용자별 리워드 커서 페이지네이션 인덱스
+    __table_args__ = (
+        Index('idx_user_rewards_user_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self) -> str:
         return f"<UserReward(id={self.id}, user_id={self.user_id}, points={self.points}, type={self.reward_type})>"
     
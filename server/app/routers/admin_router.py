@@ -25,6 +25,8 @@ router = APIRouter(
 async def get_pending_images(
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     search: Optional[str] = Query(None, description="Search in file names"),
     sort_by: Optional[str] = Query("created_at", description="Sort by field (created_at, file_name, width, height)"),
     db: AsyncSession = Depends(get_db)
@@ -33,12 +35,18 @@ async def get_pending_images(
     Admin only: Get all pending images for review
     """
     image_service = ImageService(db)
-    return await image_service.get_images_with_filters(
-        pagination=PaginationInput(page=page, limit=limit),
-        search=search,
-        sort_by=sort_by,
-        status=ImageStatus.PENDING
-    )
+    try:
+        return await image_service.get_images_with_filters(
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total),
+            search=search,
+            sort_by=sort_by,
+            status=ImageStatus.PENDING
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.put("/images/{image_id}/approve", response_model=ImageRead)
@@ -5,7 +5,7 @@
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..dependencies.database import get_db
@@ -32,27 +32,36 @@ router = APIRouter(
 
 @router.get("/", response_model=AnnotationListResponse)
 async def get_annotations(
+    background_tasks: BackgroundTasks,
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     sort_by: Optional[str] = Query(None, description="Sort by field (created_at, updated_at, area)"),
     image_id: Optional[int] = Query(None, description="Filter by image ID"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
-    status: Optional[str] = Query(None, description="Filter by exact status (PENDING, APPROVED, REJECTED)"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by exact status (PENDING, APPROVED, REJECTED)"),
     source_type: Optional[str] = Query(None, description="Filter by exact source type (AUTO, USER)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all annotations with optional filtering and sorting.
     """
-    annotation_service = AnnotationService(db)
-    return await annotation_service.get_annotations_with_filters(
-        pagination=PaginationInput(page=page, limit=limit),
-        sort_by=sort_by,
-        image_id=image_id,
-        category_id=category_id,
-        status=status,
-        source_type=source_type
-    )
+    annotation_service = AnnotationService(db, background_tasks)
+    try:
+        return await annotation_service.get_annotations_with_filters(
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total),
+            sort_by=sort_by,
+            image_id=image_id,
+            category_id=category_id,
+            status=status_filter,
+            source_type=source_type
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/", response_model=AnnotationRead, status_code=status.HTTP_201_CREATED)
@@ -77,17 +86,26 @@ async def create_annotation(
 
 @router.get("/approved", response_model=AnnotationListResponse)
 async def get_approved_annotations(
+    background_tasks: BackgroundTasks,
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all approved annotations.
     """
-    annotation_service = AnnotationService(db)
-    return await annotation_service.get_approved_user_annotations(
-        pagination=PaginationInput(page=page, limit=limit)
-    )
+    annotation_service = AnnotationService(db, background_tasks)
+    try:
+        return await annotation_service.get_approved_user_annotations(
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/{annotation_id}", response_model=AnnotationRead)
@@ -113,29 +131,31 @@ async def get_annotation(
 @router.get("/image/{image_id}", response_model=List[AnnotationClientRead])
 async def get_annotations_by_image(
     image_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all annotations for a specific image with client-friendly format (polygon data, no RLE)
     """
-    annotation_service = AnnotationService(db)
-    annotations = await annotation_service.get_annotations_by_image_id_for_client(image_id)
+    annotation_service = AnnotationService(db, background_tasks)
+    body = await annotation_service.get_image_annotations_for_client_json(image_id)
     
-    return annotations
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/image/{image_id}/approved", response_model=List[AnnotationClientRead])
 async def get_approved_annotations_by_image(
         image_id: int,
+        background_tasks: BackgroundTasks,
         db: AsyncSession = Depends(get_db)
 ):
     """
     Get all annotations for a specific image with client-friendly format (polygon data, no RLE)
     """
-    annotation_service = AnnotationService(db)
-    annotations = await annotation_service.get_approved_user_annotations_by_image_id_for_client(image_id)
+    annotation_service = AnnotationService(db, background_tasks)
+    body = await annotation_service.get_image_annotations_for_client_json(image_id, approved_only=True)
 
-    return annotations
+    return Response(content=body, media_type="application/json")
 
 
 # ==================== User Annotation Selections ====================
@@ -153,7 +173,13 @@ async def create_annotation_selection(
     If the same selection is made by five or more users, it is automatically marked as APPROVED.
     """
     selection_service = UserAnnotationSelectionService(db)
-    return await selection_service.create_selection(current_user.id, selection_data)
+    try:
+        return await selection_service.create_selection(current_user.id, selection_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/selections/batch", response_model=UserAnnotationSelectionBatchResponse, status_code=status.HTTP_201_CREATED)
@@ -185,7 +211,13 @@ async def create_annotation_selections_batch(
     }
     """
     selection_service = UserAnnotationSelectionService(db)
-    return await selection_service.create_selections_batch(current_user.id, batch_data)
+    try:
+        return await selection_service.create_selections_batch(current_user.id, batch_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/selections/me", response_model=List[UserAnnotationSelectionRead])
@@ -242,7 +274,13 @@ async def update_annotation_selection(
     Mainly used for category update or status change by administrator
     """
     selection_service = UserAnnotationSelectionService(db)
-    updated_selection = await selection_service.update_selection(selection_id, update_data)
+    try:
+        updated_selection = await selection_service.update_selection(selection_id, update_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not updated_selection:
         raise HTTPException(
@@ -6,6 +6,7 @@
 
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..dependencies.database import get_db
@@ -19,7 +20,8 @@ from ..schemas.dataset import (
     DatasetFilter,
 )
 from ..schemas.image import ImageListResponse
-from ..services import DatasetService, ImageService
+from ..services import AnnotationService, DatasetService, ImageService, DatasetExportService
+from ..services.export_service import EXPORT_FORMATS, SEGMENTATION_FORMATS, gzip_stream
 
 router = APIRouter(
     prefix="/datasets",
@@ -48,6 +50,8 @@ async def create_dataset(
 async def get_datasets(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     search: Optional[str] = Query(None, description="Search by name or description"),
     sort_by: Optional[str] = Query(None, description="Sort by field (name, created_at)"),
     db: AsyncSession = Depends(get_db)
@@ -78,13 +82,18 @@ async def get_datasets(
         page=page, 
         limit=limit,
         order_by=order_by,
-        order=order
+        order=order,
+        cursor=cursor,
+        include_total=include_total
     )
     
-    return await dataset_service.get_datasets_list(
-        pagination=pagination,
-        filter_params=filter_params
-    )
+    try:
+        return await dataset_service.get_datasets_list(
+            pagination=pagination,
+            filter_params=filter_params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{dataset_id}", response_model=DatasetRead)
@@ -181,14 +190,42 @@ async def get_dataset_images(
     dataset_id: int,
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all images in a dataset.
+    Get the images of a dataset, one page at a time in id order.
     """
-    dataset_service = DatasetService(db)
     image_service = ImageService(db)
     
+    try:
+        images = await image_service.get_dataset_images(dataset_id, page=page, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if images is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    
+    return images
+
+
+@router.get("/{dataset_id}/annotations/stream")
+async def stream_dataset_annotations(
+    dataset_id: int,
+    include_polygon: bool = Query(False, description="Include client polygon data"),
+    include_rle: bool = Query(False, description="Include COCO RLE segmentation (size, counts)"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by exact status (PENDING, APPROVED, REJECTED)"),
+    source_type: Optional[str] = Query(None, description="Filter by exact source type (AUTO, USER)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream every annotation of a dataset as NDJSON (one JSON object per line).
+    """
+    dataset_service = DatasetService(db)
+    
     # Check if dataset exists
     dataset = await dataset_service.get_dataset_by_id(dataset_id)
     if not dataset:
@@ -197,21 +234,63 @@ async def get_dataset_images(
             detail="Dataset not found"
         )
     
-    # Get images for the dataset
-    images = await image_service.get_images_by_dataset_id(dataset_id)
+    annotation_service = AnnotationService(db)
+    return StreamingResponse(
+        annotation_service.stream_dataset_annotations(
+            dataset_id,
+            include_polygon=include_polygon,
+            include_rle=include_rle,
+            status=status_filter,
+            source_type=source_type
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/{dataset_id}/export")
+async def export_dataset(
+    dataset_id: int,
+    export_format: str = Query("coco", alias="format", description="Export format (coco)"),
+    segmentation: str = Query("rle", description="Segmentation encoding (rle, polygon)"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Only export annotations with this status"),
+    gzip: bool = Query(False, description="Gzip the document on the fly"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export a dataset as a single COCO JSON document, streamed as it is generated.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {export_format}"
+        )
+    if segmentation not in SEGMENTATION_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported segmentation format: {segmentation}"
+        )
     
-    # Apply pagination
-    start = (page - 1) * limit
-    end = start + limit
-    paginated_images = images[start:end]
+    dataset_service = DatasetService(db)
     
-    total = len(images)
-    pages = (total + limit - 1) // limit
+    # Check if dataset exists
+    dataset = await dataset_service.get_dataset_by_id(dataset_id)
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
     
-    return ImageListResponse(
-        items=paginated_images,
-        total=total,
-        page=page,
-        limit=limit,
-        pages=pages
-    ) 
\ No newline at end of file
+    export_service = DatasetExportService(db)
+    body = export_service.stream_coco(dataset_id, segmentation=segmentation, status=status_filter)
+    file_name = f"dataset_{dataset_id}_coco.json"
+    media_type = "application/json"
+    if gzip:
+        body = gzip_stream(body)
+        file_name += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
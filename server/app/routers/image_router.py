@@ -5,11 +5,18 @@
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Query, UploadFile, File, Form
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import FormData, UploadFile as FormFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 import base64
 import io
+import json
 
+from ..config import settings
+from ..database import AsyncSessionLocal
 from ..dependencies.database import get_db
 from ..dependencies.auth import get_current_active_user
 from ..schemas.common import PaginationInput
@@ -59,49 +66,230 @@ async def add_image(
         )
 
 
-@router.post("/first-person", response_model=ImageRead, status_code=status.HTTP_201_CREATED)
+FIRST_PERSON_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "task_id"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "task_id": {"type": "integer"},
+                        "file_name": {"type": "string", "description": "Defaults to the uploaded file's name"}
+                    }
+                }
+            },
+            "application/json": {
+                "schema": FirstPersonImageCreate.model_json_schema()
+            }
+        }
+    }
+}
+
+
+@router.post(
+    "/first-person",
+    response_model=ImageRead,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=FIRST_PERSON_UPLOAD_OPENAPI
+)
 async def add_first_person_image(
-    image_data: FirstPersonImageCreate,
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Add a new first-person image with task association.
+    
+    multipart/form-data (file, task_id, file_name) is copied to storage in
+    chunks. JSON (FirstPersonImageCreate with an image URL or base64 data URL)
+    is still accepted for existing clients. Thumbnail and medium variants of
+    uploaded images are rendered after the response is sent.
     """
     image_service = ImageService(db)
     
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        image = await _upload_first_person_image(request, image_service, current_user.id)
+        if settings.image_derivatives_on_upload:
+            background_tasks.add_task(_generate_derivatives, image.id)
+        return image
+    
+    try:
+        image_data = FirstPersonImageCreate.model_validate(await request.json())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be JSON or multipart/form-data"
+        )
+    
     try:
-        return await image_service.create_first_person_image(image_data, current_user.id)
+        image = await image_service.create_first_person_image(image_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    
+    if settings.image_derivatives_on_upload and image_data.image_url.startswith('data:image'):
+        background_tasks.add_task(_generate_derivatives, image.id)
+    return image
+
+
+async def _generate_derivatives(image_id: int) -> None:
+    """Background task: render thumbnail and medium variants with its own session"""
+    async with AsyncSessionLocal() as session:
+        try:
+            generated = await ImageService(session).generate_derivatives(image_id)
+        except Exception as e:
+            # Nothing awaits a background task, so this is the only trace of the failure
+            print(f"⚠️ Failed to generate derivatives for image {image_id}: {type(e).__name__}: {e}")
+            return
+        if not generated:
+            print(f"⚠️ Failed to generate derivatives for image {image_id}: image not found")
+
+
+# Room for the boundaries, part headers and the task_id / file_name fields
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+async def _read_bounded_form(request: Request, max_bytes: int) -> FormData:
+    """
+    Parse a multipart body, stopping with 413 once more than max_bytes were received
+    
+    Content-Length can be missing (chunked transfer) or wrong, so the limit is
+    enforced on the stream itself. Files spooled before a failure are closed
+    here: only newer Starlette releases close them inside the parser.
+    """
+    async def bounded_stream():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Image exceeds {settings.max_image_upload_bytes} bytes"
+                )
+            yield chunk
+    
+    parser = MultiPartParser(request.headers, bounded_stream(), max_files=1, max_fields=10)
+    parsed = False
+    try:
+        form = await parser.parse()
+        parsed = True
+        return form
+    except MultiPartException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    finally:
+        if not parsed:
+            # Finished file parts are in items, the one being received is the current part
+            current_part = getattr(parser, "_current_part", None)
+            spooled = [value for _, value in parser.items] + [getattr(current_part, "file", None)]
+            for upload in spooled:
+                if isinstance(upload, FormFile):
+                    await upload.close()
+
+
+async def _upload_first_person_image(request: Request, image_service: ImageService, user_id: int) -> ImageRead:
+    """
+    Multipart path of POST /images/first-person
+    
+    The form parser spools the file part to a temporary file (in memory up to
+    1 MB), which is then copied to storage in chunks on the storage executor.
+    The body is rejected with 413 as soon as it exceeds the upload limit, before
+    it is spooled, whether or not the client sent a Content-Length.
+    """
+    max_body_bytes = settings.max_image_upload_bytes + _MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_body_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image exceeds {settings.max_image_upload_bytes} bytes"
+        )
+    
+    form = await _read_bounded_form(request, max_body_bytes)
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, FormFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Form field 'file' is required"
+            )
+        if upload.size is not None and upload.size > settings.max_image_upload_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image exceeds {settings.max_image_upload_bytes} bytes"
+            )
+        
+        try:
+            task_id = int(form.get("task_id"))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Form field 'task_id' must be an integer"
+            )
+        
+        file_name = form.get("file_name") or upload.filename
+        if not file_name:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Form field 'file_name' is required when the file has no name"
+            )
+        
+        try:
+            return await image_service.upload_first_person_image(upload.file, file_name, task_id, user_id)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    finally:
+        await form.close()
 
 
 @router.get("/", response_model=ImageListResponse)
 async def get_images(
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     search: Optional[str] = Query(None, description="Search in file names"),
     sort_by: Optional[str] = Query(None, description="Sort by field (created_at, file_name, width, height)"),
     dataset_id: Optional[int] = Query(None, description="Filter by dataset ID"),
     task_id: Optional[int] = Query(None, description="Filter by task ID"),
-    status: Optional[ImageStatus] = Query(None, description="Filter by image status"),
+    status_filter: Optional[ImageStatus] = Query(None, alias="status", description="Filter by image status"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all images with optional filtering, searching and sorting.
     """
     image_service = ImageService(db)
-    return await image_service.get_images_with_filters(
-        pagination=PaginationInput(page=page, limit=limit),
-        search=search,
-        sort_by=sort_by,
-        dataset_id=dataset_id,
-        task_id=task_id,
-        status=status
-    )
+    try:
+        return await image_service.get_images_with_filters(
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total),
+            search=search,
+            sort_by=sort_by,
+            dataset_id=dataset_id,
+            task_id=task_id,
+            status=status_filter
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/{image_id}", response_model=ImageRead)
@@ -49,6 +49,8 @@ async def get_user_rewards(
     user_id: int,
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     reward_type: Optional[RewardType] = Query(None, description="Filter by reward type"),
     current_user = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -70,9 +72,14 @@ async def get_user_rewards(
     try:
         return await reward_service.get_user_rewards(
             user_id=user_id,
-            pagination=PaginationInput(page=page, limit=limit),
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total),
             reward_type=reward_type
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -141,6 +148,8 @@ async def get_leaderboard(
 async def get_my_rewards(
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page, empty for the first page)"),
+    include_total: bool = Query(False, description="Also count the total in cursor pagination"),
     reward_type: Optional[RewardType] = Query(None, description="Filter by reward type"),
     current_user = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -153,9 +162,14 @@ async def get_my_rewards(
     try:
         return await reward_service.get_user_rewards(
             user_id=current_user.id,
-            pagination=PaginationInput(page=page, limit=limit),
+            pagination=PaginationInput(page=page, limit=limit, cursor=cursor, include_total=include_total),
             reward_type=reward_type
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
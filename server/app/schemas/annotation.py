@@ -163,7 +163,9 @@ class AnnotationClientRead(BaseModel):
 class AnnotationListResponse(BaseModel):
     """어노테이션 목록 응답 스키마"""
     items: List[AnnotationRead] = Field(..., description="Annotation list")
-    total: int = Field(..., description="Total count")
+    total: Optional[int] = Field(None, description="Total count (omitted in cursor pagination unless include_total)")
+    total_is_exact: bool = Field(True, description="False when total is a planner estimate (large listings)")
     page: int = Field(..., description="Current page")
     limit: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total pages")
\ No newline at end of file
+    pages: Optional[int] = Field(None, description="Total pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (cursor pagination only)")
\ No newline at end of file
@@ -15,6 +15,8 @@ class PaginationInput(BaseModel):
     limit: int = Field(10, ge=1, le=100, description="Page size")
     order_by: Optional[str] = Field(None, description="Sort criteria")
     order: Optional[str] = Field(None, description="Sort order (asc, desc)")
+    cursor: Optional[str] = Field(None, description="Keyset cursor (next_cursor of the previous page); empty string starts cursor pagination")
+    include_total: bool = Field(False, description="Also count the total in cursor pagination")
 
 class Pagination(BaseModel, Generic[T]):
     """Pagination response schema (for responses)"""
@@ -47,6 +47,7 @@ class DatasetInDB(DatasetRead):
 class DatasetWithStats(DatasetRead):
     """Dataset schema with statistics"""
     image_count: int = Field(0, description="Number of images")
+    annotation_count: int = Field(0, description="Number of annotations")
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -64,7 +65,9 @@ class DatasetFilter(BaseModel):
 class DatasetListResponse(BaseModel):
     """Dataset list response schema"""
     items: List[DatasetWithStats] = Field(..., description="Dataset list")
-    total: int = Field(..., description="Total count")
+    total: Optional[int] = Field(None, description="Total count (omitted in cursor pagination unless include_total)")
+    total_is_exact: bool = Field(True, description="False when total is a planner estimate (large listings)")
     page: int = Field(..., description="Current page")
     limit: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total pages") 
\ No newline at end of file
+    pages: Optional[int] = Field(None, description="Total pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (cursor pagination only)") 
\ No newline at end of file
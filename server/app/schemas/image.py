@@ -47,6 +47,10 @@ class ImageRead(ImageBase):
     """Image read schema"""
     id: int = Field(..., description="Image ID")
     created_at: datetime = Field(..., description="Creation timestamp")
+    has_derivatives: bool = Field(False, description="Whether thumbnail and medium variants exist")
+    derivative_format: Optional[str] = Field(None, description="Format of the thumbnail and medium variants (webp | jpeg)")
+    thumbnail_url: Optional[str] = Field(None, description="Thumbnail URL (None until derivatives exist)")
+    medium_url: Optional[str] = Field(None, description="Medium size URL (None until derivatives exist)")
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -59,10 +63,12 @@ class ImageInDB(ImageRead):
 class ImageListResponse(BaseModel):
     """ Image list response schema """
     items: List[ImageRead] = Field(..., description="Image list")
-    total: int = Field(..., description="Total count")
+    total: Optional[int] = Field(None, description="Total count (omitted in cursor pagination unless include_total)")
+    total_is_exact: bool = Field(True, description="False when total is a planner estimate (large listings)")
     page: int = Field(..., description="Current page")
     limit: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total pages")
+    pages: Optional[int] = Field(None, description="Total pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (cursor pagination only)")
 
 
 class FirstPersonImageCreate(BaseModel):
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, validator, computed_field
 
-from ..utils.annotation_selection import parse_annotation_ids_key
+from ..utils.annotation_selection import normalize_annotation_ids
 
 
 class UserAnnotationSelectionBase(BaseModel):
@@ -47,7 +47,7 @@ class UserAnnotationSelectionBatchCreate(BaseModel):
     selections: List[UserAnnotationSelectionCreate] = Field(
         ...,
         min_items=1,
-        max_items=50,  # Reasonable batch limit
+        max_items=100,  # Validation and insert are one query each regardless of size
         description="List of annotation selections to create"
     )
     
@@ -77,17 +77,17 @@ class UserAnnotationSelectionRead(BaseModel):
     user_id: int
     image_id: int
     category_id: Optional[int]
-    selected_annotation_ids_key: str = Field(
-        description="정규화된 어노테이션 ID 문자열 키"
+    selected_annotation_ids: List[int] = Field(
+        description="정렬된 어노테이션 ID 목록"
     )
     status: str = Field(description="선택 상태")
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     @computed_field
-    def selected_annotation_ids(self) -> List[int]:
-        """선택된 어노테이션 ID 목록을 computed field로 제공"""
-        return parse_annotation_ids_key(self.selected_annotation_ids_key)
+    def selected_annotation_ids_key(self) -> str:
+        """정규화된 어노테이션 ID 문자열 키를 computed field로 제공"""
+        return normalize_annotation_ids(self.selected_annotation_ids)
     
     model_config = {"from_attributes": True}
 
@@ -100,7 +100,7 @@ class UserAnnotationSelectionBatchResponse(BaseModel):
     )
     total_created: int = Field(description="Total number of selections created")
     auto_approved_count: int = Field(description="Number of selections that triggered auto-approval")
-    merged_annotations_count: int = Field(description="Number of merged annotations_test created from auto-approvals")
+    merged_annotations_count: int = Field(description="Number of merged annotations created (or queued, with selection_merge_mode=queue) from auto-approvals")
 
 
 class UserAnnotationSelectionWithDetails(UserAnnotationSelectionRead):
@@ -116,10 +116,11 @@ class AnnotationSelectionStats(BaseModel):
     """어노테이션 선택 통계 스키마"""
     
     image_id: int
-    selected_annotation_ids_key: str
+    selected_annotation_ids: List[int]
     category_id: Optional[int]
     category_name: Optional[str]
     selection_count: int = Field(description="동일한 선택을 한 사용자 수")
+    pending_count: int = Field(description="승인 대기 중인 선택 수")
     status: str = Field(description="현재 상태")
     first_selected_at: datetime = Field(description="첫 선택 시각")
     last_selected_at: datetime = Field(description="마지막 선택 시각")
@@ -128,6 +129,11 @@ class AnnotationSelectionStats(BaseModel):
     is_ready_for_approval: bool = Field(
         description="승인 가능 여부 (5명 이상 선택)"
     )
+    
+    @computed_field
+    def selected_annotation_ids_key(self) -> str:
+        """정규화된 어노테이션 ID 문자열 키"""
+        return normalize_annotation_ids(self.selected_annotation_ids)
 
 
 class AnnotationSelectionBatch(BaseModel):
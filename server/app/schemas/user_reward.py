@@ -42,10 +42,11 @@ class UserRewardUpdate(BaseModel):
 class UserRewardListResponse(BaseModel):
     """사용자 리워드 목록 응답 스키마"""
     items: list[UserRewardRead]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class UserContributionStats(BaseModel):
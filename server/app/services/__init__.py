@@ -12,6 +12,7 @@ from .category_service import CategoryService
 from .dictionary_category_service import DictionaryCategoryService
 from .annotation_service import AnnotationService
 from .user_reward_service import UserRewardService
+from .export_service import DatasetExportService
 
 __all__ = [
     "UserService",
@@ -21,5 +22,6 @@ __all__ = [
     "CategoryService",
     "DictionaryCategoryService",
     "AnnotationService",
-    "UserRewardService"
+    "UserRewardService",
+    "DatasetExportService"
 ] 
\ No newline at end of file
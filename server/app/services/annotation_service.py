@@ -6,24 +6,113 @@
 
 import asyncio
 import json
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, func
+from typing import Optional, List, Dict, Any, AsyncIterator
+from fastapi import BackgroundTasks
+from prometheus_client import Counter
+from pydantic import TypeAdapter
+from sqlalchemy import BigInteger, Text, bindparam, column, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
+from ..database import AsyncSessionLocal
 from ..models.annotation import Annotation
+from ..models.image import Image
 from ..schemas.annotation import AnnotationCreate, AnnotationUpdate, AnnotationRead, AnnotationListResponse, AnnotationClientRead
 from ..schemas.common import PaginationInput
 from ..utils.segmentation import get_mask_info_for_client
 from ..utils.annotation_validation import validate_category_for_dataset
-from ..utils.mask_processing import process_mask_info_batch, process_single_mask_info
-from ..utils.process_manager import get_process_pool
+from ..utils.mask_processing import process_single_mask_info
+from ..utils.mask_dispatcher import compute_mask_infos
+from ..utils.pg_listener import PgNotificationListener
+from ..utils.response_cache import ResponseCache
+from ..utils.pagination import apply_keyset_pagination, paginate_rows
+from ..utils.counting import count_rows
+from .dataset_service import DatasetService
+
+
+POLYGON_CACHE_FILLS = Counter(
+    "opengraph_polygon_cache_fills_total",
+    "Annotations whose computed polygon was written back to the database on read"
+)
+
+# Keeps detached write-through tasks referenced until they finish
+_write_through_tasks = set()
+
+# Serialized GET /annotations/image/{image_id}[/approved] responses, keyed by (image_id, variant)
+image_annotations_cache = ResponseCache(
+    name="image_annotations",
+    max_bytes=settings.image_annotations_cache_max_bytes,
+    ttl_seconds=settings.image_annotations_cache_ttl_seconds
+)
+IMAGE_ANNOTATIONS_VARIANTS = ("all", "approved")
+
+# Writers in other processes (scripts/merge_worker.py) pg_notify the image id on this
+# channel; every API process LISTENs and drops its cached responses for that image
+IMAGE_ANNOTATIONS_CHANNEL = "image_annotations_changed"
+
+_image_annotations_listener: Optional[PgNotificationListener] = None
+
+_client_annotations_adapter = TypeAdapter(List[AnnotationClientRead])
+
+
+async def persist_polygons(mask_infos: Dict[int, Dict[str, Any]]) -> None:
+    """
+    Write computed mask info back to annotations.polygon in its own session
+    
+    Failures are logged and swallowed: the polygon is simply recomputed on the next read.
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            # Rows another request filled in the meantime are not written (or counted) again
+            filled = await AnnotationService(session).save_polygons(mask_infos)
+        POLYGON_CACHE_FILLS.inc(filled)
+    except Exception as e:
+        print(f"Error persisting computed polygons: {e}")
+
+
+def _on_image_annotations_changed(payload: str) -> None:
+    AnnotationService.invalidate_image_annotations_cache(int(payload))
+
+
+def start_image_annotations_listener(dsn: str) -> None:
+    """
+    Invalidate this process's image annotation cache on IMAGE_ANNOTATIONS_CHANNEL
+    notifications (FastAPI lifespan startup)
+    
+    The whole cache is cleared on every (re)connect, since notifications sent
+    while disconnected are lost.
+    
+    Args:
+        dsn: Postgres DSN for the dedicated LISTEN connection (postgresql://...)
+    """
+    global _image_annotations_listener
+    
+    if _image_annotations_listener is None:
+        _image_annotations_listener = PgNotificationListener(
+            dsn=dsn,
+            channel=IMAGE_ANNOTATIONS_CHANNEL,
+            on_notification=_on_image_annotations_changed,
+            on_connect=image_annotations_cache.clear
+        )
+    _image_annotations_listener.start()
+
+
+async def stop_image_annotations_listener() -> None:
+    """Close the LISTEN connection (FastAPI lifespan shutdown)"""
+    global _image_annotations_listener
+    
+    if _image_annotations_listener is not None:
+        await _image_annotations_listener.stop()
+        _image_annotations_listener = None
 
 
 class AnnotationService:
     """어노테이션 서비스 클래스"""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, background_tasks: Optional[BackgroundTasks] = None):
         self.db = db
+        self.background_tasks = background_tasks
     
     @staticmethod
     def _process_mask_info(segmentation_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -70,6 +159,60 @@ class AnnotationService:
         
         return annotation_read
     
+    async def _compute_missing_mask_infos(self, annotations: List[Annotation]) -> Dict[int, Dict[str, Any]]:
+        """
+        polygon 컬럼이 비어 있는 annotation들의 mask info를 병렬 계산
+        
+        Freshly computed results are written back to annotations.polygon after the
+        response is sent (write-through), so the next read is a plain SELECT.
+        
+        Args:
+            annotations: List of Annotation models
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Mask info by annotation ID (only for annotations without polygon)
+        """
+        missing = [annotation for annotation in annotations if not annotation.polygon]
+        if not missing:
+            return {}
+        
+        segmentation_data_list = [
+            {
+                'segmentation_counts': annotation.segmentation_counts,
+                'segmentation_size': annotation.segmentation_size,
+                'bbox': annotation.bbox
+            }
+            for annotation in missing
+        ]
+        
+        # inline / thread / process depending on the estimated cost of the page
+        all_mask_infos = await compute_mask_infos(segmentation_data_list)
+        
+        mask_infos = {
+            annotation.id: mask_info
+            for annotation, mask_info in zip(missing, all_mask_infos)
+        }
+        self._schedule_polygon_write_through(mask_infos)
+        
+        return mask_infos
+    
+    def _schedule_polygon_write_through(self, mask_infos: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Persist computed mask info without blocking the current request
+        
+        Runs as a FastAPI background task (after the response is sent) when the
+        service was created with one, otherwise as a detached asyncio task.
+        """
+        if not mask_infos or not settings.polygon_write_through:
+            return
+        
+        if self.background_tasks is not None:
+            self.background_tasks.add_task(persist_polygons, mask_infos)
+        else:
+            task = asyncio.get_event_loop().create_task(persist_polygons(mask_infos))
+            _write_through_tasks.add(task)
+            task.add_done_callback(_write_through_tasks.discard)
+    
     async def _batch_create_annotation_read_with_mask_info(self, annotations: List[Annotation]) -> List[AnnotationRead]:
         """
         Batch convert annotations with parallel mask info processing
@@ -83,54 +226,21 @@ class AnnotationService:
         if not annotations:
             return []
         
-        # Prepare data for parallel processing
-        segmentation_data_list = []
-        annotation_reads = []
-        needs_processing = []
+        # polygon이 없는 annotation들만 병렬 처리
+        computed_mask_infos = await self._compute_missing_mask_infos(annotations)
         
+        annotation_reads = []
         for annotation in annotations:
-            # Create AnnotationRead without mask_info first
             annotation_read = AnnotationRead.model_validate(annotation)
-            annotation_reads.append(annotation_read)
             
             # polygon 필드가 있으면 직접 사용
             if annotation.polygon:
                 # polygon은 이미 Pydantic validator에 의해 딕셔너리로 변환됨
                 annotation_read.mask_info = annotation_read.polygon
-                needs_processing.append(False)
             else:
-                # polygon 필드가 없으면 병렬 처리 대상으로 추가
-                segmentation_data_list.append({
-                    'segmentation_counts': annotation.segmentation_counts,
-                    'segmentation_size': annotation.segmentation_size,
-                    'bbox': annotation.bbox
-                })
-                needs_processing.append(True)
-        
-        # polygon이 없는 annotation들만 병렬 처리
-        if segmentation_data_list:
-            # Process in batches to reduce process overhead
-            batch_size = 50  # Process 50 annotations per process call
-            loop = asyncio.get_event_loop()
-            
-            all_mask_infos = []
-            for i in range(0, len(segmentation_data_list), batch_size):
-                batch = segmentation_data_list[i:i + batch_size]
-                
-                # Process entire batch in one process call
-                mask_infos_batch = await loop.run_in_executor(
-                    get_process_pool(), 
-                    process_mask_info_batch,
-                    batch
-                )
-                all_mask_infos.extend(mask_infos_batch)
+                annotation_read.mask_info = computed_mask_infos[annotation.id]
             
-            # Assign mask info to annotation reads that need processing
-            mask_info_idx = 0
-            for i, annotation_read in enumerate(annotation_reads):
-                if needs_processing[i]:
-                    annotation_read.mask_info = all_mask_infos[mask_info_idx]
-                    mask_info_idx += 1
+            annotation_reads.append(annotation_read)
 
         return annotation_reads
     
@@ -175,57 +285,26 @@ class AnnotationService:
         if not annotations:
             return []
         
-        # Prepare data for parallel processing
-        segmentation_data_list = []
-        client_annotations = []
-        needs_processing = []
+        # polygon이 없는 annotation들만 병렬 처리
+        computed_mask_infos = await self._compute_missing_mask_infos(annotations)
         
+        client_annotations = []
         for annotation in annotations:
-            # Create AnnotationClientRead
+            # polygon 필드가 있으면 직접 사용 (Pydantic validator에 의해 딕셔너리로 변환됨)
             client_annotation = AnnotationClientRead.model_validate(annotation)
-            client_annotations.append(client_annotation)
-            
-            # polygon 필드가 있으면 직접 사용
-            if annotation.polygon:
-                # polygon은 이미 Pydantic validator에 의해 딕셔너리로 변환됨
-                client_annotation.polygon = client_annotation.polygon
-                needs_processing.append(False)
-            else:
-                # polygon 필드가 없으면 병렬 처리 대상으로 추가
-                segmentation_data_list.append({
-                    'segmentation_counts': annotation.segmentation_counts,
-                    'segmentation_size': annotation.segmentation_size,
-                    'bbox': annotation.bbox
-                })
-                needs_processing.append(True)
-        
-        # polygon이 없는 annotation들만 병렬 처리
-        if segmentation_data_list:
-            # Process in batches to reduce process overhead
-            batch_size = 50  # Process 50 annotations per process call
-            loop = asyncio.get_event_loop()
             
-            all_mask_infos = []
-            for i in range(0, len(segmentation_data_list), batch_size):
-                batch = segmentation_data_list[i:i + batch_size]
-                
-                # Process entire batch in one process call
-                mask_infos_batch = await loop.run_in_executor(
-                    get_process_pool(), 
-                    process_mask_info_batch,
-                    batch
-                )
-                all_mask_infos.extend(mask_infos_batch)
+            if not annotation.polygon:
+                client_annotation.polygon = computed_mask_infos[annotation.id]
             
-            # Assign mask info to client annotations that need processing
-            mask_info_idx = 0
-            for i, client_annotation in enumerate(client_annotations):
-                if needs_processing[i]:
-                    client_annotation.polygon = all_mask_infos[mask_info_idx]
-                    mask_info_idx += 1
+            client_annotations.append(client_annotation)
 
         return client_annotations
     
+    async def _get_image_dataset_id(self, image_id: int) -> Optional[int]:
+        """Dataset of an image (None for images without a dataset)"""
+        result = await self.db.execute(select(Image.dataset_id).where(Image.id == image_id))
+        return result.scalar()
+    
     async def create_annotation(self, annotation_data: AnnotationCreate) -> AnnotationRead:
         """
         새로운 어노테이션을 생성합니다.
@@ -236,6 +315,34 @@ class AnnotationService:
         Returns:
             AnnotationRead: Created annotation information
             
+        Raises:
+            ValueError: If category is not valid for the dataset's dictionary
+        """
+        db_annotation = await self.add_annotation(annotation_data)
+        await self.db.commit()
+        self.invalidate_image_annotations_cache(db_annotation.image_id)
+        await self.db.refresh(db_annotation)
+        
+        return self._create_annotation_read_with_mask_info(db_annotation)
+    
+    async def add_annotation(
+        self,
+        annotation_data: AnnotationCreate,
+        mask_info: Optional[Dict[str, Any]] = None
+    ) -> Annotation:
+        """
+        Validate and add an annotation in the caller's transaction (no commit)
+        
+        The caller commits and invalidates the image's cached annotations.
+        
+        Args:
+            annotation_data: Schema containing annotation creation data
+            mask_info: Precomputed process_single_mask_info() result for the mask
+                (computed here, on the event loop, if None)
+            
+        Returns:
+            Annotation: The flushed annotation row (id assigned)
+            
         Raises:
             ValueError: If category is not valid for the dataset's dictionary
         """
@@ -254,7 +361,9 @@ class AnnotationService:
         
         # RLE to Polygon 변환
         polygon_data = None
-        if annotation_data.segmentation_counts and annotation_data.segmentation_size:
+        if mask_info is not None:
+            polygon_data = json.dumps(mask_info)
+        elif annotation_data.segmentation_counts and annotation_data.segmentation_size:
             # 동기적으로 단일 마스크 처리 (적재 시점이므로 병렬 처리 불필요)
             segmentation_data = {
                 'segmentation_counts': annotation_data.segmentation_counts,
@@ -281,10 +390,13 @@ class AnnotationService:
         )
         
         self.db.add(db_annotation)
-        await self.db.commit()
-        await self.db.refresh(db_annotation)
+        await DatasetService(self.db).increment_counts(
+            await self._get_image_dataset_id(annotation_data.image_id),
+            annotations=1
+        )
+        await self.db.flush()
         
-        return self._create_annotation_read_with_mask_info(db_annotation)
+        return db_annotation
     
     async def get_annotation_by_id(self, annotation_id: int) -> Optional[AnnotationRead]:
         """
@@ -363,6 +475,49 @@ class AnnotationService:
         # Use batch processing for better performance
         return await self._batch_create_annotation_client_read(annotations)
     
+    async def get_image_annotations_for_client_json(self, image_id: int, approved_only: bool = False) -> bytes:
+        """
+        이미지 어노테이션 클라이언트 응답을 직렬화된 JSON으로 반환합니다 (응답 캐시 사용).
+        
+        Args:
+            image_id: Image ID
+            approved_only: Only approved user annotations (the /approved variant)
+            
+        Returns:
+            bytes: JSON array of AnnotationClientRead
+        """
+        cache_key = (image_id, "approved" if approved_only else "all")
+        cached = image_annotations_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        generation = image_annotations_cache.generation()
+        if approved_only:
+            annotations = await self.get_approved_user_annotations_by_image_id_for_client(image_id)
+        else:
+            annotations = await self.get_annotations_by_image_id_for_client(image_id)
+        
+        body = _client_annotations_adapter.dump_json(annotations)
+        image_annotations_cache.set(cache_key, body, generation)
+        return body
+    
+    @staticmethod
+    def invalidate_image_annotations_cache(image_id: int) -> None:
+        """이미지의 어노테이션이 변경되었을 때 캐시된 응답을 제거합니다."""
+        image_annotations_cache.invalidate(*[(image_id, variant) for variant in IMAGE_ANNOTATIONS_VARIANTS])
+    
+    async def notify_image_annotations_changed(self, image_id: int) -> None:
+        """
+        Invalidate the image's cached responses in every API process (no commit)
+        
+        The notification is sent when the caller's transaction commits, and not
+        at all if it rolls back.
+        
+        Args:
+            image_id: Image whose annotations changed
+        """
+        await self.db.execute(select(func.pg_notify(IMAGE_ANNOTATIONS_CHANNEL, str(image_id))))
+    
     async def get_annotations_by_source_type(self, source_type: str, image_id: Optional[int] = None) -> List[AnnotationRead]:
         """
         소스 타입별로 어노테이션을 조회합니다.
@@ -398,28 +553,38 @@ class AnnotationService:
         Returns:
             AnnotationListResponse: List of approved annotations with pagination information
         """
-        # Count total items
-        count_query = select(func.count(Annotation.id)).where(
+        conditions = [
             Annotation.source_type == "USER",
             Annotation.status == "APPROVED"
-        )
-
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Apply pagination
-        query = select(Annotation).where(
-                Annotation.source_type == "USER",
-                Annotation.status == "APPROVED"
-            ).order_by(Annotation.updated_at.desc())
+        ]
+        cursor_mode = pagination.cursor is not None
+        
+        # Count total items (cursor pagination only counts when asked to)
+        total, total_is_exact = None, True
+        if not cursor_mode or pagination.include_total:
+            total, total_is_exact = await count_rows(self.db, Annotation, conditions)
 
-        offset = (pagination.page - 1) * pagination.limit
-        query = query.offset(offset).limit(pagination.limit)
+        query = select(Annotation).where(*conditions)
+        
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, "updated_at", Annotation.updated_at, Annotation.id,
+                descending=True, cursor=pagination.cursor, limit=pagination.limit
+            )
+        else:
+            # Apply pagination
+            query = query.order_by(Annotation.updated_at.desc())
+            offset = (pagination.page - 1) * pagination.limit
+            query = query.offset(offset).limit(pagination.limit)
 
         result = await self.db.execute(query)
         annotations = result.scalars().all()
+        
+        next_cursor = None
+        if cursor_mode:
+            annotations, next_cursor = paginate_rows(annotations, pagination.limit, "updated_at", "updated_at")
 
-        pages = (total + pagination.limit - 1) // pagination.limit
+        pages = (total + pagination.limit - 1) // pagination.limit if total is not None else None
 
         # Use batch processing
         items = await self._batch_create_annotation_read_with_mask_info(annotations)
@@ -427,9 +592,11 @@ class AnnotationService:
         return AnnotationListResponse(
             items=items,
             total=total,
+            total_is_exact=total_is_exact,
             page=pagination.page,
             limit=pagination.limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
     
     async def get_annotations_with_filters(
@@ -467,13 +634,12 @@ class AnnotationService:
         if source_type:
             conditions.append(Annotation.source_type == source_type.upper())
         
-        # Count total items
-        count_query = select(func.count(Annotation.id))
-        if conditions:
-            count_query = count_query.where(*conditions)
+        cursor_mode = pagination.cursor is not None
         
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Count total items (cursor pagination only counts when asked to)
+        total, total_is_exact = None, True
+        if not cursor_mode or pagination.include_total:
+            total, total_is_exact = await count_rows(self.db, Annotation, conditions)
         
         # Build main query
         query = select(Annotation)
@@ -481,26 +647,31 @@ class AnnotationService:
             query = query.where(*conditions)
         
         # Apply sorting
-        if sort_by:
-            if sort_by == "created_at":
-                query = query.order_by(Annotation.created_at.desc())
-            elif sort_by == "updated_at":
-                query = query.order_by(Annotation.updated_at.desc())
-            elif sort_by == "area":
-                query = query.order_by(Annotation.area.desc())
-            else:
-                query = query.order_by(Annotation.updated_at.desc())  # default
+        if sort_by not in ("created_at", "updated_at", "area"):
+            sort_by = "updated_at"  # default
+        sort_column = getattr(Annotation, sort_by)
+        
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, sort_by, sort_column, Annotation.id,
+                descending=True, cursor=pagination.cursor, limit=pagination.limit,
+                nullable=(sort_by == "area")
+            )
         else:
-            query = query.order_by(Annotation.updated_at.desc())  # default
-        
-        # Apply pagination
-        offset = (pagination.page - 1) * pagination.limit
-        query = query.offset(offset).limit(pagination.limit)
+            query = query.order_by(sort_column.desc())
+            
+            # Apply pagination
+            offset = (pagination.page - 1) * pagination.limit
+            query = query.offset(offset).limit(pagination.limit)
         
         result = await self.db.execute(query)
         annotations = result.scalars().all()
         
-        pages = (total + pagination.limit - 1) // pagination.limit
+        next_cursor = None
+        if cursor_mode:
+            annotations, next_cursor = paginate_rows(annotations, pagination.limit, sort_by, sort_by)
+        
+        pages = (total + pagination.limit - 1) // pagination.limit if total is not None else None
         
         # Use batch processing
         items = await self._batch_create_annotation_read_with_mask_info(annotations)
@@ -508,12 +679,124 @@ class AnnotationService:
         return AnnotationListResponse(
             items=items,
             total=total,
+            total_is_exact=total_is_exact,
             page=pagination.page,
             limit=pagination.limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
 
     
+    async def stream_dataset_annotations(
+        self,
+        dataset_id: int,
+        include_polygon: bool = False,
+        include_rle: bool = False,
+        status: Optional[str] = None,
+        source_type: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """
+        데이터셋의 모든 어노테이션을 NDJSON으로 스트리밍합니다.
+        
+        Rows come from a server-side cursor over annotations joined with images and
+        are fetched `batch_size` at a time, so memory stays constant regardless of
+        dataset size. Plain columns are selected (no ORM identity map).
+        
+        Args:
+            dataset_id: Dataset ID
+            include_polygon: Add the "polygon" mask info (computed in the process pool when not stored yet)
+            include_rle: Add the "segmentation" COCO RLE ({"size", "counts"})
+            status: Filter by status (PENDING, APPROVED, REJECTED)
+            source_type: Filter by source type (AUTO, USER)
+            batch_size: Rows fetched per cursor round trip
+            
+        Yields:
+            bytes: One chunk of newline-terminated JSON objects per fetched batch
+        """
+        columns = [
+            Annotation.id,
+            Annotation.image_id,
+            Image.file_name.label("image_file_name"),
+            Image.width.label("image_width"),
+            Image.height.label("image_height"),
+            Annotation.category_id,
+            Annotation.bbox,
+            Annotation.area,
+            Annotation.is_crowd,
+            Annotation.status,
+            Annotation.source_type,
+            Annotation.created_by,
+            Annotation.created_at,
+            Annotation.updated_at
+        ]
+        if include_polygon:
+            columns.append(Annotation.polygon)
+        if include_polygon or include_rle:
+            columns.extend([Annotation.segmentation_size, Annotation.segmentation_counts])
+        
+        query = (
+            select(*columns)
+            .join(Image, Annotation.image_id == Image.id)
+            .where(Image.dataset_id == dataset_id)
+            .order_by(Annotation.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if status:
+            query = query.where(Annotation.status == status.upper())
+        if source_type:
+            query = query.where(Annotation.source_type == source_type.upper())
+        
+        result = await self.db.stream(query)
+        
+        async for rows in result.partitions():
+            computed_mask_infos = {}
+            if include_polygon:
+                missing = [row for row in rows if not row.polygon]
+                if missing:
+                    mask_infos = await compute_mask_infos([
+                        {
+                            'segmentation_counts': row.segmentation_counts,
+                            'segmentation_size': row.segmentation_size,
+                            'bbox': row.bbox
+                        }
+                        for row in missing
+                    ])
+                    computed_mask_infos = {row.id: mask_info for row, mask_info in zip(missing, mask_infos)}
+            
+            lines = []
+            for row in rows:
+                item = {
+                    "id": row.id,
+                    "image_id": row.image_id,
+                    "image_file_name": row.image_file_name,
+                    "image_width": row.image_width,
+                    "image_height": row.image_height,
+                    "category_id": row.category_id,
+                    "bbox": row.bbox,
+                    "area": row.area,
+                    "is_crowd": row.is_crowd,
+                    "status": row.status,
+                    "source_type": row.source_type,
+                    "created_by": row.created_by,
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat()
+                }
+                if include_rle:
+                    item["segmentation"] = {
+                        "size": row.segmentation_size,
+                        "counts": row.segmentation_counts
+                    }
+                
+                line = json.dumps(item)
+                if include_polygon:
+                    # Stored polygons are already JSON text; splice them in instead of re-parsing
+                    polygon_json = row.polygon if row.polygon else json.dumps(computed_mask_infos[row.id])
+                    line = f'{line[:-1]}, "polygon": {polygon_json}}}'
+                lines.append(line)
+            
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    
     async def update_annotation(self, annotation_id: int, annotation_data: AnnotationUpdate) -> Optional[AnnotationRead]:
         """
         어노테이션을 업데이트합니다.
@@ -540,6 +823,7 @@ class AnnotationService:
                 setattr(annotation, field, value)
         
         await self.db.commit()
+        self.invalidate_image_annotations_cache(annotation.image_id)
         await self.db.refresh(annotation)
         
         return self._create_annotation_read_with_mask_info(annotation)
@@ -562,10 +846,58 @@ class AnnotationService:
         if not annotation:
             return False
         
+        image_id = annotation.image_id
         await self.db.delete(annotation)
+        await DatasetService(self.db).increment_counts(await self._get_image_dataset_id(image_id), annotations=-1)
         await self.db.commit()
+        self.invalidate_image_annotations_cache(image_id)
         return True
     
+    async def save_polygons(self, mask_infos: Dict[int, Dict[str, Any]]) -> int:
+        """
+        Pre-computed mask info를 annotations.polygon 컬럼에 일괄 저장합니다.
+        
+        Only rows whose polygon is still NULL are written, and updated_at is left
+        untouched so that listings ordered by updated_at do not reshuffle. All
+        rows go in one UPDATE ... FROM unnest(...), in id order.
+        
+        Args:
+            mask_infos: Mapping of annotation ID to mask info dict
+            
+        Returns:
+            int: Number of annotations actually written (polygon was still NULL)
+        """
+        if not mask_infos:
+            return 0
+        
+        annotation_ids = sorted(mask_infos)
+        polygons = (
+            func.unnest(
+                bindparam('annotation_ids', annotation_ids, type_=ARRAY(BigInteger)),
+                bindparam('polygons', [json.dumps(mask_infos[annotation_id]) for annotation_id in annotation_ids], type_=ARRAY(Text))
+            )
+            .table_valued(column('annotation_id', BigInteger), column('polygon_data', Text))
+            .render_derived('data')
+        )
+        
+        annotations_table = Annotation.__table__
+        stmt = (
+            update(annotations_table)
+            .where(
+                annotations_table.c.id == polygons.c.annotation_id,
+                annotations_table.c.polygon.is_(None)
+            )
+            .values(
+                polygon=polygons.c.polygon_data,
+                updated_at=annotations_table.c.updated_at
+            )
+        )
+        
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        
+        return result.rowcount
+    
     async def get_annotations_count_by_image(self, image_id: int) -> int:
         """
         특정 이미지의 어노테이션 개수를 조회합니다.
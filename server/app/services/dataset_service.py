@@ -5,11 +5,12 @@
 """
 
 from typing import Optional
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from ..models.annotation import Annotation
 from ..models.dataset import Dataset
+from ..models.image import Image
 from ..schemas.dataset import (
     DatasetCreate,
     DatasetUpdate,
@@ -19,6 +20,8 @@ from ..schemas.dataset import (
     DatasetListResponse
 )
 from ..schemas.common import PaginationInput
+from ..utils.pagination import apply_keyset_pagination, paginate_rows
+from ..utils.counting import count_rows
 
 
 class DatasetService:
@@ -140,6 +143,59 @@ class DatasetService:
         await self.db.commit()
         return True
     
+    async def increment_counts(self, dataset_id: Optional[int], images: int = 0, annotations: int = 0) -> None:
+        """
+        Adjust the stored image/annotation counts of a dataset.
+        
+        Runs as a single atomic UPDATE in the caller's transaction; the caller
+        commits together with the rows it added or removed.
+        
+        Args:
+            dataset_id: Dataset ID (None for images without a dataset, ignored)
+            images: Image count delta
+            annotations: Annotation count delta
+        """
+        if dataset_id is None or (images == 0 and annotations == 0):
+            return
+        
+        await self.db.execute(
+            update(Dataset)
+            .where(Dataset.id == dataset_id)
+            .values(
+                image_count=Dataset.image_count + images,
+                annotation_count=Dataset.annotation_count + annotations
+            )
+        )
+    
+    async def refresh_counts(self, dataset_id: Optional[int] = None) -> None:
+        """
+        Recompute stored counts from the images and annotations tables.
+        
+        For writes that bypass the services (bulk loading scripts) and for
+        repairing drift.
+        
+        Args:
+            dataset_id: Dataset ID, or None for every dataset
+        """
+        image_counts = (
+            select(func.count(Image.id))
+            .where(Image.dataset_id == Dataset.id)
+            .scalar_subquery()
+        )
+        annotation_counts = (
+            select(func.count(Annotation.id))
+            .join(Image, Annotation.image_id == Image.id)
+            .where(Image.dataset_id == Dataset.id)
+            .scalar_subquery()
+        )
+        
+        query = update(Dataset).values(image_count=image_counts, annotation_count=annotation_counts)
+        if dataset_id is not None:
+            query = query.where(Dataset.id == dataset_id)
+        
+        await self.db.execute(query)
+        await self.db.commit()
+    
     async def get_datasets_list(
         self,
         pagination: PaginationInput,
@@ -157,66 +213,61 @@ class DatasetService:
         Returns:
             DatasetListResponse: Paginated dataset list with metadata
         """
-        query = select(Dataset).options(selectinload(Dataset.images))
-        
+        conditions = []
         if filter_params:
             if filter_params.name:
-                query = query.where(Dataset.name.contains(filter_params.name))
+                conditions.append(Dataset.name.contains(filter_params.name))
             if filter_params.tags:
-                query = query.where(Dataset.tags.overlap(filter_params.tags))
+                conditions.append(Dataset.tags.overlap(filter_params.tags))
             if filter_params.dictionary_id:
-                query = query.where(Dataset.dictionary_id == filter_params.dictionary_id)
+                conditions.append(Dataset.dictionary_id == filter_params.dictionary_id)
             if filter_params.created_by:
-                query = query.where(Dataset.created_by == filter_params.created_by)
+                conditions.append(Dataset.created_by == filter_params.created_by)
             if filter_params.created_after:
-                query = query.where(Dataset.created_at >= filter_params.created_after)
+                conditions.append(Dataset.created_at >= filter_params.created_after)
             if filter_params.created_before:
-                query = query.where(Dataset.created_at <= filter_params.created_before)
+                conditions.append(Dataset.created_at <= filter_params.created_before)
         
         if created_by:
-            query = query.where(Dataset.created_by == created_by)
+            conditions.append(Dataset.created_by == created_by)
         
-        # Count total items
-        count_query = select(func.count(Dataset.id))
-        if filter_params:
-            if filter_params.name:
-                count_query = count_query.where(Dataset.name.contains(filter_params.name))
-            if filter_params.tags:
-                count_query = count_query.where(Dataset.tags.overlap(filter_params.tags))
-            if filter_params.dictionary_id:
-                count_query = count_query.where(Dataset.dictionary_id == filter_params.dictionary_id)
-            if filter_params.created_by:
-                count_query = count_query.where(Dataset.created_by == filter_params.created_by)
-            if filter_params.created_after:
-                count_query = count_query.where(Dataset.created_at >= filter_params.created_after)
-            if filter_params.created_before:
-                count_query = count_query.where(Dataset.created_at <= filter_params.created_before)
+        query = select(Dataset)
+        if conditions:
+            query = query.where(*conditions)
         
-        if created_by:
-            count_query = count_query.where(Dataset.created_by == created_by)
+        cursor_mode = pagination.cursor is not None
         
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Count total items (cursor pagination only counts when asked to)
+        total, total_is_exact = None, True
+        if not cursor_mode or pagination.include_total:
+            total, total_is_exact = await count_rows(self.db, Dataset, conditions)
         
         # Apply ordering
         if pagination.order_by == "name":
-            if pagination.order == "asc":
-                query = query.order_by(Dataset.name.asc())
-            else:
-                query = query.order_by(Dataset.name.desc())
+            sort_key, sort_column = "name", Dataset.name
         else:  # Default to created_at
-            if pagination.order == "asc":
-                query = query.order_by(Dataset.created_at.asc())
-            else:
-                query = query.order_by(Dataset.created_at.desc())
+            sort_key, sort_column = "created_at", Dataset.created_at
+        descending = pagination.order != "asc"
         
-        # Apply pagination
-        offset = (pagination.page - 1) * pagination.limit
-        query = query.offset(offset).limit(pagination.limit)
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, sort_key, sort_column, Dataset.id,
+                descending=descending, cursor=pagination.cursor, limit=pagination.limit
+            )
+        else:
+            query = query.order_by(sort_column.desc() if descending else sort_column.asc())
+            
+            # Apply pagination
+            offset = (pagination.page - 1) * pagination.limit
+            query = query.offset(offset).limit(pagination.limit)
         
         result = await self.db.execute(query)
         datasets = result.scalars().all()
         
+        next_cursor = None
+        if cursor_mode:
+            datasets, next_cursor = paginate_rows(datasets, pagination.limit, sort_key, sort_key)
+        
         # Build response items with image and annotation counts
         items = []
         for dataset in datasets:
@@ -228,17 +279,20 @@ class DatasetService:
                 dictionary_id=dataset.dictionary_id,
                 created_by=dataset.created_by,
                 created_at=dataset.created_at,
-                image_count=len(dataset.images),
+                image_count=dataset.image_count,
+                annotation_count=dataset.annotation_count,
             ))
         
-        pages = (total + pagination.limit - 1) // pagination.limit
+        pages = (total + pagination.limit - 1) // pagination.limit if total is not None else None
         
         return DatasetListResponse(
             items=items,
             total=total,
+            total_is_exact=total_is_exact,
             page=pagination.page,
             limit=pagination.limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
     
     async def get_datasets_count(self, created_by: Optional[int] = None) -> int:
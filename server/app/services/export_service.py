@@ -0,0 +1,266 @@
+"""
+데이터셋 내보내기 서비스
+
+데이터셋을 COCO JSON 문서로 스트리밍합니다.
+"""
+
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.annotation import Annotation
+from ..models.category import Category
+from ..models.dataset import Dataset
+from ..models.dictionary_category import DictionaryCategory
+from ..models.image import Image
+from ..utils.mask_dispatcher import compute_mask_infos
+
+
+EXPORT_FORMATS = ("coco",)
+SEGMENTATION_FORMATS = ("rle", "polygon")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """
+    Gzip an async byte stream on the fly
+
+    Args:
+        chunks: Uncompressed chunks
+        level: zlib compression level
+
+    Yields:
+        bytes: Gzip member (header, deflate blocks, trailer)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _to_coco_polygons(mask_info: Dict[str, Any]) -> List[List[float]]:
+    """Client mask info polygons ([[x, y], ...]) to COCO flat polygons ([x1, y1, x2, y2, ...])"""
+    return [
+        [coordinate for point in polygon for coordinate in point]
+        for polygon in mask_info.get("polygons", [])
+    ]
+
+
+class DatasetExportService:
+    """데이터셋 내보내기 서비스 클래스"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_coco_categories(self, dataset: Dataset) -> List[Dict[str, Any]]:
+        """
+        COCO categories of a dataset
+
+        Categories come from the dataset's dictionary. Datasets without a dictionary
+        accept any category, so the categories actually used by its annotations are
+        exported instead.
+
+        Args:
+            dataset: Dataset model
+
+        Returns:
+            List[Dict[str, Any]]: COCO category objects ordered by id
+        """
+        if dataset.dictionary_id:
+            query = (
+                select(Category.id, Category.name)
+                .join(DictionaryCategory, DictionaryCategory.category_id == Category.id)
+                .where(DictionaryCategory.dictionary_id == dataset.dictionary_id)
+            )
+        else:
+            used_category_ids = (
+                select(Annotation.category_id)
+                .join(Image, Annotation.image_id == Image.id)
+                .where(Image.dataset_id == dataset.id, Annotation.category_id.is_not(None))
+                .distinct()
+            )
+            query = select(Category.id, Category.name).where(Category.id.in_(used_category_ids))
+
+        result = await self.db.execute(query.order_by(Category.id))
+        return [
+            {"id": row.id, "name": row.name, "supercategory": ""}
+            for row in result.all()
+        ]
+
+    async def stream_coco(
+        self,
+        dataset_id: int,
+        segmentation: str = "rle",
+        status: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """
+        데이터셋을 COCO JSON 문서로 스트리밍합니다.
+
+        The document is written incrementally: images and annotations are read
+        with server-side cursors and emitted one fetched batch at a time, so the
+        export never holds the whole dataset in memory.
+
+        Args:
+            dataset_id: Dataset ID
+            segmentation: "rle" (compressed COCO RLE as stored) or "polygon"
+                (missing polygons are computed in the process pool; masks that yield
+                no polygon fall back to RLE)
+            status: Only export annotations with this status (PENDING, APPROVED, REJECTED)
+            batch_size: Rows fetched per cursor round trip
+
+        Yields:
+            bytes: Consecutive pieces of one JSON document
+
+        Raises:
+            ValueError: If the dataset does not exist or the segmentation format is unknown
+        """
+        if segmentation not in SEGMENTATION_FORMATS:
+            raise ValueError(f"Unsupported segmentation format: {segmentation}")
+
+        result = await self.db.execute(select(Dataset).where(Dataset.id == dataset_id))
+        dataset = result.scalar_one_or_none()
+        if not dataset:
+            raise ValueError(f"Dataset {dataset_id} not found")
+
+        categories = await self.get_coco_categories(dataset)
+
+        header = {
+            "info": {
+                "description": dataset.name,
+                "version": "1.0",
+                "year": datetime.now(timezone.utc).year,
+                "date_created": datetime.now(timezone.utc).isoformat()
+            },
+            "licenses": [],
+            "categories": categories
+        }
+        # Open the document and leave it ready for the "images" array
+        yield (json.dumps(header, ensure_ascii=False)[:-1] + ', "images": [').encode("utf-8")
+
+        async for chunk in self._stream_coco_images(dataset_id, batch_size):
+            yield chunk
+
+        yield b'], "annotations": ['
+
+        async for chunk in self._stream_coco_annotations(dataset_id, segmentation, status, batch_size):
+            yield chunk
+
+        yield b']}\n'
+
+    async def _stream_coco_images(self, dataset_id: int, batch_size: int) -> AsyncIterator[bytes]:
+        """Comma separated COCO image objects"""
+        query = (
+            select(Image.id, Image.file_name, Image.width, Image.height, Image.image_url, Image.created_at)
+            .where(Image.dataset_id == dataset_id)
+            .order_by(Image.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query)
+
+        separator = ""
+        async for rows in result.partitions():
+            items = [
+                json.dumps({
+                    "id": row.id,
+                    "file_name": row.file_name,
+                    "width": row.width,
+                    "height": row.height,
+                    "coco_url": row.image_url,
+                    "date_captured": row.created_at.isoformat()
+                }, ensure_ascii=False)
+                for row in rows
+            ]
+            yield (separator + ", ".join(items)).encode("utf-8")
+            separator = ", "
+
+    async def _stream_coco_annotations(
+        self,
+        dataset_id: int,
+        segmentation: str,
+        status: Optional[str],
+        batch_size: int
+    ) -> AsyncIterator[bytes]:
+        """Comma separated COCO annotation objects"""
+        columns = [
+            Annotation.id,
+            Annotation.image_id,
+            Annotation.category_id,
+            Annotation.bbox,
+            Annotation.area,
+            Annotation.is_crowd,
+            Annotation.segmentation_size,
+            Annotation.segmentation_counts
+        ]
+        if segmentation == "polygon":
+            columns.append(Annotation.polygon)
+
+        query = (
+            select(*columns)
+            .join(Image, Annotation.image_id == Image.id)
+            .where(Image.dataset_id == dataset_id)
+            .order_by(Annotation.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if status:
+            query = query.where(Annotation.status == status.upper())
+
+        result = await self.db.stream(query)
+
+        separator = ""
+        async for rows in result.partitions():
+            polygons_by_id = {}
+            if segmentation == "polygon":
+                polygons_by_id = await self._get_coco_polygons(rows)
+
+            items = []
+            for row in rows:
+                # Annotations without a mask get an empty polygon list: {"size": null, "counts": null}
+                # is not valid COCO and breaks pycocotools loaders
+                rle = (
+                    {"size": row.segmentation_size, "counts": row.segmentation_counts}
+                    if row.segmentation_counts and row.segmentation_size
+                    else []
+                )
+                item = {
+                    "id": row.id,
+                    "image_id": row.image_id,
+                    "category_id": row.category_id,
+                    "segmentation": polygons_by_id.get(row.id) or rle,
+                    "area": row.area,
+                    "bbox": row.bbox,
+                    "iscrowd": 1 if row.is_crowd else 0
+                }
+                items.append(json.dumps(item))
+
+            yield (separator + ", ".join(items)).encode("utf-8")
+            separator = ", "
+
+    async def _get_coco_polygons(self, rows) -> Dict[int, List[List[float]]]:
+        """COCO polygons of one batch; polygons that are not stored yet are computed in parallel"""
+        polygons_by_id = {}
+        missing = []
+        for row in rows:
+            if row.polygon:
+                polygons_by_id[row.id] = _to_coco_polygons(json.loads(row.polygon))
+            elif row.segmentation_counts and row.segmentation_size:
+                missing.append(row)
+
+        if missing:
+            mask_infos = await compute_mask_infos([
+                {
+                    'segmentation_counts': row.segmentation_counts,
+                    'segmentation_size': row.segmentation_size,
+                    'bbox': row.bbox
+                }
+                for row in missing
+            ])
+            for row, mask_info in zip(missing, mask_infos):
+                polygons_by_id[row.id] = _to_coco_polygons(mask_info)
+
+        return polygons_by_id
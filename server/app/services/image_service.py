@@ -4,14 +4,22 @@
 이미지 관련 비즈니스 로직을 처리합니다.
 """
 
-from typing import Optional, List
-from sqlalchemy import select, func
+from typing import BinaryIO, Optional, List
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
+from ..models.annotation import Annotation
+from ..models.dataset import Dataset
 from ..models.image import Image, ImageStatus
 from ..schemas.common import PaginationInput
 from ..schemas.image import ImageCreate, ImageUpdate, ImageRead, ImageListResponse, FirstPersonImageCreate
-from ..utils.gcs_client import GCSClient
+from ..utils.storage import upload_image, upload_image_file
+from ..utils.image_derivatives import derivative_blob_name, generate_derivatives
+from ..utils.signed_url_cache import get_signed_urls
+from ..utils.pagination import apply_keyset_pagination, paginate_rows
+from ..utils.counting import count_rows
+from .dataset_service import DatasetService
 
 
 class ImageService:
@@ -41,6 +49,7 @@ class ImageService:
         )
         
         self.db.add(db_image)
+        await DatasetService(self.db).increment_counts(db_image.dataset_id, images=1)
         await self.db.commit()
         await self.db.refresh(db_image)
         
@@ -48,43 +57,81 @@ class ImageService:
     
     async def create_first_person_image(self, image_data: FirstPersonImageCreate, user_id: int) -> ImageRead:
         """
-        Create a first-person image with GCS upload.
+        Create a first-person image from JSON (image URL or base64 data URL).
+        
+        Base64 data is decoded and uploaded to the storage backend; prefer
+        upload_first_person_image, which avoids the base64 overhead.
         
         Args:
             image_data: Schema containing first-person image creation data
+            user_id: Submitting user ID
             
         Returns:
             ImageRead: Created image information
+            
+        Raises:
+            ValueError: If the base64 data is not an image
         """
-        from ..config import settings
-        
-        # For development, just store the base64 data directly 
-        # In production, this should upload to GCS
-        if image_data.image_url.startswith('data:image') and not settings.google_cloud_project:
-            # Development mode: store base64 data directly
-            image_url = image_data.image_url
-            width = image_data.width
-            height = image_data.height
-        elif image_data.image_url.startswith('data:image'):
-            # Production mode: upload to GCS
-            gcs_client = GCSClient()
-            blob_name, width, height = gcs_client.upload_image(
+        if image_data.image_url.startswith('data:image'):
+            # Upload to storage, off the event loop; only the blob name is stored
+            image_url, width, height = await upload_image(
                 image_data.image_url,
                 file_name=image_data.file_name
             )
-            image_url = blob_name
         else:
             # If it's already a URL, use as is
             image_url = image_data.image_url
             width = image_data.width
             height = image_data.height
         
+        return await self._save_first_person_image(
+            image_data.file_name, image_url, width, height, image_data.task_id, user_id
+        )
+    
+    async def upload_first_person_image(
+        self,
+        file: BinaryIO,
+        file_name: str,
+        task_id: int,
+        user_id: int
+    ) -> ImageRead:
+        """
+        Create a first-person image from an uploaded file.
+        
+        The file is copied to the storage backend in chunks; width and height
+        come from the image header.
+        
+        Args:
+            file: Binary file positioned at the start of the image
+            file_name: File name
+            task_id: Task ID
+            user_id: Submitting user ID
+            
+        Returns:
+            ImageRead: Created image information
+            
+        Raises:
+            ValueError: If the file is not an image
+        """
+        blob_name, width, height = await upload_image_file(file, file_name=file_name)
+        return await self._save_first_person_image(file_name, blob_name, width, height, task_id, user_id)
+    
+    async def _save_first_person_image(
+        self,
+        file_name: str,
+        image_url: str,
+        width: int,
+        height: int,
+        task_id: int,
+        user_id: int
+    ) -> ImageRead:
+        """Insert a first-person image row and sign its URL"""
         db_image = Image(
-            file_name=image_data.file_name,
+            file_name=file_name,
             image_url=image_url,
             width=width,
             height=height,
-            task_id=image_data.task_id,
+            task_id=task_id,
             status=ImageStatus.PENDING,  # Default to PENDING
             dataset_id=None,  # No dataset for first-person images
             submitted_by=user_id  # Set the submitter
@@ -94,14 +141,7 @@ class ImageService:
         await self.db.commit()
         await self.db.refresh(db_image)
         
-        # Generate signed URL if stored in GCS and not development mode
-        result = ImageRead.model_validate(db_image)
-        if not result.image_url.startswith(('http', 'data:')) and settings.google_cloud_project:
-            # It's a blob name, generate signed URL
-            gcs_client = GCSClient()
-            result.image_url = gcs_client.generate_signed_url(result.image_url)
-        
-        return result
+        return (await self._sign_image_urls([ImageRead.model_validate(db_image)]))[0]
     
     async def get_image_by_id(self, image_id: int) -> Optional[ImageRead]:
         """
@@ -119,14 +159,138 @@ class ImageService:
         image = result.scalar_one_or_none()
         
         if image:
-            item = ImageRead.model_validate(image)
-            # Generate signed URL if image is stored in GCS
-            if not item.image_url.startswith('http'):
-                gcs_client = GCSClient()
-                item.image_url = gcs_client.generate_signed_url(item.image_url)
-            return item
+            return (await self._sign_image_urls([ImageRead.model_validate(image)]))[0]
         return None
     
+    async def _sign_image_urls(self, items: List[ImageRead]) -> List[ImageRead]:
+        """
+        Replace stored blob names with signed URLs, in one batch for the whole page.
+        
+        Images with derivatives also get thumbnail_url and medium_url. URLs
+        come from the process-wide signed URL cache; only blobs missing from it
+        (or close to expiry) are signed, off the event loop.
+        
+        Args:
+            items: Images of one page
+            
+        Returns:
+            List[ImageRead]: The same items
+        """
+        # Images in the storage backend keep the blob name (not a full URL)
+        targets = []
+        for item in items:
+            if item.image_url.startswith(('http', 'data:')):
+                continue
+            targets.append((item, "image_url", item.image_url))
+            if item.has_derivatives:
+                targets.append((item, "thumbnail_url", derivative_blob_name(item.image_url, "thumbnail", item.derivative_format)))
+                targets.append((item, "medium_url", derivative_blob_name(item.image_url, "medium", item.derivative_format)))
+        if not targets:
+            return items
+        
+        signed_urls = await get_signed_urls([blob_name for _, _, blob_name in targets])
+        for (item, field, _), signed_url in zip(targets, signed_urls):
+            setattr(item, field, signed_url)
+        
+        return items
+    
+    async def generate_derivatives(self, image_id: int) -> bool:
+        """
+        Render and store thumbnail and medium variants of an image.
+        
+        The variants are rendered in the configured format, which is stored
+        with the image so their blob names survive a later format change.
+        
+        Args:
+            image_id: Image ID
+            
+        Returns:
+            bool: False if the image does not exist
+            
+        Raises:
+            ValueError: If the image is not in the storage backend or not decodable
+        """
+        result = await self.db.execute(
+            select(Image.image_url).where(Image.id == image_id)
+        )
+        image_url = result.scalar_one_or_none()
+        if image_url is None:
+            return False
+        if image_url.startswith(('http', 'data:')):
+            raise ValueError("Image is not stored in the storage backend")
+        
+        image_format = settings.image_derivative_format
+        await generate_derivatives(image_url, image_format)
+        
+        await self.db.execute(
+            update(Image)
+            .where(Image.id == image_id)
+            .values(has_derivatives=True, derivative_format=image_format)
+        )
+        await self.db.commit()
+        return True
+    
+    async def get_dataset_images(
+        self,
+        dataset_id: int,
+        page: int = 1,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Optional[ImageListResponse]:
+        """
+        데이터셋 이미지 목록을 id 순서로 페이지 단위 조회합니다.
+        
+        Pages are read with LIMIT (or an id keyset when a cursor is given) over
+        the (dataset_id, id) index, the total comes from the dataset's
+        maintained image_count, and only the returned page is signed.
+        
+        Args:
+            dataset_id: Dataset ID
+            page: Page number (offset pagination)
+            limit: Page size
+            cursor: Keyset cursor (next_cursor of the previous page, empty for the first page)
+            
+        Returns:
+            Optional[ImageListResponse]: Page of images, None if the dataset does not exist
+            
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        count_result = await self.db.execute(
+            select(Dataset.image_count).where(Dataset.id == dataset_id)
+        )
+        total = count_result.scalar_one_or_none()
+        if total is None:
+            return None
+        
+        query = select(Image).where(Image.dataset_id == dataset_id)
+        cursor_mode = cursor is not None
+        
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, "id", Image.id, Image.id,
+                descending=False, cursor=cursor, limit=limit
+            )
+        else:
+            offset = (page - 1) * limit
+            query = query.order_by(Image.id).offset(offset).limit(limit)
+        
+        result = await self.db.execute(query)
+        images = result.scalars().all()
+        
+        next_cursor = None
+        if cursor_mode:
+            images, next_cursor = paginate_rows(images, limit, "id", "id")
+        
+        return ImageListResponse(
+            items=await self._sign_image_urls([ImageRead.model_validate(image) for image in images]),
+            total=total,
+            page=page,
+            limit=limit,
+            pages=(total + limit - 1) // limit,
+            next_cursor=next_cursor
+        )
+    
     async def get_images_by_dataset_id(self, dataset_id: int) -> List[ImageRead]:
         """
         특정 데이터셋에 포함된 이미지 목록을 조회합니다.
@@ -158,10 +322,7 @@ class ImageService:
             ImageListResponse: List of images with pagination information
         """
         # Count total items
-        count_query = select(func.count(Image.id))
-
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        total, total_is_exact = await count_rows(self.db, Image)
 
         # Apply pagination
         query = select(Image).order_by(Image.created_at.desc())
@@ -177,6 +338,7 @@ class ImageService:
         return ImageListResponse(
             items=[ImageRead.model_validate(image) for image in images],
             total=total,
+            total_is_exact=total_is_exact,
             page=pagination.page,
             limit=pagination.limit,
             pages=pages
@@ -219,59 +381,55 @@ class ImageService:
             search_term = f"%{search}%"
             conditions.append(Image.file_name.ilike(search_term))
         
-        # Count total items
-        count_query = select(func.count(Image.id))
-        if conditions:
-            count_query = count_query.where(*conditions)
+        cursor_mode = pagination.cursor is not None
         
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Count total items (cursor pagination only counts when asked to)
+        total, total_is_exact = None, True
+        if not cursor_mode or pagination.include_total:
+            total, total_is_exact = await count_rows(self.db, Image, conditions)
         
         # Build main query
         query = select(Image)
         if conditions:
             query = query.where(*conditions)
         
-        # Apply sorting
-        if sort_by:
-            if sort_by == "created_at":
-                query = query.order_by(Image.created_at.desc())
-            elif sort_by == "file_name":
-                query = query.order_by(Image.file_name)
-            elif sort_by == "width":
-                query = query.order_by(Image.width.desc())
-            elif sort_by == "height":
-                query = query.order_by(Image.height.desc())
-            else:
-                query = query.order_by(Image.created_at.desc())  # default
-        else:
-            query = query.order_by(Image.created_at.desc())  # default
+        # Apply sorting (file_name ascending, everything else descending)
+        if sort_by not in ("created_at", "file_name", "width", "height"):
+            sort_by = "created_at"  # default
+        sort_column = getattr(Image, sort_by)
+        descending = sort_by != "file_name"
         
-        # Apply pagination
-        offset = (pagination.page - 1) * pagination.limit
-        query = query.offset(offset).limit(pagination.limit)
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, sort_by, sort_column, Image.id,
+                descending=descending, cursor=pagination.cursor, limit=pagination.limit
+            )
+        else:
+            query = query.order_by(sort_column.desc() if descending else sort_column)
+            
+            # Apply pagination
+            offset = (pagination.page - 1) * pagination.limit
+            query = query.offset(offset).limit(pagination.limit)
         
         result = await self.db.execute(query)
         images = result.scalars().all()
         
-        pages = (total + pagination.limit - 1) // pagination.limit
+        next_cursor = None
+        if cursor_mode:
+            images, next_cursor = paginate_rows(images, pagination.limit, sort_by, sort_by)
         
-        # Generate signed URLs for GCS images
-        gcs_client = GCSClient()
-        items = []
-        for image in images:
-            item = ImageRead.model_validate(image)
-            # Generate signed URL if image is stored in GCS (not a full URL)
-            if not item.image_url.startswith('http'):
-                item.image_url = gcs_client.generate_signed_url(item.image_url)
-            items.append(item)
+        pages = (total + pagination.limit - 1) // pagination.limit if total is not None else None
+        
+        items = await self._sign_image_urls([ImageRead.model_validate(image) for image in images])
         
         return ImageListResponse(
             items=items,
             total=total,
+            total_is_exact=total_is_exact,
             page=pagination.page,
             limit=pagination.limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
     
     async def update_image(self, image_id: int, image_data: ImageUpdate) -> Optional[ImageRead]:
@@ -321,6 +479,16 @@ class ImageService:
         if not image:
             return False
         
+        # Annotations are deleted with the image (ON DELETE CASCADE)
+        annotation_count_result = await self.db.execute(
+            select(func.count(Annotation.id)).where(Annotation.image_id == image_id)
+        )
+        await DatasetService(self.db).increment_counts(
+            image.dataset_id,
+            images=-1,
+            annotations=-(annotation_count_result.scalar() or 0)
+        )
+        
         await self.db.delete(image)
         await self.db.commit()
         return True
\ No newline at end of file
@@ -0,0 +1,389 @@
+"""
+병합 작업 큐 서비스
+
+Merging the masks of an approved selection group (RLE union, bbox, polygon)
+is CPU bound. With selection_merge_mode = "queue" the approving request only
+adds a merge_jobs row in its own transaction; worker processes
+(scripts/merge_worker.py) claim jobs with FOR UPDATE SKIP LOCKED, render the
+merge on the mask process pool and write the merged annotation, the group's
+merged_annotation_id and the job result in one transaction.
+
+Failed attempts are retried with exponential backoff up to
+merge_job_max_attempts; ValueError (e.g. masks of different sizes) fails the
+job right away. A job is claimed by at most one worker at a time, and its row
+stays locked while a worker runs it, so a retry never merges a job twice.
+
+The commit also sends a Postgres NOTIFY with the image id, on which every API
+process drops its cached GET /annotations/image/{image_id} responses.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.annotation import Annotation
+from ..models.merge_job import MergeJob
+from ..models.selection_consensus import SelectionConsensus
+from ..schemas.annotation import AnnotationCreate
+from ..utils.mask_processing import merge_masks
+from ..utils.process_manager import get_process_pool
+from .annotation_service import AnnotationService
+
+
+MERGE_JOBS = Counter(
+    "opengraph_merge_jobs_total",
+    "Merge jobs by event (enqueued, duplicate, done, retried, failed)",
+    ["result"]
+)
+
+MERGE_JOB_QUEUE_DEPTH = Gauge(
+    "opengraph_merge_job_queue_depth",
+    "Merge jobs waiting (PENDING) or being merged (RUNNING)",
+    ["status"]
+)
+
+MERGE_JOB_OLDEST_PENDING = Gauge(
+    "opengraph_merge_job_oldest_pending_seconds",
+    "How long the oldest runnable PENDING merge job has been waiting"
+)
+
+MERGE_JOB_LATENCY = Histogram(
+    "opengraph_merge_job_latency_seconds",
+    "Time from enqueue until the merged annotation is committed",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+MERGE_JOB_DURATION = Histogram(
+    "opengraph_merge_job_duration_seconds",
+    "Wall-clock time of one merge job attempt by outcome",
+    ["result"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+class MergeJobService:
+    """병합 작업 큐 서비스"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.annotation_service = AnnotationService(db)
+
+    @staticmethod
+    def idempotency_key(consensus_id: int) -> str:
+        """Key of the merge job of a selection group (one merge per group)"""
+        return f"selection_consensus:{consensus_id}"
+
+    async def enqueue(
+        self,
+        consensus_id: int,
+        image_id: int,
+        annotation_ids: List[int],
+        category_id: Optional[int]
+    ) -> bool:
+        """
+        Add a merge job in the caller's transaction (no commit)
+
+        Args:
+            consensus_id: Approved selection_consensus row
+            image_id: Image of the annotations
+            annotation_ids: Annotations whose masks are merged
+            category_id: Category of the merged annotation
+
+        Returns:
+            bool: False if the group already had a job
+        """
+        result = await self.db.execute(
+            pg_insert(MergeJob)
+            .values(
+                idempotency_key=self.idempotency_key(consensus_id),
+                consensus_id=consensus_id,
+                image_id=image_id,
+                annotation_ids=list(annotation_ids),
+                category_id=category_id
+            )
+            .on_conflict_do_nothing(index_elements=[MergeJob.idempotency_key])
+            .returning(MergeJob.id)
+        )
+        created = result.scalar_one_or_none() is not None
+        MERGE_JOBS.labels(result="enqueued" if created else "duplicate").inc()
+        return created
+
+    async def record_failed_merge(
+        self,
+        consensus_id: int,
+        image_id: int,
+        annotation_ids: List[int],
+        category_id: Optional[int],
+        error: Exception
+    ) -> None:
+        """
+        Record a merge that failed outside the queue (inline mode) as a FAILED job (no commit)
+        
+        The group keeps its approval, exactly as when a queued job fails; setting
+        the job back to PENDING lets a worker retry it.
+        
+        Args:
+            consensus_id: Approved selection_consensus row
+            image_id: Image of the annotations
+            annotation_ids: Annotations whose masks were merged
+            category_id: Category of the merged annotation
+            error: Why the merge failed
+        """
+        await self.db.execute(
+            pg_insert(MergeJob)
+            .values(
+                idempotency_key=self.idempotency_key(consensus_id),
+                consensus_id=consensus_id,
+                image_id=image_id,
+                annotation_ids=list(annotation_ids),
+                category_id=category_id,
+                status="FAILED",
+                attempts=1,
+                last_error=f"{type(error).__name__}: {error}",
+                finished_at=func.now()
+            )
+            .on_conflict_do_nothing(index_elements=[MergeJob.idempotency_key])
+        )
+        MERGE_JOBS.labels(result="failed").inc()
+    
+    async def merge_annotations(
+        self,
+        image_id: int,
+        annotation_ids: List[int],
+        category_id: Optional[int]
+    ) -> Optional[Annotation]:
+        """
+        Merge the masks of annotations into a new approved USER annotation (no commit)
+
+        The union, bbox and polygon are computed on the mask process pool.
+
+        Args:
+            image_id: ID of the image
+            annotation_ids: Annotations to merge
+            category_id: Category to assign to the merged annotation
+
+        Returns:
+            The added annotation, or None if none of the annotations has a mask
+
+        Raises:
+            ValueError: If the masks have different sizes or the category is not valid
+        """
+        result = await self.db.execute(
+            select(Annotation.segmentation_counts, Annotation.segmentation_size)
+            .where(
+                Annotation.id.in_(annotation_ids),
+                Annotation.image_id == image_id,
+                Annotation.segmentation_counts.is_not(None),
+                Annotation.segmentation_size.is_not(None)
+            )
+            .order_by(Annotation.id)
+        )
+        masks = result.all()
+        if not masks:
+            return None
+
+        segmentation_size = list(masks[0].segmentation_size)
+        if any(list(mask.segmentation_size) != segmentation_size for mask in masks):
+            raise ValueError("Cannot merge masks with different segmentation sizes")
+
+        loop = asyncio.get_running_loop()
+        merged = await loop.run_in_executor(
+            get_process_pool(),
+            merge_masks,
+            [mask.segmentation_counts for mask in masks],
+            segmentation_size
+        )
+
+        return await self.annotation_service.add_annotation(
+            AnnotationCreate(
+                image_id=image_id,
+                category_id=category_id,
+                segmentation_size=merged['segmentation_size'],
+                segmentation_counts=merged['segmentation_counts'],
+                bbox=merged['bbox'],
+                area=merged['area'],
+                source_type="USER",
+                status="APPROVED",
+                is_crowd=False,
+                point_coords=None,
+                predicted_iou=None,
+                stability_score=None,
+                created_by=None  # This is a system-generated merged annotation
+            ),
+            mask_info=merged['mask_info']
+        )
+
+    async def claim_jobs(self, worker_id: str, limit: int) -> List[MergeJob]:
+        """
+        Claim up to `limit` runnable jobs for a worker and commit
+
+        Jobs locked by another worker's claim are skipped, not waited for.
+
+        Args:
+            worker_id: Recorded in locked_by
+            limit: Maximum number of jobs
+
+        Returns:
+            List[MergeJob]: Claimed jobs (RUNNING, attempts already incremented)
+        """
+        runnable = (
+            select(MergeJob.id)
+            .where(MergeJob.status == "PENDING", MergeJob.run_after <= func.now())
+            .order_by(MergeJob.run_after, MergeJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(MergeJob)
+            .where(MergeJob.id.in_(runnable.scalar_subquery()))
+            .values(
+                status="RUNNING",
+                attempts=MergeJob.attempts + 1,
+                locked_at=func.now(),
+                locked_by=worker_id
+            )
+            .returning(MergeJob)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list(result.scalars().all())
+        await self.db.commit()
+        return jobs
+
+    async def run_job(self, job: MergeJob) -> str:
+        """
+        Run one claimed job and record its outcome
+
+        Args:
+            job: Job returned by claim_jobs (only its attributes are read)
+
+        Returns:
+            str: done | retried | failed
+        """
+        started_at = time.perf_counter()
+
+        try:
+            await self._merge(job)
+            outcome = "done"
+            MERGE_JOB_LATENCY.observe((datetime.now(timezone.utc) - job.created_at).total_seconds())
+        except Exception as e:
+            await self.db.rollback()
+            outcome = await self._record_failure(job, e)
+            print(f"Merge job {job.id} attempt {job.attempts} {outcome}: {type(e).__name__}: {e}")
+
+        MERGE_JOB_DURATION.labels(result=outcome).observe(time.perf_counter() - started_at)
+        MERGE_JOBS.labels(result=outcome).inc()
+        return outcome
+
+    async def _merge(self, job: MergeJob) -> None:
+        # The row lock is held until commit: a second worker that claimed the same job
+        # after a lease expiry waits here and then finds it DONE
+        result = await self.db.execute(
+            select(MergeJob.status).where(MergeJob.id == job.id).with_for_update()
+        )
+        if result.scalar_one_or_none() != "RUNNING":
+            await self.db.commit()
+            return
+
+        annotation = await self.merge_annotations(job.image_id, job.annotation_ids, job.category_id)
+        merged_annotation_id = annotation.id if annotation else None
+
+        if merged_annotation_id and job.consensus_id is not None:
+            await self.db.execute(
+                update(SelectionConsensus)
+                .where(SelectionConsensus.id == job.consensus_id)
+                .values(merged_annotation_id=merged_annotation_id)
+            )
+        await self.db.execute(
+            update(MergeJob)
+            .where(MergeJob.id == job.id)
+            .values(
+                status="DONE",
+                merged_annotation_id=merged_annotation_id,
+                locked_at=None,
+                last_error=None,
+                finished_at=func.now()
+            )
+        )
+        if annotation:
+            # Delivered to the API processes' cache listeners when this transaction commits
+            await self.annotation_service.notify_image_annotations_changed(job.image_id)
+        await self.db.commit()
+
+    async def _record_failure(self, job: MergeJob, error: Exception) -> str:
+        retry = not isinstance(error, ValueError) and job.attempts < settings.merge_job_max_attempts
+        delay = settings.merge_job_retry_delay_seconds * 2 ** max(job.attempts - 1, 0)
+
+        await self.db.execute(
+            update(MergeJob)
+            .where(MergeJob.id == job.id, MergeJob.status == "RUNNING")
+            .values(
+                status="PENDING" if retry else "FAILED",
+                run_after=func.now() + timedelta(seconds=delay),
+                locked_at=None,
+                locked_by=None,
+                last_error=f"{type(error).__name__}: {error}",
+                finished_at=None if retry else func.now()
+            )
+        )
+        await self.db.commit()
+        return "retried" if retry else "failed"
+
+    async def requeue_stale_jobs(self) -> int:
+        """
+        Requeue RUNNING jobs whose worker stopped before finishing them
+
+        Jobs still being merged are row-locked by their worker and skipped.
+        Jobs out of attempts fail instead.
+
+        Returns:
+            int: Number of jobs requeued or failed
+        """
+        out_of_attempts = MergeJob.attempts >= settings.merge_job_max_attempts
+        stale = (
+            select(MergeJob.id)
+            .where(
+                MergeJob.status == "RUNNING",
+                MergeJob.locked_at < func.now() - timedelta(seconds=settings.merge_job_lease_seconds)
+            )
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(MergeJob)
+            .where(MergeJob.id.in_(stale.scalar_subquery()))
+            .values(
+                status=case((out_of_attempts, "FAILED"), else_="PENDING"),
+                run_after=func.now(),
+                locked_at=None,
+                locked_by=None,
+                last_error="Lease expired before the job finished",
+                finished_at=case((out_of_attempts, func.now()), else_=None)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def update_queue_metrics(self) -> None:
+        """Refresh the queue depth and oldest pending job gauges"""
+        result = await self.db.execute(
+            select(MergeJob.status, func.count())
+            .where(MergeJob.status.in_(("PENDING", "RUNNING")))
+            .group_by(MergeJob.status)
+        )
+        depth = dict(result.all())
+        for status in ("PENDING", "RUNNING"):
+            MERGE_JOB_QUEUE_DEPTH.labels(status=status).set(depth.get(status, 0))
+
+        oldest_wait = await self.db.scalar(
+            select(func.extract("epoch", func.now() - func.min(MergeJob.run_after)))
+            .where(MergeJob.status == "PENDING", MergeJob.run_after <= func.now())
+        )
+        MERGE_JOB_OLDEST_PENDING.set(float(oldest_wait or 0))
+        await self.db.commit()
@@ -4,15 +4,17 @@ User Annotation Selection Service
 사용자의 어노테이션 선택 관련 비즈니스 로직을 처리하는 서비스 클래스입니다.
 """
 
-from typing import List, Optional, Tuple
-from sqlalchemy import select, func, and_, desc
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, func, and_, desc, delete, update, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-import numpy as np
-from pycocotools import mask as maskUtils
 
 from . import AnnotationService
+from .merge_job_service import MergeJobService
+from ..config import settings
 from ..models.user_annotation_selection import UserAnnotationSelection
-from ..models.annotation import Annotation
+from ..models.selection_consensus import SelectionConsensus
 from ..models.category import Category
 from ..schemas.user_annotation_selection import (
     UserAnnotationSelectionCreate,
@@ -22,13 +24,19 @@ from ..schemas.user_annotation_selection import (
     UserAnnotationSelectionRead,
     AnnotationSelectionStats,
 )
-from ..schemas.annotation import AnnotationCreate
 from ..utils.annotation_selection import (
     normalize_annotation_ids,
-    parse_annotation_ids_key,
+    selection_fingerprint,
     validate_annotation_ids
 )
-from ..utils.annotation_validation import validate_category_for_dataset
+from ..utils.annotation_validation import find_invalid_categories_for_images, validate_category_for_dataset
+
+
+# Identical PENDING selections needed for auto-approval
+APPROVAL_THRESHOLD = 5
+
+# (image_id, sorted annotation ids, category_id); rows are looked up by selection_fingerprint(annotation ids)
+SelectionGroup = Tuple[int, Tuple[int, ...], Optional[int]]
 
 
 class UserAnnotationSelectionService:
@@ -36,7 +44,7 @@ class UserAnnotationSelectionService:
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.annotation_service = AnnotationService(db)
+        self.merge_job_service = MergeJobService(db)
     
     async def create_selection(
         self, 
@@ -71,39 +79,50 @@ class UserAnnotationSelectionService:
                 raise ValueError(f"Category {selection_data.category_id} is not valid for this dataset's dictionary")
         
         # normalize annotation ids for comparing other selections
-        annotation_ids_key = normalize_annotation_ids(selection_data.selected_annotation_ids)
+        annotation_ids = tuple(sorted(set(selection_data.selected_annotation_ids)))
 
-        existing_selection = await self._find_existing_selection(
-            user_id=user_id,
-            image_id=selection_data.image_id,
-            annotation_ids_key=annotation_ids_key,
-            category_id=selection_data.category_id
+        # A selection the user already made (including one inserted concurrently by
+        # another request) hits uq_selection_user_choice and inserts nothing
+        result = await self.db.execute(
+            pg_insert(UserAnnotationSelection)
+            .values(
+                user_id=user_id,
+                image_id=selection_data.image_id,
+                selected_annotation_ids=list(annotation_ids),
+                selection_hash=selection_fingerprint(annotation_ids),
+                category_id=selection_data.category_id,
+                status="PENDING"
+            )
+            .on_conflict_do_nothing()
+            .returning(UserAnnotationSelection)
         )
+        new_selection = result.scalar_one_or_none()
         
-        if existing_selection:
+        if new_selection is None:
             # if exists, return the existing one
+            existing_selection = await self._find_existing_selection(
+                user_id=user_id,
+                image_id=selection_data.image_id,
+                annotation_ids=annotation_ids,
+                category_id=selection_data.category_id
+            )
+            await self.db.commit()
             return UserAnnotationSelectionRead.model_validate(existing_selection)
-
-        new_selection = UserAnnotationSelection(
-            user_id=user_id,
-            image_id=selection_data.image_id,
-            selected_annotation_ids_key=annotation_ids_key,
-            category_id=selection_data.category_id,
-            status="PENDING"
-        )
         
-        self.db.add(new_selection)
+        created_selection = UserAnnotationSelectionRead.model_validate(new_selection)
+        group = (selection_data.image_id, annotation_ids, selection_data.category_id)
+        pending_counts = await self._apply_consensus_deltas({group: (1, 1)})
         await self.db.commit()
-        await self.db.refresh(new_selection)
         
         # Check if it can be approved and if so, approve it (for single selections)
         await self._check_and_process_approval(
             image_id=selection_data.image_id,
-            annotation_ids_key=annotation_ids_key,
-            category_id=selection_data.category_id
+            annotation_ids=annotation_ids,
+            category_id=selection_data.category_id,
+            pending_count=pending_counts[group]
         )
         
-        return UserAnnotationSelectionRead.model_validate(new_selection)
+        return created_selection
     
     async def create_selections_batch(
         self,
@@ -115,7 +134,9 @@ class UserAnnotationSelectionService:
         
         All selections are created in a single transaction.
         If any validation fails, the entire batch fails.
-        After all selections are created, check for auto-approval in batch.
+        Validation, duplicate detection and the insert take one query each,
+        whatever the batch size. After all selections are created, check for
+        auto-approval in batch.
         
         Args:
             user_id: User ID
@@ -128,74 +149,59 @@ class UserAnnotationSelectionService:
             ValueError: If any selection data is invalid
             HTTPException: If any database constraint is violated
         """
-        # Phase 1: Validate all selections first (before any database operations)
-        validated_selections = []
+        # Phase 1: Validate all selections first (one query for all categories)
         for selection_data in batch_data.selections:
             if not validate_annotation_ids(selection_data.selected_annotation_ids):
                 raise ValueError(f"Invalid annotation IDs: {selection_data.selected_annotation_ids}")
-            
-            # Validate category against dataset's dictionary
-            if selection_data.category_id is not None:
-                is_valid_category = await validate_category_for_dataset(
-                    category_id=selection_data.category_id,
-                    image_id=selection_data.image_id,
-                    db=self.db
-                )
-                if not is_valid_category:
-                    raise ValueError(f"Category {selection_data.category_id} is not valid for this dataset's dictionary")
-            
-            annotation_ids_key = normalize_annotation_ids(selection_data.selected_annotation_ids)
-            validated_selections.append({
-                "selection_data": selection_data,
-                "annotation_ids_key": annotation_ids_key
-            })
         
-        # Phase 2: Check for existing selections and prepare new ones
-        new_selections = []
-        for validated in validated_selections:
-            selection_data = validated["selection_data"]
-            annotation_ids_key = validated["annotation_ids_key"]
-            
-            # Check if selection already exists
-            existing_selection = await self._find_existing_selection(
-                user_id=user_id,
-                image_id=selection_data.image_id,
-                annotation_ids_key=annotation_ids_key,
-                category_id=selection_data.category_id
-            )
-            
-            if existing_selection:
-                continue  # Skip duplicates silently
-            
-            # Prepare new selection
-            new_selection = UserAnnotationSelection(
-                user_id=user_id,
-                image_id=selection_data.image_id,
-                selected_annotation_ids_key=annotation_ids_key,
-                category_id=selection_data.category_id,
-                status="PENDING"
-            )
-            new_selections.append({
-                "model": new_selection,
+        invalid_categories = await find_invalid_categories_for_images(
+            [
+                (selection_data.image_id, selection_data.category_id)
+                for selection_data in batch_data.selections
+                if selection_data.category_id is not None
+            ],
+            self.db
+        )
+        if invalid_categories:
+            _, category_id = min(invalid_categories)
+            raise ValueError(f"Category {category_id} is not valid for this dataset's dictionary")
+        
+        # Phase 2: Normalize keys and drop duplicates within the batch
+        rows = {}
+        for selection_data in batch_data.selections:
+            annotation_ids = tuple(sorted(set(selection_data.selected_annotation_ids)))
+            key = (selection_data.image_id, annotation_ids, selection_data.category_id)
+            rows.setdefault(key, {
+                "user_id": user_id,
                 "image_id": selection_data.image_id,
-                "annotation_ids_key": annotation_ids_key,
-                "category_id": selection_data.category_id
+                "selected_annotation_ids": list(annotation_ids),
+                "selection_hash": selection_fingerprint(annotation_ids),
+                "category_id": selection_data.category_id,
+                "status": "PENDING"
             })
         
-        # Phase 3: Atomically create all new selections
-        created_selections = []
-        for new_selection_info in new_selections:
-            self.db.add(new_selection_info["model"])
-        
+        # Phase 3: One INSERT for the whole batch; selections the user already made
+        # hit uq_selection_user_choice and are skipped silently
+        stmt = (
+            pg_insert(UserAnnotationSelection)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing()
+            .returning(UserAnnotationSelection)
+        )
+        result = await self.db.execute(stmt)
+        created_selections = [UserAnnotationSelectionRead.model_validate(selection) for selection in result.scalars().all()]
+        
+        # Count the new selections into their consensus groups in the same transaction
+        deltas: Dict[SelectionGroup, Tuple[int, int]] = {}
+        for selection in created_selections:
+            group = (selection.image_id, tuple(selection.selected_annotation_ids), selection.category_id)
+            selection_delta, pending_delta = deltas.get(group, (0, 0))
+            deltas[group] = (selection_delta + 1, pending_delta + 1)
+        pending_counts = await self._apply_consensus_deltas(deltas)
         await self.db.commit()
         
-        # Refresh all created selections
-        for new_selection_info in new_selections:
-            await self.db.refresh(new_selection_info["model"])
-            created_selections.append(UserAnnotationSelectionRead.model_validate(new_selection_info["model"]))
-        
         # Phase 4: Batch check and process approvals
-        auto_approved_count, merged_annotations_count = await self._batch_check_and_process_approvals(new_selections)
+        auto_approved_count, merged_annotations_count = await self._batch_check_and_process_approvals(pending_counts)
         
         return UserAnnotationSelectionBatchResponse(
             created_selections=created_selections,
@@ -247,45 +253,36 @@ class UserAnnotationSelectionService:
         self, 
         image_id: int
     ) -> List[AnnotationSelectionStats]:
-        """이미지의 선택 통계 조회"""
+        """이미지의 선택 통계 조회 (selection_consensus 집계 행)"""
         stmt = select(
-            UserAnnotationSelection.selected_annotation_ids_key,
-            UserAnnotationSelection.category_id,
-            Category.name.label('category_name'),
-            func.count(UserAnnotationSelection.id).label('selection_count'),
-            func.min(UserAnnotationSelection.created_at).label('first_selected_at'),
-            func.max(UserAnnotationSelection.created_at).label('last_selected_at'),
-            UserAnnotationSelection.status
-        ).select_from(
-            UserAnnotationSelection
+            SelectionConsensus,
+            Category.name.label('category_name')
         ).outerjoin(
-            Category, UserAnnotationSelection.category_id == Category.id
+            Category, SelectionConsensus.category_id == Category.id
         ).where(
-            UserAnnotationSelection.image_id == image_id
-        ).group_by(
-            UserAnnotationSelection.selected_annotation_ids_key,
-            UserAnnotationSelection.category_id,
-            Category.name,
-            UserAnnotationSelection.status
+            SelectionConsensus.image_id == image_id
         ).order_by(
-            desc('selection_count'),
-            UserAnnotationSelection.selected_annotation_ids_key
+            desc(SelectionConsensus.selection_count),
+            SelectionConsensus.selected_annotation_ids
         )
         
         result = await self.db.execute(stmt)
         stats = []
         
-        for row in result:
+        for consensus, category_name in result:
             stats.append(AnnotationSelectionStats(
                 image_id=image_id,
-                selected_annotation_ids_key=row.selected_annotation_ids_key,
-                category_id=row.category_id,
-                category_name=row.category_name,
-                selection_count=row.selection_count,
-                status=row.status,
-                first_selected_at=row.first_selected_at,
-                last_selected_at=row.last_selected_at,
-                is_ready_for_approval=(row.selection_count >= 5 and row.status == "PENDING")
+                selected_annotation_ids=consensus.selected_annotation_ids,
+                category_id=consensus.category_id,
+                category_name=category_name,
+                selection_count=consensus.selection_count,
+                pending_count=consensus.pending_count,
+                status=consensus.status,
+                first_selected_at=consensus.first_selected_at,
+                last_selected_at=consensus.last_selected_at,
+                is_ready_for_approval=(
+                    consensus.status == "PENDING" and consensus.pending_count >= APPROVAL_THRESHOLD
+                )
             ))
         
         return stats
@@ -295,7 +292,13 @@ class UserAnnotationSelectionService:
         selection_id: int, 
         update_data: UserAnnotationSelectionUpdate
     ) -> Optional[UserAnnotationSelectionRead]:
-        """선택 정보 업데이트"""
+        """
+        선택 정보 업데이트
+        
+        Raises:
+            ValueError: If the category is not valid, or the user already made the same
+                selection with the new category
+        """
         stmt = select(UserAnnotationSelection).where(
             UserAnnotationSelection.id == selection_id
         )
@@ -305,6 +308,9 @@ class UserAnnotationSelectionService:
         if not selection:
             return None
         
+        old_group = (selection.image_id, tuple(selection.selected_annotation_ids), selection.category_id)
+        was_pending = selection.status == "PENDING"
+        
         # 업데이트 적용
         if update_data.category_id is not None:
             # Validate category against dataset's dictionary
@@ -323,6 +329,24 @@ class UserAnnotationSelectionService:
         
         selection.updated_at = func.now()
         
+        # A new category can collide with another selection of the same user (uq_selection_user_choice)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("The user already made this selection with the same category")
+        
+        # Move the selection between consensus groups / pending counts
+        new_group = (selection.image_id, tuple(selection.selected_annotation_ids), selection.category_id)
+        is_pending = selection.status == "PENDING"
+        if new_group != old_group:
+            await self._apply_consensus_deltas({
+                old_group: (-1, -int(was_pending)),
+                new_group: (1, int(is_pending))
+            })
+        elif is_pending != was_pending:
+            await self._apply_consensus_deltas({old_group: (0, int(is_pending) - int(was_pending))})
+        
         await self.db.commit()
         await self.db.refresh(selection)
         
@@ -343,42 +367,254 @@ class UserAnnotationSelectionService:
             return False
         
         await self.db.delete(selection)
+        await self._apply_consensus_deltas({
+            (selection.image_id, tuple(selection.selected_annotation_ids), selection.category_id):
+                (-1, -int(selection.status == "PENDING"))
+        })
         await self.db.commit()
         
         return True
     
-    async def approve_selections_batch(
+    async def _approve_group(
         self,
-        selections_to_approve: List[Tuple[int, str, Optional[int]]]  # (image_id, annotation_ids_key, category_id)
-    ) -> int:
-        """Batch approve the user selections"""
-        approved_count = 0
-        
-        for image_id, annotation_ids_key, category_id in selections_to_approve:
-            stmt = select(UserAnnotationSelection).where(
-                and_(
-                    UserAnnotationSelection.image_id == image_id,
-                    UserAnnotationSelection.selected_annotation_ids_key == annotation_ids_key,
-                    UserAnnotationSelection.category_id == category_id,
-                    UserAnnotationSelection.status == "PENDING"
+        group: SelectionGroup,
+        approval_threshold: int = APPROVAL_THRESHOLD
+    ) -> Tuple[int, bool]:
+        """
+        Approve a selection group and merge its annotations, at most once
+        
+        Concurrent requests can all see the same group reach the threshold.
+        The conditional UPDATE on the group's selection_consensus row lets only
+        one of them claim it: the row stays locked until that transaction
+        commits, and the other requests then re-check status = 'PENDING'
+        against the committed row and match nothing.
+        
+        Args:
+            group: (image_id, annotation ids, category_id)
+            approval_threshold: Minimum number of PENDING selections needed for approval
+            
+        With selection_merge_mode = "queue" the merge is enqueued as a merge
+        job in the same transaction (scripts/merge_worker.py runs it);
+        "inline" merges here, with the mask work on the process pool. An
+        inline merge that fails with ValueError still approves the group and
+        is recorded as a FAILED merge job.
+        
+        Returns:
+            Tuple of (approved selection count, whether a merge was queued or created);
+            (0, False) if the group was not claimed
+        """
+        image_id, annotation_ids, category_id = group
+        
+        claimed = await self.db.execute(
+            update(SelectionConsensus)
+            .where(
+                *self._consensus_group_filter(group),
+                SelectionConsensus.status == "PENDING",
+                SelectionConsensus.pending_count >= approval_threshold
+            )
+            .values(status="APPROVED", pending_count=0)
+            .returning(SelectionConsensus.id)
+        )
+        consensus_id = claimed.scalar_one_or_none()
+        if consensus_id is None:
+            return 0, False
+        
+        result = await self.db.execute(
+            update(UserAnnotationSelection)
+            .where(
+                UserAnnotationSelection.image_id == image_id,
+                UserAnnotationSelection.selection_hash == selection_fingerprint(annotation_ids),
+                UserAnnotationSelection.category_id == category_id,
+                UserAnnotationSelection.status == "PENDING"
+            )
+            .values(status="APPROVED", updated_at=func.now())
+        )
+        approved_count = result.rowcount
+        
+        key = normalize_annotation_ids(annotation_ids)
+        
+        if settings.selection_merge_mode == "queue":
+            await self.merge_job_service.enqueue(consensus_id, image_id, list(annotation_ids), category_id)
+            await self.db.commit()
+            print(f"Queued merge job for selection key {key}")
+            return approved_count, True
+        
+        # Merge the selected annotations' masks into a single annotation, committed
+        # together with the claim and the approvals
+        try:
+            async with self.db.begin_nested():
+                merged_annotation = await self.merge_job_service.merge_annotations(
+                    image_id=image_id,
+                    annotation_ids=list(annotation_ids),
+                    category_id=category_id
                 )
+        except ValueError as e:
+            # Masks that cannot be merged (different sizes, invalid category) are not the
+            # caller's fault: keep the approval and record a FAILED job, as the queue does
+            await self.merge_job_service.record_failed_merge(
+                consensus_id, image_id, list(annotation_ids), category_id, e
+            )
+            await self.db.commit()
+            print(f"Failed to merge selection key {key}: {e}")
+            return approved_count, False
+        
+        if merged_annotation:
+            await self.db.execute(
+                update(SelectionConsensus)
+                .where(SelectionConsensus.id == consensus_id)
+                .values(merged_annotation_id=merged_annotation.id)
             )
-            result = await self.db.execute(stmt)
-            selections = result.scalars().all()
+        await self.db.commit()
+        
+        if not merged_annotation:
+            return approved_count, False
+        
+        AnnotationService.invalidate_image_annotations_cache(image_id)
+        print(f"Created merged annotation {merged_annotation.id} for selection key {key}")
+        return approved_count, True
+    
+    def _consensus_group_filter(self, group: SelectionGroup) -> list:
+        image_id, annotation_ids, category_id = group
+        return [
+            SelectionConsensus.image_id == image_id,
+            SelectionConsensus.selection_hash == selection_fingerprint(annotation_ids),
+            SelectionConsensus.category_id == category_id
+        ]
+    
+    async def _apply_consensus_deltas(
+        self,
+        deltas: Dict[SelectionGroup, Tuple[int, int]]
+    ) -> Dict[SelectionGroup, int]:
+        """
+        Apply selection count changes to selection_consensus (no commit)
+        
+        One INSERT ... ON CONFLICT DO UPDATE for all groups, so concurrent
+        writers add to the counts atomically. Groups left without selections
+        are deleted.
+        
+        Args:
+            deltas: (selection_count delta, pending_count delta) per group
             
-            for selection in selections:
-                selection.status = "APPROVED"
-                selection.updated_at = func.now()
-                approved_count += len(selections)
+        Returns:
+            Dict[SelectionGroup, int]: pending_count of each group after the change
+        """
+        if not deltas:
+            return {}
+        
+        stmt = pg_insert(SelectionConsensus).values([
+            {
+                "image_id": image_id,
+                "selected_annotation_ids": list(annotation_ids),
+                "selection_hash": selection_fingerprint(annotation_ids),
+                "category_id": category_id,
+                "selection_count": selection_delta,
+                "pending_count": pending_delta
+            }
+            # Same row order in every transaction, so concurrent batches cannot deadlock
+            for (image_id, annotation_ids, category_id), (selection_delta, pending_delta) in sorted(
+                deltas.items(),
+                key=lambda item: (item[0][0], item[0][1], item[0][2] or 0)
+            )
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SelectionConsensus.image_id,
+                SelectionConsensus.selection_hash,
+                SelectionConsensus.category_id
+            ],
+            set_={
+                "selection_count": SelectionConsensus.selection_count + stmt.excluded.selection_count,
+                "pending_count": SelectionConsensus.pending_count + stmt.excluded.pending_count,
+                "last_selected_at": func.now()
+            }
+        ).returning(
+            SelectionConsensus.id,
+            SelectionConsensus.image_id,
+            SelectionConsensus.selected_annotation_ids,
+            SelectionConsensus.category_id,
+            SelectionConsensus.selection_count,
+            SelectionConsensus.pending_count
+        )
+        result = await self.db.execute(stmt)
+        
+        pending_counts = {}
+        empty_ids = []
+        for row in result:
+            pending_counts[(row.image_id, tuple(row.selected_annotation_ids), row.category_id)] = row.pending_count
+            if row.selection_count <= 0:
+                empty_ids.append(row.id)
+        
+        if empty_ids:
+            await self.db.execute(delete(SelectionConsensus).where(SelectionConsensus.id.in_(empty_ids)))
+        
+        return pending_counts
+    
+    async def refresh_consensus(self, image_id: Optional[int] = None) -> None:
+        """
+        Rebuild selection_consensus from user_annotation_selections
         
+        The write paths keep it current; this repairs it (e.g. after bulk loads).
+        Existing rows are updated in place so their merged_annotation_id is kept.
+        
+        Args:
+            image_id: Only rebuild this image's groups (all images if None)
+        """
+        group_has_selections = select(UserAnnotationSelection.id).where(
+            UserAnnotationSelection.image_id == SelectionConsensus.image_id,
+            UserAnnotationSelection.selection_hash == SelectionConsensus.selection_hash,
+            UserAnnotationSelection.category_id.is_not_distinct_from(SelectionConsensus.category_id)
+        ).exists()
+        consensus_delete = delete(SelectionConsensus).where(~group_has_selections)
+        selections_filter = []
+        if image_id is not None:
+            consensus_delete = consensus_delete.where(SelectionConsensus.image_id == image_id)
+            selections_filter.append(UserAnnotationSelection.image_id == image_id)
+        await self.db.execute(consensus_delete)
+        
+        aggregates = select(
+            UserAnnotationSelection.image_id,
+            UserAnnotationSelection.selection_hash,
+            UserAnnotationSelection.category_id,
+            func.min(UserAnnotationSelection.selected_annotation_ids).label("selected_annotation_ids"),
+            func.count().label("selection_count"),
+            func.count().filter(UserAnnotationSelection.status == "PENDING").label("pending_count"),
+            case(
+                (func.bool_or(UserAnnotationSelection.status == "APPROVED"), "APPROVED"),
+                else_="PENDING"
+            ).label("status"),
+            func.min(UserAnnotationSelection.created_at).label("first_selected_at"),
+            func.max(UserAnnotationSelection.created_at).label("last_selected_at")
+        ).where(*selections_filter).group_by(
+            UserAnnotationSelection.image_id,
+            UserAnnotationSelection.selection_hash,
+            UserAnnotationSelection.category_id
+        )
+        stmt = pg_insert(SelectionConsensus).from_select(
+            [column.name for column in aggregates.selected_columns],
+            aggregates
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    SelectionConsensus.image_id,
+                    SelectionConsensus.selection_hash,
+                    SelectionConsensus.category_id
+                ],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in (
+                        "selection_count", "pending_count", "status", "first_selected_at", "last_selected_at"
+                    )
+                }
+            )
+        )
         await self.db.commit()
-        return approved_count
     
     async def _find_existing_selection(
         self,
         user_id: int,
         image_id: int,
-        annotation_ids_key: str,
+        annotation_ids: Tuple[int, ...],
         category_id: Optional[int]
     ) -> Optional[UserAnnotationSelection]:
         """Find existing selection if a user selects the same annotations_test for the same category"""
@@ -386,7 +622,7 @@ class UserAnnotationSelectionService:
             and_(
                 UserAnnotationSelection.user_id == user_id,
                 UserAnnotationSelection.image_id == image_id,
-                UserAnnotationSelection.selected_annotation_ids_key == annotation_ids_key,
+                UserAnnotationSelection.selection_hash == selection_fingerprint(annotation_ids),
                 UserAnnotationSelection.category_id == category_id
             )
         )
@@ -396,231 +632,50 @@ class UserAnnotationSelectionService:
     async def _check_and_process_approval(
         self,
         image_id: int,
-        annotation_ids_key: str,
+        annotation_ids: Tuple[int, ...],
         category_id: Optional[int],
-        approval_threshold: int = 5
+        pending_count: int,
+        approval_threshold: int = APPROVAL_THRESHOLD
     ) -> None:
         """ Check if it can be approved and if so, approve it """
-        # Count of same selections
-        stmt = select(func.count(UserAnnotationSelection.id)).where(
-            and_(
-                UserAnnotationSelection.image_id == image_id,
-                UserAnnotationSelection.selected_annotation_ids_key == annotation_ids_key,
-                UserAnnotationSelection.category_id == category_id,
-                UserAnnotationSelection.status == "PENDING"
-            )
-        )
-        result = await self.db.execute(stmt)
-        selection_count = result.scalar()
-        
+        # pending_count comes from the consensus upsert, no count query needed
         # If it exceeds the threshold, auto approval
-        if selection_count >= approval_threshold:
-            await self.approve_selections_batch([
-                (image_id, annotation_ids_key, category_id)
-            ])
-
-            # Extract annotation IDs and merge their masks into a single annotation
-            annotation_ids = parse_annotation_ids_key(annotation_ids_key)
-            merged_annotation_id = await self._create_merged_annotation(
-                image_id=image_id,
-                annotation_ids=annotation_ids,
-                category_id=category_id
+        if pending_count >= approval_threshold:
+            await self._approve_group(
+                (image_id, annotation_ids, category_id),
+                approval_threshold
             )
-            
-            if merged_annotation_id:
-                print(f"Successfully created merged annotation {merged_annotation_id} for selections with key {annotation_ids_key}")
-
-    async def _create_merged_annotation(
-        self,
-        image_id: int,
-        annotation_ids: List[int],
-        category_id: Optional[int]
-    ) -> Optional[int]:
-        """
-        Create a single merged annotation from multiple selected annotations_test
-        
-        Args:
-            image_id: ID of the image
-            annotation_ids: List of annotation IDs to merge
-            category_id: Category to assign to the merged annotation
-            
-        Returns:
-            ID of the created merged annotation, or None if failed
-        """
-        # Get all annotations_test to merge
-        stmt = select(Annotation).where(
-            and_(
-                Annotation.id.in_(annotation_ids),
-                Annotation.image_id == image_id
-            )
-        )
-        result = await self.db.execute(stmt)
-        annotations = result.scalars().all()
-        
-        if not annotations:
-            return None
-        
-        # Extract RLE masks and merge them
-        merged_rle = self._merge_annotation_masks(list(annotations))
-        if not merged_rle:
-            return None
-        
-        # Calculate bounding box and area from merged mask
-        bbox = self._calculate_bbox_from_rle(merged_rle)
-        area = float(maskUtils.area(merged_rle))
-        
-        # Create the merged annotation
-        merged_annotation_data = AnnotationCreate(
-            image_id=image_id,
-            category_id=category_id,
-            segmentation_size=merged_rle['size'],
-            segmentation_counts=merged_rle['counts'].decode('utf-8') if isinstance(merged_rle['counts'], bytes) else merged_rle['counts'],
-            bbox=bbox,
-            area=area,
-            source_type="USER",
-            status="APPROVED",
-            is_crowd=False,
-            point_coords=None,
-            predicted_iou=None,
-            stability_score=None,
-            created_by=None  # This is a system-generated merged annotation
-        )
-        
-        created_annotation = await self.annotation_service.create_annotation(merged_annotation_data)
-        return created_annotation.id if created_annotation else None
-
-    def _merge_annotation_masks(self, annotations: List[Annotation]) -> Optional[dict]:
-        """
-        Merge multiple annotation masks into a single RLE mask
-        
-        Args:
-            annotations: List of annotations_test to merge
-            
-        Returns:
-            Merged RLE mask in COCO format, or None if merging failed
-        """
-        try:
-            valid_masks = []
-            
-            # Collect valid RLE masks
-            for annotation in annotations:
-                if annotation.segmentation_counts and annotation.segmentation_size:
-                    rle = {
-                        'size': annotation.segmentation_size,
-                        'counts': annotation.segmentation_counts.encode('utf-8')
-                    }
-                    valid_masks.append(rle)
-            
-            if not valid_masks:
-                return None
-            
-            if len(valid_masks) == 1:
-                return valid_masks[0]
-            
-            # Convert RLEs to binary masks
-            binary_masks = [maskUtils.decode(rle) for rle in valid_masks]
-            
-            # Merge by taking the union (logical OR) of all masks
-            merged_mask = binary_masks[0].astype(np.uint8)
-            for i in range(1, len(binary_masks)):
-                merged_mask = np.logical_or(merged_mask, binary_masks[i]).astype(np.uint8)
-            
-            # Convert back to RLE
-            merged_rle = maskUtils.encode(np.asfortranarray(merged_mask))
-            
-            return merged_rle
-            
-        except Exception as e:
-            print(f"Error merging annotation masks: {e}")
-            return None
-
-    def _calculate_bbox_from_rle(self, rle: dict) -> List[float]:
-        """
-        Calculate bounding box from RLE mask
-        
-        Args:
-            rle: RLE mask in COCO format
-            
-        Returns:
-            Bounding box in [x, y, width, height] format
-        """
-        try:
-            bbox = maskUtils.toBbox(rle)
-            return [float(x) for x in bbox]
-        except Exception as e:
-            print(f"Error calculating bbox from RLE: {e}")
-            # Return a default bbox if calculation fails
-            return [0.0, 0.0, float(rle['size'][1]), float(rle['size'][0])]
 
     async def _batch_check_and_process_approvals(
         self,
-        new_selections: List[dict],
-        approval_threshold: int = 5
+        pending_counts: Dict[SelectionGroup, int],
+        approval_threshold: int = APPROVAL_THRESHOLD
     ) -> tuple[int, int]:
         """
         Batch check and process approvals for newly created selections
         
         Args:
-            new_selections: List of newly created selection info dicts
+            pending_counts: PENDING selection count per group the new selections were added to
+                (as returned by _apply_consensus_deltas)
             approval_threshold: Minimum number of selections needed for approval
             
         Returns:
             Tuple of (auto_approved_count, merged_annotations_count)
         """
-        if not new_selections:
+        if not pending_counts:
             return 0, 0
         
-        # Group selections by (image_id, annotation_ids_key, category_id)
-        selection_groups = {}
-        for selection_info in new_selections:
-            key = (
-                selection_info["image_id"],
-                selection_info["annotation_ids_key"], 
-                selection_info["category_id"]
-            )
-            if key not in selection_groups:
-                selection_groups[key] = []
-            selection_groups[key].append(selection_info)
-        
-        # Check each unique selection combination
-        selections_to_approve = []
         auto_approved_count = 0
-        
-        for (image_id, annotation_ids_key, category_id), group in selection_groups.items():
-            # Count total selections (including existing ones) for this combination
-            stmt = select(func.count(UserAnnotationSelection.id)).where(
-                and_(
-                    UserAnnotationSelection.image_id == image_id,
-                    UserAnnotationSelection.selected_annotation_ids_key == annotation_ids_key,
-                    UserAnnotationSelection.category_id == category_id,
-                    UserAnnotationSelection.status == "PENDING"
-                )
-            )
-            result = await self.db.execute(stmt)
-            total_count = result.scalar()
-            
-            # If threshold is reached, mark for approval
-            if total_count >= approval_threshold:
-                selections_to_approve.append((image_id, annotation_ids_key, category_id))
-                auto_approved_count += total_count
-        
-        # Batch approve selections and create merged annotations_test
         merged_annotations_count = 0
-        if selections_to_approve:
-            # Approve all qualifying selections
-            await self.approve_selections_batch(selections_to_approve)
+        
+        # Approve each group that reached the threshold and merge (or queue the merge of) its annotations
+        for group, pending_count in pending_counts.items():
+            if pending_count < approval_threshold:
+                continue
             
-            # Create merged annotations_test for each approved combination
-            for image_id, annotation_ids_key, category_id in selections_to_approve:
-                annotation_ids = parse_annotation_ids_key(annotation_ids_key)
-                merged_annotation_id = await self._create_merged_annotation(
-                    image_id=image_id,
-                    annotation_ids=annotation_ids,
-                    category_id=category_id
-                )
-                
-                if merged_annotation_id:
-                    merged_annotations_count += 1
-                    print(f"Created merged annotation {merged_annotation_id} for selection key {annotation_ids_key}")
+            approved_count, merged = await self._approve_group(group, approval_threshold)
+            auto_approved_count += approved_count
+            if merged:
+                merged_annotations_count += 1
         
         return auto_approved_count, merged_annotations_count
@@ -16,6 +16,7 @@ from ..schemas.user_reward import (
     UserContributionStats, LeaderboardEntry, LeaderboardResponse
 )
 from ..schemas.common import PaginationInput
+from ..utils.pagination import apply_keyset_pagination, paginate_rows
 
 
 class UserRewardService:
@@ -86,28 +87,43 @@ class UserRewardService:
         if reward_type:
             query = query.where(UserReward.reward_type == reward_type)
         
-        # 총 개수 계산
-        count_query = select(func.count(UserReward.id)).where(UserReward.user_id == user_id)
-        if reward_type:
-            count_query = count_query.where(UserReward.reward_type == reward_type)
+        cursor_mode = pagination.cursor is not None
         
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        # 총 개수 계산 (커서 페이지네이션은 include_total일 때만)
+        total = None
+        if not cursor_mode or pagination.include_total:
+            count_query = select(func.count(UserReward.id)).where(UserReward.user_id == user_id)
+            if reward_type:
+                count_query = count_query.where(UserReward.reward_type == reward_type)
+            
+            total_result = await self.db.execute(count_query)
+            total = total_result.scalar()
         
         # 페이지네이션 적용
-        query = query.order_by(desc(UserReward.created_at))
-        query = query.offset((pagination.page - 1) * pagination.limit)
-        query = query.limit(pagination.limit)
+        if cursor_mode:
+            query = apply_keyset_pagination(
+                query, "created_at", UserReward.created_at, UserReward.id,
+                descending=True, cursor=pagination.cursor, limit=pagination.limit
+            )
+        else:
+            query = query.order_by(desc(UserReward.created_at))
+            query = query.offset((pagination.page - 1) * pagination.limit)
+            query = query.limit(pagination.limit)
         
         result = await self.db.execute(query)
         rewards = result.scalars().all()
         
+        next_cursor = None
+        if cursor_mode:
+            rewards, next_cursor = paginate_rows(rewards, pagination.limit, "created_at", "created_at")
+        
         return UserRewardListResponse(
             items=rewards,
             total=total,
             page=pagination.page,
             size=pagination.limit,
-            pages=(total + pagination.limit - 1) // pagination.limit
+            pages=(total + pagination.limit - 1) // pagination.limit if total is not None else None,
+            next_cursor=next_cursor
         )
     
     async def get_user_contribution_stats(self, user_id: int) -> UserContributionStats:
@@ -36,6 +36,27 @@ def normalize_annotation_ids(annotation_ids: List[int]) -> str:
     return ','.join(str(id_) for id_ in unique_sorted_ids)
 
 
+def selection_fingerprint(annotation_ids: List[int]) -> int:
+    """
+    어노테이션 ID 조합의 64-bit 지문을 생성합니다. (selection_hash 컬럼 값)
+    
+    First 8 bytes of the SHA-256 of normalize_annotation_ids(), read as a
+    signed BIGINT, so the order and duplicates of the input IDs do not matter.
+    Postgres computes the same value from the key string with
+    ('x' || left(encode(sha256(convert_to(key, 'UTF8')), 'hex'), 16))::bit(64)::bigint,
+    which the backfill migration uses. Lookups are always scoped to an image,
+    where two different ID sets colliding is negligible.
+    
+    Args:
+        annotation_ids: 어노테이션 ID 목록
+        
+    Returns:
+        int: -2^63 ~ 2^63-1 범위의 정수
+    """
+    digest = hashlib.sha256(normalize_annotation_ids(annotation_ids).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
 def parse_annotation_ids_key(annotation_ids_key: str) -> List[int]:
     """
     Parse normalized keys to annotation ID list.
@@ -4,7 +4,9 @@ Annotation validation utilities
 Provides validation functions for annotation operations to ensure data integrity
 """
 
-from sqlalchemy import select
+from typing import Iterable, Set, Tuple
+
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.image import Image
@@ -60,6 +62,64 @@ async def validate_category_for_dataset(
     return validation_result.scalar_one_or_none() is not None
 
 
+async def find_invalid_categories_for_images(
+    pairs: Iterable[Tuple[int, int]],
+    db: AsyncSession
+) -> Set[Tuple[int, int]]:
+    """
+    Batch version of validate_category_for_dataset: checks many
+    (image_id, category_id) pairs in a single query.
+    
+    Same rules per pair: images without a dataset (or missing images) are
+    invalid, datasets without a dictionary allow every category.
+    
+    Args:
+        pairs: (image_id, category_id) pairs to validate
+        db: Database session
+        
+    Returns:
+        Set[Tuple[int, int]]: The pairs that are not valid
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return set()
+    
+    image_ids = {image_id for image_id, _ in pairs}
+    category_ids = {category_id for _, category_id in pairs}
+    
+    # One row per (image, matching dictionary category); images without a match keep one NULL row
+    result = await db.execute(
+        select(Image.id, Image.dataset_id, Dataset.dictionary_id, DictionaryCategory.category_id)
+        .select_from(Image)
+        .outerjoin(Dataset, Dataset.id == Image.dataset_id)
+        .outerjoin(
+            DictionaryCategory,
+            and_(
+                DictionaryCategory.dictionary_id == Dataset.dictionary_id,
+                DictionaryCategory.category_id.in_(category_ids)
+            )
+        )
+        .where(Image.id.in_(image_ids))
+    )
+    
+    no_dataset = set(image_ids)
+    unrestricted = set()
+    allowed = set()
+    for image_id, dataset_id, dictionary_id, category_id in result:
+        if not dataset_id:
+            continue
+        no_dataset.discard(image_id)
+        if not dictionary_id:
+            unrestricted.add(image_id)
+        elif category_id is not None:
+            allowed.add((image_id, category_id))
+    
+    return {
+        (image_id, category_id) for image_id, category_id in pairs
+        if image_id in no_dataset or (image_id not in unrestricted and (image_id, category_id) not in allowed)
+    }
+
+
 async def get_valid_categories_for_image(
     image_id: int,
     db: AsyncSession
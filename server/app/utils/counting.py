@@ -0,0 +1,194 @@
+"""
+Listing total counts
+
+An exact COUNT(*) over a large table with the listing's filters can cost more
+than the page itself. count_rows() asks the planner first:
+
+    no filters   - pg_class.reltuples (kept current by autovacuum/ANALYZE)
+    with filters - the row estimate of EXPLAIN for the filtered query
+
+Estimates at or above Settings.count_estimate_threshold are returned as they
+are (total_is_exact=False). Smaller results are counted exactly, and exact
+counts are cached per table and filter signature for a short TTL, so paging
+through the same listing counts once.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from prometheus_client import Counter
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from ..config import settings
+
+
+COUNT_METHOD_EXACT = "exact"
+COUNT_METHOD_CACHED = "cached"
+COUNT_METHOD_RELTUPLES = "reltuples"
+COUNT_METHOD_EXPLAIN = "explain"
+
+LISTING_COUNTS = Counter(
+    "opengraph_listing_counts_total",
+    "Listing totals by table and how they were obtained (exact, cached, reltuples, explain)",
+    ["table", "method"]
+)
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, keeping the statement's bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class _CountCache:
+    """Entry-bounded LRU of exact counts with TTL (per uvicorn worker)"""
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        total, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return total
+
+    def set(self, key: Hashable, total: int) -> None:
+        if settings.count_cache_ttl_seconds <= 0 or settings.count_cache_max_entries <= 0:
+            return
+
+        self._entries[key] = (total, time.monotonic() + settings.count_cache_ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.count_cache_max_entries:
+            self._entries.popitem(last=False)
+
+
+_count_cache = _CountCache()
+
+
+def _filter_signature(table_name: str, conditions: List[Any]) -> Hashable:
+    """Cache key of a table and its filters: SQL text plus bound values"""
+    statement = select(text("1")).where(*conditions) if conditions else select(text("1"))
+    compiled = statement.compile(dialect=postgresql.dialect())
+    params = tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+    return (table_name, str(compiled), params)
+
+
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Planner row estimate of a whole table
+
+    Args:
+        db: Database session
+        table_name: Table name
+
+    Returns:
+        Optional[int]: pg_class.reltuples, or None if the table was never analyzed
+    """
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+        {"table_name": table_name}
+    )
+    reltuples = result.scalar()
+    # -1 until the first VACUUM/ANALYZE
+    if reltuples is None or reltuples < 0:
+        return None
+    return reltuples
+
+
+async def explain_plan(db: Union[AsyncSession, AsyncConnection], query) -> Dict[str, Any]:
+    """
+    Planner output of a query (EXPLAIN without ANALYZE, the query is not run)
+
+    Args:
+        db: Database session or connection
+        query: Select statement
+
+    Returns:
+        Dict[str, Any]: Top plan node of EXPLAIN (FORMAT JSON)
+    """
+    result = await db.execute(_ExplainJSON(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def estimate_query_rows(db: AsyncSession, query) -> int:
+    """
+    Planner row estimate of a query
+
+    Args:
+        db: Database session
+        query: Select statement
+
+    Returns:
+        int: "Plan Rows" of the top plan node
+    """
+    plan = await explain_plan(db, query)
+    return int(plan["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, model, conditions: Optional[List[Any]] = None) -> Tuple[int, bool]:
+    """
+    Total rows of a listing, estimated when it is large
+
+    Args:
+        db: Database session
+        model: ORM model of the listed table (must have an id column)
+        conditions: The listing's WHERE conditions
+
+    Returns:
+        Tuple of (total, total_is_exact)
+    """
+    conditions = conditions or []
+    table_name = model.__tablename__
+    threshold = settings.count_estimate_threshold
+
+    key = _filter_signature(table_name, conditions)
+    cached_total = _count_cache.get(key)
+    if cached_total is not None:
+        LISTING_COUNTS.labels(table=table_name, method=COUNT_METHOD_CACHED).inc()
+        return cached_total, True
+
+    if threshold > 0:
+        if conditions:
+            estimate = await estimate_query_rows(db, select(model.id).where(*conditions))
+            method = COUNT_METHOD_EXPLAIN
+        else:
+            estimate = await estimate_table_rows(db, table_name)
+            method = COUNT_METHOD_RELTUPLES
+
+        if estimate is not None and estimate >= threshold:
+            LISTING_COUNTS.labels(table=table_name, method=method).inc()
+            return estimate, False
+
+    count_query = select(func.count(model.id))
+    if conditions:
+        count_query = count_query.where(*conditions)
+    result = await db.execute(count_query)
+    total = result.scalar() or 0
+
+    _count_cache.set(key, total)
+    LISTING_COUNTS.labels(table=table_name, method=COUNT_METHOD_EXACT).inc()
+    return total, True
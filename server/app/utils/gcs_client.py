@@ -1,82 +1,91 @@
 """
 Google Cloud Storage Client
 
-Handles image upload and signed URL generation for GCS
+Blob upload, download and signed URL generation for GCS (used through utils.storage)
 """
 
 import os
-import base64
-import uuid
 from datetime import timedelta
-from typing import Optional, Tuple
+from typing import BinaryIO, List, Optional
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from google.cloud.storage import Blob
-import io
-from PIL import Image as PILImage
+from requests.adapters import HTTPAdapter
 from ..config import settings
 
 
+def create_storage_client(pool_size: Optional[int] = None) -> storage.Client:
+    """Create a storage client with a pooled HTTP transport
+    
+    The default transport keeps 10 connections per host, so concurrent uploads
+    beyond that open and drop a TLS connection each. The session is meant to
+    be shared: one per process (see utils.storage.get_storage_backend).
+    
+    Args:
+        pool_size: Connections kept open to the storage API (defaults to settings value)
+        
+    Returns:
+        storage.Client using the pooled session
+    """
+    pool_size = pool_size or settings.storage_http_pool_size
+    
+    # Set the service account credentials if configured
+    if settings.google_application_credentials:
+        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = settings.google_application_credentials
+    
+    credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    
+    return storage.Client(project=settings.google_cloud_project, credentials=credentials, _http=session)
+
+
 class GCSClient:
     """Google Cloud Storage client for image operations"""
     
-    def __init__(self, bucket_name: Optional[str] = None):
+    def __init__(self, bucket_name: Optional[str] = None, client: Optional[storage.Client] = None):
         """Initialize GCS client
         
         Args:
             bucket_name: Name of the GCS bucket (defaults to settings value)
+            client: Shared storage client (a new pooled client is created if omitted)
         """
         # Use bucket name from settings if not provided
         self.bucket_name = bucket_name or settings.gcs_bucket_name
         
-        # Set the service account credentials if configured
-        if settings.google_application_credentials:
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = settings.google_application_credentials
-        
-        # Initialize client with project from settings
-        self.client = storage.Client(project=settings.google_cloud_project)
+        self.client = client or create_storage_client()
         self.bucket = self.client.bucket(self.bucket_name)
     
-    def upload_image(
-        self,
-        image_data: str,
-        file_name: Optional[str] = None,
-        folder: str = "first-person-images"
-    ) -> Tuple[str, int, int]:
-        """Upload image to GCS
+    def upload_bytes(self, blob_name: str, data: bytes, content_type: str = 'application/octet-stream') -> None:
+        """Upload bytes to a blob
         
         Args:
-            image_data: Base64 encoded image data or image URL
-            file_name: Optional file name
-            folder: Folder path in bucket
-            
-        Returns:
-            Tuple of (blob_name, width, height)
+            blob_name: Name of the blob in GCS
+            data: Blob content
+            content_type: Content type stored with the blob
         """
-        # Generate unique filename if not provided
-        if not file_name:
-            file_name = f"{uuid.uuid4()}.jpg"
-        
-        # Construct blob path
-        blob_name = f"{folder}/{file_name}"
-        
-        # Decode base64 image if it's a data URL
-        if image_data.startswith('data:image'):
-            # Extract base64 part from data URL
-            header, encoded = image_data.split(',', 1)
-            image_bytes = base64.b64decode(encoded)
-        else:
-            # Assume it's already base64 encoded
-            image_bytes = base64.b64decode(image_data)
-        
-        # Get image dimensions
-        img = PILImage.open(io.BytesIO(image_bytes))
-        width, height = img.size
-        
-        # Upload to GCS
         blob = self.bucket.blob(blob_name)
-        blob.upload_from_string(image_bytes, content_type='image/jpeg')
+        blob.upload_from_string(data, content_type=content_type)
+    
+    def upload_file(
+        self,
+        blob_name: str,
+        fileobj: BinaryIO,
+        content_type: str = 'application/octet-stream',
+        chunk_size: Optional[int] = None
+    ) -> None:
+        """Upload a file to a blob, streaming it in chunks
         
-        return blob_name, width, height
+        Args:
+            blob_name: Name of the blob in GCS
+            fileobj: Binary file positioned at the start of the content
+            content_type: Content type stored with the blob
+            chunk_size: Resumable upload chunk size (multiple of 256 KiB)
+        """
+        blob = self.bucket.blob(blob_name, chunk_size=chunk_size)
+        blob.upload_from_file(fileobj, content_type=content_type)
     
     def generate_signed_url(
         self,
@@ -102,6 +111,36 @@ class GCSClient:
         
         return url
     
+    def generate_signed_urls(
+        self,
+        blob_names: List[str],
+        expiration: timedelta = timedelta(hours=1)
+    ) -> List[str]:
+        """Generate signed URLs for several blobs
+        
+        V4 signing happens locally with the client's credentials, so a page of
+        images is signed with one client and no request per image.
+        
+        Args:
+            blob_names: Names of the blobs in GCS
+            expiration: How long the URLs should be valid
+            
+        Returns:
+            Signed URL strings in the order of blob_names
+        """
+        return [self.generate_signed_url(blob_name, expiration) for blob_name in blob_names]
+    
+    def download_bytes(self, blob_name: str) -> bytes:
+        """Download a blob
+        
+        Args:
+            blob_name: Name of the blob in GCS
+            
+        Returns:
+            Blob content
+        """
+        return self.bucket.blob(blob_name).download_as_bytes()
+    
     def delete_blob(self, blob_name: str) -> bool:
         """Delete a blob from GCS
         
@@ -113,4 +152,8 @@ class GCSClient:
         """
         blob = self.bucket.blob(blob_name)
         blob.delete()
-        return True
\ No newline at end of file
+        return True
+    
+    def close(self) -> None:
+        """Close the client's HTTP session"""
+        self.client.close()
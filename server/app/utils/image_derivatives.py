@@ -0,0 +1,148 @@
+"""
+Image derivatives (thumbnail and medium size variants)
+
+List pages show images far smaller than the originals, so every stored image
+gets downscaled variants next to it in the storage backend:
+
+    <blob_name>.thumbnail.<format>   long side Settings.image_thumbnail_size
+    <blob_name>.medium.<format>      long side Settings.image_medium_size
+
+Format (webp or jpeg) and quality come from Settings. The format used is
+stored per image (images.derivative_format), so changing the setting only
+affects images rendered afterwards. Rendering is CPU bound and
+runs on the mask process pool; downloads and uploads run on the storage
+executor. render_derivatives must stay a top-level function so it can be
+pickled to pool workers.
+"""
+
+import asyncio
+import io
+from typing import Dict, List, Tuple
+
+from PIL import Image as PILImage, ImageOps
+
+from ..config import settings
+
+
+_PIL_FORMATS = {
+    "webp": "WEBP",
+    "jpeg": "JPEG"
+}
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg"
+}
+
+
+def derivative_sizes() -> Dict[str, int]:
+    """Long side in pixels of each variant"""
+    return {
+        "thumbnail": settings.image_thumbnail_size,
+        "medium": settings.image_medium_size
+    }
+
+
+def derivative_blob_name(blob_name: str, variant: str, image_format: str) -> str:
+    """
+    Blob name of a variant, stored alongside the original
+
+    Args:
+        blob_name: Blob name of the original image
+        variant: thumbnail | medium
+        image_format: Format the variants were rendered in (images.derivative_format)
+
+    Returns:
+        str: Blob name of the variant
+    """
+    return f"{blob_name}.{variant}.{image_format}"
+
+
+def render_derivatives(image_bytes: bytes, sizes: Dict[str, int], image_format: str, quality: int) -> Dict[str, bytes]:
+    """
+    Encode downscaled variants of an image (runs in a pool worker)
+
+    Variants are never upscaled; an image smaller than a variant's size is
+    re-encoded at its own size.
+
+    Args:
+        image_bytes: Original image
+        sizes: Long side in pixels per variant name
+        image_format: webp | jpeg
+        quality: Encoder quality (1-100)
+
+    Returns:
+        Dict[str, bytes]: Encoded image per variant name
+    """
+    largest = max(sizes.values())
+
+    with PILImage.open(io.BytesIO(image_bytes)) as img:
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale directly, far cheaper than a full decode
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+
+        if image_format == "jpeg":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+        if image_format == "webp":
+            save_options = {"quality": quality, "method": 4}
+        else:
+            save_options = {"quality": quality, "optimize": True, "progressive": True}
+
+        rendered = {}
+        # Largest first, each smaller variant is downscaled from the previous one
+        for variant, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            img.thumbnail((size, size), PILImage.LANCZOS, reducing_gap=3.0)
+            buffer = io.BytesIO()
+            img.save(buffer, format=_PIL_FORMATS[image_format], **save_options)
+            rendered[variant] = buffer.getvalue()
+
+    return rendered
+
+
+async def generate_derivatives(blob_name: str, image_format: str) -> List[Tuple[str, int]]:
+    """
+    Render and store all variants of a stored image
+
+    Args:
+        blob_name: Blob name of the original image in the storage backend
+        image_format: webp | jpeg
+
+    Returns:
+        List of (variant blob name, size in bytes)
+
+    Raises:
+        ValueError: If the original is not an image or exceeds PIL's pixel limit
+            (PIL.Image.MAX_IMAGE_PIXELS, decompression bomb)
+    """
+    from .process_manager import get_process_pool
+    from .storage import download_bytes, upload_bytes
+
+    image_bytes = await download_bytes(blob_name)
+
+    loop = asyncio.get_running_loop()
+    try:
+        rendered = await loop.run_in_executor(
+            get_process_pool(),
+            render_derivatives,
+            image_bytes,
+            derivative_sizes(),
+            image_format,
+            settings.image_derivative_quality
+        )
+    except OSError:
+        # Includes PIL.UnidentifiedImageError
+        raise ValueError(f"Cannot render derivatives of {blob_name}: not an image")
+    except PILImage.DecompressionBombError as e:
+        raise ValueError(f"Cannot render derivatives of {blob_name}: {e}")
+
+    content_type = CONTENT_TYPES[image_format]
+    stored = [(derivative_blob_name(blob_name, variant, image_format), data) for variant, data in rendered.items()]
+    await asyncio.gather(*[
+        upload_bytes(variant_blob_name, data, content_type)
+        for variant_blob_name, data in stored
+    ])
+
+    return [(variant_blob_name, len(data)) for variant_blob_name, data in stored]
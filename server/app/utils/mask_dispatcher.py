@@ -0,0 +1,155 @@
+"""
+Adaptive dispatcher for RLE to polygon work
+
+Estimates the cost of a job from the number of masks and the area that has to
+be decoded for each of them (the bbox window, or the whole segmentation when no
+bbox is stored), then picks where to run it:
+
+    inline   - small jobs, cheaper than any hand-off
+    thread   - medium jobs on the shared thread pool (cv2/numpy release the GIL)
+    process  - large jobs split into cost-balanced chunks, one per worker process
+
+Thresholds are configured in Settings; per-strategy latency is exported so they
+can be tuned from the dashboards.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Dict, List
+
+from prometheus_client import Counter, Histogram
+
+from ..config import settings
+from .mask_processing import process_mask_info_batch
+from .mask_transport import run_mask_info_batch
+from .process_manager import get_process_pool, get_process_pool_workers, get_thread_pool
+
+
+STRATEGY_INLINE = "inline"
+STRATEGY_THREAD = "thread"
+STRATEGY_PROCESS = "process"
+
+# Cost model, measured with scripts/benchmark_mask_processing.py:
+# a fixed cost per mask plus the decoded window area
+MASK_FIXED_COST_MS = 0.2
+PIXEL_COST_MS = 1e-5
+
+MASK_DISPATCH_DURATION = Histogram(
+    "opengraph_mask_dispatch_duration_seconds",
+    "Wall-clock time of a RLE to polygon job by execution strategy",
+    ["strategy"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+MASK_DISPATCH_MASKS = Counter(
+    "opengraph_mask_dispatch_masks_total",
+    "Masks converted to polygons by execution strategy",
+    ["strategy"]
+)
+
+
+def estimate_mask_cost_ms(segmentation_data: Dict[str, Any]) -> float:
+    """
+    Estimated single-core time to convert one mask
+
+    Args:
+        segmentation_data: Dictionary containing segmentation_counts, segmentation_size, bbox
+
+    Returns:
+        float: Estimated milliseconds
+    """
+    bbox = segmentation_data.get('bbox')
+    segmentation_size = segmentation_data.get('segmentation_size')
+
+    if bbox:
+        pixels = max(bbox[2], 1) * max(bbox[3], 1)
+    elif segmentation_size:
+        pixels = segmentation_size[0] * segmentation_size[1]
+    else:
+        pixels = 0
+
+    return MASK_FIXED_COST_MS + pixels * PIXEL_COST_MS
+
+
+def choose_strategy(total_cost_ms: float) -> str:
+    """Execution strategy for a job of the given estimated cost"""
+    if total_cost_ms <= settings.mask_dispatch_inline_max_ms:
+        return STRATEGY_INLINE
+    if total_cost_ms <= settings.mask_dispatch_thread_max_ms:
+        return STRATEGY_THREAD
+    return STRATEGY_PROCESS
+
+
+def balanced_chunks(
+    segmentation_data_list: List[Dict[str, Any]],
+    costs: List[float],
+    chunk_count: int
+) -> List[List[Dict[str, Any]]]:
+    """
+    Split into at most chunk_count contiguous chunks of roughly equal estimated cost
+
+    Chunks are contiguous so results can be concatenated back in input order.
+    """
+    total_cost = sum(costs)
+    target = total_cost / chunk_count
+
+    chunks = []
+    current = []
+    accumulated = 0.0
+    for seg_data, cost in zip(segmentation_data_list, costs):
+        current.append(seg_data)
+        accumulated += cost
+        # Cut when the running total passes the next chunk boundary
+        if accumulated >= target * (len(chunks) + 1) and len(chunks) < chunk_count - 1:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+async def compute_mask_infos(segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert a list of masks with the cheapest execution strategy for its size
+
+    Args:
+        segmentation_data_list: List of dictionaries containing segmentation data
+
+    Returns:
+        List of processed mask info in input order
+    """
+    if not segmentation_data_list:
+        return []
+
+    costs = [estimate_mask_cost_ms(seg_data) for seg_data in segmentation_data_list]
+    total_cost = sum(costs)
+    strategy = choose_strategy(total_cost)
+
+    start = time.perf_counter()
+
+    if strategy == STRATEGY_INLINE:
+        mask_infos = process_mask_info_batch(segmentation_data_list)
+
+    elif strategy == STRATEGY_THREAD:
+        loop = asyncio.get_event_loop()
+        mask_infos = await loop.run_in_executor(get_thread_pool(), process_mask_info_batch, segmentation_data_list)
+
+    else:
+        # One chunk per worker, but never chunks so small that IPC dominates
+        chunk_count = max(1, min(
+            get_process_pool_workers(),
+            math.ceil(total_cost / settings.mask_dispatch_min_chunk_ms),
+            len(segmentation_data_list)
+        ))
+        chunk_results = await asyncio.gather(*[
+            run_mask_info_batch(get_process_pool(), chunk, settings.mask_result_transport)
+            for chunk in balanced_chunks(segmentation_data_list, costs, chunk_count)
+        ])
+        mask_infos = [mask_info for chunk in chunk_results for mask_info in chunk]
+
+    MASK_DISPATCH_DURATION.labels(strategy=strategy).observe(time.perf_counter() - start)
+    MASK_DISPATCH_MASKS.labels(strategy=strategy).inc(len(segmentation_data_list))
+
+    return mask_infos
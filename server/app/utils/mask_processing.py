@@ -5,42 +5,108 @@ Separate module to avoid pickling issues with ProcessPoolExecutor
 """
 
 from typing import Dict, Any, List, Optional
+import os
 import numpy as np
 import cv2
-from pycocotools import mask as maskUtils
+
+from .rle import bbox_to_window, decode_rle_window, encode_rle_counts, rle_area, rle_to_bbox, union_rle_masks
+
+
+def warm_up_worker() -> None:
+    """
+    Process pool initializer
+    
+    Imports the heavy native modules and runs one dummy conversion so that the
+    first real task in a fresh (or recycled) worker is not slower than the rest.
+    """
+    from pycocotools import mask as maskUtils  # noqa: F401
+    
+    process_single_mask_info({
+        'segmentation_counts': encode_rle_counts([5, 6, 5]),
+        'segmentation_size': [4, 4],
+        'bbox': [1.0, 1.0, 2.0, 2.0]
+    })
+
+
+def ping_worker() -> int:
+    """No-op task used to start pool workers; returns the worker pid"""
+    return os.getpid()
 
 
 def process_mask_info_batch(segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Process multiple mask info in a single process call (more efficient)
     
+    Each mask is decoded straight from its RLE runs into a window around its
+    foreground, so peak memory per item is bounded by the mask's bbox rather
+    than the image size.
+    
+    This replaced the stacked decode (all masks of one size decoded by a single
+    pycocotools call into an H x W x N array, up to 256 MB per stack): the
+    windowed decode gives identical polygons, is faster per mask and does not
+    allocate full frames. scripts/benchmark_mask_processing.py still times
+    both against the original per-mask loop.
+    
     Args:
         segmentation_data_list: List of dictionaries containing segmentation data
         
     Returns:
         List of processed mask info
     """
-    import os
-    import time
-    
-    process_id = os.getpid()
-    batch_size = len(segmentation_data_list)
-    start_time = time.time()
-    
-    print(f"      [PID {process_id}] Starting batch processing of {batch_size} items...")
+    return [process_single_mask_info(seg_data) for seg_data in segmentation_data_list]
+
+
+def merge_masks(segmentation_counts_list: List[str], segmentation_size: List[int]) -> Dict[str, Any]:
+    """
+    Merge masks of the same image into one annotation's geometry (runs in a pool worker)
     
-    results = []
-    for i, seg_data in enumerate(segmentation_data_list):
-        if i % 10 == 0 and i > 0:  # Progress every 10 items
-            elapsed = time.time() - start_time
-            print(f"      [PID {process_id}] Processed {i}/{batch_size} items ({elapsed:.2f}s)")
+    Args:
+        segmentation_counts_list: COCO RLE encoding strings to merge (logical OR)
+        segmentation_size: [height, width] shared by all masks
         
-        results.append(process_single_mask_info(seg_data))
+    Returns:
+        Dictionary with segmentation_counts, segmentation_size, bbox, area and
+        mask_info (process_single_mask_info of the merged mask)
+    """
+    if len(segmentation_counts_list) == 1:
+        merged_counts = segmentation_counts_list[0]
+    else:
+        merged_counts = union_rle_masks(segmentation_counts_list, segmentation_size)
     
-    total_time = time.time() - start_time
-    print(f"      [PID {process_id}] Completed batch of {batch_size} items in {total_time:.2f}s")
+    bbox = rle_to_bbox(merged_counts, segmentation_size)
     
-    return results
+    return {
+        'segmentation_counts': merged_counts,
+        'segmentation_size': list(segmentation_size),
+        'bbox': bbox,
+        'area': float(rle_area(merged_counts)),
+        'mask_info': process_single_mask_info({
+            'segmentation_counts': merged_counts,
+            'segmentation_size': segmentation_size,
+            'bbox': bbox
+        })
+    }
+
+
+def _contours_to_point_arrays(contours) -> List[np.ndarray]:
+    """Simplify OpenCV contours into (N, 2) int32 point arrays"""
+    point_arrays = []
+    for contour in contours:
+        # contour 단순화 (너무 많은 점들 제거)
+        epsilon = 0.01 * cv2.arcLength(contour, True)
+        simplified_contour = cv2.approxPolyDP(contour, epsilon, True)
+
+        # 최소 3개의 점이 있어야 polygon
+        if len(simplified_contour) >= 3:
+            point_arrays.append(simplified_contour.reshape(-1, 2))
+
+    return point_arrays
+
+
+def _contours_to_polygons(contours) -> List[List[List[float]]]:
+    """Simplify OpenCV contours into [x, y] polygon lists"""
+    # contour를 [x, y] 좌표 리스트로 변환
+    return [points.astype(float).tolist() for points in _contours_to_point_arrays(contours)]
 
 
 def process_single_mask_info(segmentation_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,50 +144,68 @@ def process_single_mask_info(segmentation_data: Dict[str, Any]) -> Dict[str, Any
     return mask_info
 
 
-def rle_to_polygon(segmentation_counts: str, segmentation_size: List[int]) -> List[List[List[float]]]:
+def rle_to_polygon(
+    segmentation_counts: str,
+    segmentation_size: List[int],
+    bbox: Optional[List[float]] = None
+) -> List[List[List[float]]]:
     """
     COCO RLE 포맷을 polygon 좌표로 변환
 
+    The mask is decoded from the RLE runs into a small window (never the full
+    H x W frame) and traced there; coordinates are shifted back to image space.
+
     Args:
         segmentation_counts: COCO RLE encoding string
         segmentation_size: [height, width] of the segmentation
+        bbox: Optional [x, y, width, height]; when given, only rows and columns
+            inside the bbox are decoded (crop-to-bbox mode)
 
     Returns:
         List[List[List[float]]]: List of polygons, each polygon is a list of [x, y] coordinates
     """
+    return [
+        points.astype(float).tolist()
+        for points in rle_to_polygon_arrays(segmentation_counts, segmentation_size, bbox)
+    ]
+
+
+def rle_to_polygon_arrays(
+    segmentation_counts: str,
+    segmentation_size: List[int],
+    bbox: Optional[List[float]] = None
+) -> List[np.ndarray]:
+    """
+    rle_to_polygon 과 동일하지만 polygon 을 (N, 2) int32 배열로 반환
+
+    Returns:
+        List[np.ndarray]: One array of [x, y] points per polygon
+    """
     if not segmentation_counts or not segmentation_size:
         return []
 
     try:
-        # COCO RLE 포맷으로 변환
-        rle = {
-            'size': segmentation_size,  # [height, width]
-            'counts': segmentation_counts.encode('utf-8')
-        }
+        window = bbox_to_window(bbox, segmentation_size) if bbox else None
 
-        # RLE를 binary mask로 변환
-        binary_mask = maskUtils.decode(rle)
+        # Keep a 1-pixel background border so contours match the full-frame trace
+        binary_mask, offset = decode_rle_window(
+            segmentation_counts,
+            segmentation_size,
+            window=window,
+            padding=1
+        )
+        if binary_mask.size == 0:
+            return []
 
         # OpenCV를 사용해서 contour 찾기
         contours, _ = cv2.findContours(
-            binary_mask.astype(np.uint8),
+            binary_mask,
             cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
+            cv2.CHAIN_APPROX_SIMPLE,
+            offset=offset
         )
 
-        polygons = []
-        for contour in contours:
-            # contour 단순화 (너무 많은 점들 제거)
-            epsilon = 0.01 * cv2.arcLength(contour, True)
-            simplified_contour = cv2.approxPolyDP(contour, epsilon, True)
-
-            # 최소 3개의 점이 있어야 polygon
-            if len(simplified_contour) >= 3:
-                # contour를 [x, y] 좌표 리스트로 변환
-                polygon = simplified_contour.reshape(-1, 2).astype(float).tolist()
-                polygons.append(polygon)
-
-        return polygons
+        return _contours_to_point_arrays(contours)
 
     except Exception as e:
         print(f"Error converting RLE to polygon: {e}")
@@ -135,6 +219,9 @@ def rle_to_polygon_optimized(segmentation_counts: str, segmentation_size: List[i
     if not segmentation_counts or not segmentation_size:
         return []
     
+    # Imported lazily: the regular read path decodes RLE without pycocotools
+    from pycocotools import mask as maskUtils
+    
     try:
         # COCO RLE 포맷으로 변환
         rle = {
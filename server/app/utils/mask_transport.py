@@ -0,0 +1,182 @@
+"""
+Mask process pool result transport
+
+process_mask_info_batch returns nested Python lists of float coordinates that
+are pickled in the worker and unpickled in the parent, one float object at a
+time. The shared-memory transport instead packs every polygon of a batch into a
+single shared memory segment, returns only the segment name, and the parent
+builds the mask info dicts from a flat array.
+
+Segment layout (native byte order):
+    int64   [mask_count, polygon_count]
+    int64   polygons_per_mask[mask_count]
+    int64   point_offsets[polygon_count + 1]
+    float32 points[point_offsets[-1], 2]
+
+Polygon vertices are integer pixel coordinates, so float32 is exact for any
+realistic image size and the result equals the pickle transport's.
+"""
+
+import asyncio
+from concurrent.futures import Executor, Future
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .mask_processing import bbox_to_polygon, process_mask_info_batch, rle_to_polygon_arrays
+
+
+TRANSPORT_PICKLE = "pickle"
+TRANSPORT_SHARED_MEMORY = "shared_memory"
+MASK_RESULT_TRANSPORTS = (TRANSPORT_PICKLE, TRANSPORT_SHARED_MEMORY)
+
+_INT64_SIZE = np.dtype(np.int64).itemsize
+_FLOAT32_SIZE = np.dtype(np.float32).itemsize
+
+
+def process_mask_info_batch_shared(segmentation_data_list: List[Dict[str, Any]]) -> str:
+    """
+    Process pool worker: trace polygons and write them to a new shared memory segment
+
+    The segment is left open for the parent, which must call
+    read_mask_info_batch_shared to copy the result out and unlink it.
+
+    Args:
+        segmentation_data_list: List of dictionaries containing segmentation data
+
+    Returns:
+        str: Shared memory segment name
+    """
+    polygons_per_mask = []
+    point_arrays = []
+    for seg_data in segmentation_data_list:
+        mask_polygons = rle_to_polygon_arrays(
+            seg_data.get('segmentation_counts'),
+            seg_data.get('segmentation_size')
+        )
+        polygons_per_mask.append(len(mask_polygons))
+        point_arrays.extend(mask_polygons)
+
+    mask_count, polygon_count = len(polygons_per_mask), len(point_arrays)
+    point_offsets = np.zeros(polygon_count + 1, dtype=np.int64)
+    if point_arrays:
+        np.cumsum([len(points) for points in point_arrays], out=point_offsets[1:])
+    point_count = int(point_offsets[-1])
+
+    index_size = (2 + mask_count + polygon_count + 1) * _INT64_SIZE
+    segment = shared_memory.SharedMemory(create=True, size=index_size + point_count * 2 * _FLOAT32_SIZE)
+    try:
+        index = np.ndarray(2 + mask_count + polygon_count + 1, dtype=np.int64, buffer=segment.buf)
+        index[0], index[1] = mask_count, polygon_count
+        index[2:2 + mask_count] = polygons_per_mask
+        index[2 + mask_count:] = point_offsets
+
+        points = np.ndarray((point_count, 2), dtype=np.float32, buffer=segment.buf, offset=index_size)
+        if point_arrays:
+            np.concatenate(point_arrays, out=points, casting='unsafe')
+
+        # Views must be released before the segment can be closed
+        del index, points
+    except Exception:
+        segment.close()
+        segment.unlink()
+        raise
+
+    segment.close()
+    # Ownership moves to the parent, which unlinks the segment; without this the
+    # worker's resource tracker would report it as leaked and unlink it again
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment.name
+
+
+def _unpack_mask_info_batch(buffer, segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build process_single_mask_info style dicts from a packed segment"""
+    mask_count, polygon_count = (int(value) for value in np.frombuffer(buffer, dtype=np.int64, count=2))
+    index = np.frombuffer(buffer, dtype=np.int64, count=mask_count + polygon_count + 1, offset=2 * _INT64_SIZE)
+    polygons_per_mask = index[:mask_count].tolist()
+    point_offsets = index[mask_count:].tolist()
+
+    index_size = (2 + mask_count + polygon_count + 1) * _INT64_SIZE
+    points = np.frombuffer(buffer, dtype=np.float32, count=point_offsets[-1] * 2, offset=index_size)
+    # One tolist() call for the whole batch instead of unpickling every float
+    point_list = points.reshape(-1, 2).tolist()
+
+    mask_infos = []
+    polygon_index = 0
+    for seg_data, polygon_count_for_mask in zip(segmentation_data_list, polygons_per_mask):
+        polygons = [
+            point_list[point_offsets[i]:point_offsets[i + 1]]
+            for i in range(polygon_index, polygon_index + polygon_count_for_mask)
+        ]
+        polygon_index += polygon_count_for_mask
+
+        bbox = seg_data.get('bbox')
+        mask_infos.append({
+            "has_segmentation": bool(polygons),
+            "polygons": polygons,
+            "bbox_polygon": bbox_to_polygon(bbox) if bbox else []
+        })
+
+    return mask_infos
+
+
+def read_mask_info_batch_shared(segment_name: str, segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Copy a worker result out of shared memory and unlink the segment
+
+    Args:
+        segment_name: Name returned by process_mask_info_batch_shared
+        segmentation_data_list: The batch that was sent to the worker (bbox polygons are built here)
+
+    Returns:
+        List of processed mask info, identical to process_mask_info_batch
+    """
+    segment = shared_memory.SharedMemory(name=segment_name)
+    try:
+        return _unpack_mask_info_batch(segment.buf, segmentation_data_list)
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def _unlink_unclaimed_segment(future: Future) -> None:
+    """Done callback for results nobody is awaiting anymore (cancelled request)"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        segment = shared_memory.SharedMemory(name=future.result())
+        segment.close()
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def run_mask_info_batch(
+    executor: Executor,
+    segmentation_data_list: List[Dict[str, Any]],
+    transport: str = TRANSPORT_PICKLE
+) -> List[Dict[str, Any]]:
+    """
+    Run one process_mask_info_batch call on the executor with the given result transport
+
+    Args:
+        executor: Process pool (the shared memory transport needs worker processes on the same host)
+        segmentation_data_list: List of dictionaries containing segmentation data
+        transport: "pickle" or "shared_memory"
+
+    Returns:
+        List of processed mask info
+    """
+    loop = asyncio.get_event_loop()
+
+    if transport == TRANSPORT_SHARED_MEMORY:
+        future = executor.submit(process_mask_info_batch_shared, segmentation_data_list)
+        try:
+            segment_name = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_unlink_unclaimed_segment)
+            raise
+        return read_mask_info_batch_shared(segment_name, segmentation_data_list)
+
+    return await loop.run_in_executor(executor, process_mask_info_batch, segmentation_data_list)
@@ -0,0 +1,169 @@
+"""
+Keyset (cursor) pagination utilities
+
+A cursor encodes the sort key value and id of the last row of a page. The next
+page continues strictly after that (value, id) pair in the listing's order, so
+every page is an index range scan instead of an OFFSET scan over all previous
+rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """
+    Cursor string for the row a page ended with
+
+    Args:
+        sort_key: Name of the listing's sort order (rejects cursors reused with another order)
+        value: Sort column value of the row
+        row_id: Primary key of the row
+
+    Returns:
+        str: URL-safe opaque cursor
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif hasattr(value, "value"):
+        # Enum values
+        value = value.value
+    payload = json.dumps({"s": sort_key, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, sort_column: ColumnElement) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+        sort_key: Sort order name of the current request
+        sort_column: Sort column, used to restore the value's Python type
+
+    Returns:
+        Tuple of (sort value, id)
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, row_id = payload["v"], int(payload["id"])
+        cursor_sort_key = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if cursor_sort_key != sort_key:
+        raise ValueError("Cursor does not match the requested sort order")
+
+    if value is not None and sort_column.type.python_type is datetime:
+        value = datetime.fromisoformat(value)
+
+    return value, row_id
+
+
+def apply_keyset_pagination(
+    query: Select,
+    sort_key: str,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    descending: bool,
+    cursor: Optional[str],
+    limit: int,
+    nullable: bool = False
+) -> Select:
+    """
+    Order a query by (sort column, id) and continue after the cursor
+
+    Fetches `limit + 1` rows; pass the result to paginate_rows to know whether
+    there is a next page.
+
+    Nullable sort columns are ordered NULLS LAST in both directions. Passing
+    the id column as sort_column pages by id alone.
+
+    Args:
+        query: Select with the listing's filters applied
+        sort_key: Sort order name stored in the cursor
+        sort_column: Column the listing is sorted by
+        id_column: Primary key column (tie-breaker)
+        descending: Sort direction
+        cursor: Cursor of the previous page, or empty/None for the first page
+        limit: Page size
+        nullable: Whether sort_column can be NULL
+
+    Returns:
+        Select: Ordered, filtered and limited query
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    by_id = sort_column is id_column
+    if by_id:
+        order_by = [id_column.desc() if descending else id_column.asc()]
+    elif descending:
+        order_by = [sort_column.desc(), id_column.desc()]
+    else:
+        order_by = [sort_column.asc(), id_column.asc()]
+    if nullable:
+        order_by[0] = order_by[0].nulls_last()
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key, sort_column)
+        if by_id:
+            query = query.where(id_column < row_id if descending else id_column > row_id)
+        else:
+            query = query.where(_after_cursor(sort_column, id_column, descending, value, row_id, nullable))
+
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def _after_cursor(
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    descending: bool,
+    value: Any,
+    row_id: int,
+    nullable: bool
+) -> ColumnElement:
+    """WHERE condition selecting rows strictly after (value, row_id)"""
+    if not nullable:
+        # Row value comparison, served directly by a (sort_column, id) index
+        if descending:
+            return tuple_(sort_column, id_column) < tuple_(value, row_id)
+        return tuple_(sort_column, id_column) > tuple_(value, row_id)
+
+    after_id = id_column < row_id if descending else id_column > row_id
+    if value is None:
+        # Already inside the trailing NULL block
+        return and_(sort_column.is_(None), after_id)
+
+    after_value = sort_column < value if descending else sort_column > value
+    return or_(after_value, and_(sort_column == value, after_id), sort_column.is_(None))
+
+
+def paginate_rows(rows: List[Any], limit: int, sort_key: str, sort_attr: str) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the extra row fetched by apply_keyset_pagination and build next_cursor
+
+    Args:
+        rows: Rows (ORM objects) returned by the keyset query
+        limit: Page size
+        sort_key: Sort order name stored in the cursor
+        sort_attr: Attribute holding the sort value on each row
+
+    Returns:
+        Tuple of (page rows, next cursor or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort_key, getattr(last, sort_attr), last.id)
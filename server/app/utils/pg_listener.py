@@ -0,0 +1,81 @@
+"""
+Postgres LISTEN/NOTIFY listener
+
+Keeps one dedicated asyncpg connection per process LISTENing on a channel and
+calls a callback on the event loop for every notification. NOTIFY is
+transactional, so a notification sent with pg_notify() inside a transaction is
+delivered only after it commits, to every listening process.
+
+Notifications sent while the connection is down are lost; after every
+(re)connect `on_connect` runs so the caller can drop whatever it may have
+missed. The connection is re-established with a fixed delay.
+"""
+
+import asyncio
+from typing import Callable, Optional
+
+import asyncpg
+
+
+class PgNotificationListener:
+    """Background LISTEN loop on one channel"""
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_notification: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        reconnect_delay_seconds: float = 5.0
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.on_notification = on_notification
+        self.on_connect = on_connect
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening in a background task (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.on_notification(payload)
+        except Exception as e:
+            print(f"⚠️ Error handling {channel} notification {payload!r}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._notify)
+                if self.on_connect:
+                    self.on_connect()
+                await closed.wait()
+                print(f"⚠️ LISTEN {self.channel} connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ LISTEN {self.channel} failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    # terminate() does not await, so it also works while being cancelled
+                    connection.terminate()
+
+            await asyncio.sleep(self.reconnect_delay_seconds)
@@ -1,17 +1,143 @@
 """
 Process pool manager for annotation processing
 
-Manages the lifecycle of ProcessPoolExecutor
+Manages the lifecycle of ProcessPoolExecutor (and the thread pool used for
+medium sized mask jobs)
+
+The API server creates and warms the pool in the FastAPI lifespan
+(start_process_pool); scripts keep using the lazily created get_process_pool().
 """
 
+import asyncio
 import atexit
+import multiprocessing
 import os
-from concurrent.futures import ProcessPoolExecutor
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Optional
 
+from prometheus_client import Gauge
+
+from ..config import settings
+from .mask_processing import warm_up_worker, ping_worker
+
 # Global process pool instance
 _process_pool: Optional[ProcessPoolExecutor] = None
 
+# Global thread pool instance
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_THREAD_POOL_WORKERS = 4
+
+PROCESS_POOL_WORKERS = Gauge(
+    "opengraph_process_pool_workers",
+    "Configured number of mask process pool workers"
+)
+
+PROCESS_POOL_BUSY_WORKERS = Gauge(
+    "opengraph_process_pool_busy_workers",
+    "Mask process pool workers currently running a task"
+)
+
+PROCESS_POOL_QUEUE_DEPTH = Gauge(
+    "opengraph_process_pool_queue_depth",
+    "Tasks submitted to the mask process pool and waiting for a free worker"
+)
+
+# Tasks in flight per executor, summed into the gauges above. A recycled pool keeps
+# reporting the tasks it is still draining and drops out once it has none left.
+_pool_tasks_in_flight = {}
+_pool_tasks_lock = threading.Lock()
+
+
+class InstrumentedProcessPoolExecutor(ProcessPoolExecutor):
+    """
+    ProcessPoolExecutor that reports busy workers and queue depth to Prometheus
+    
+    The gauges cover every pool that still has tasks, so a retired pool
+    finishing its queue after a recycle is added to the new pool, not
+    overwritten by it.
+    """
+    
+    def __init__(self, max_workers: int, **kwargs):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self.pool_size = max_workers
+        self.tasks_completed = 0
+        PROCESS_POOL_WORKERS.set(max_workers)
+    
+    def submit(self, fn, /, *args, **kwargs):
+        # Counted before submitting: a fast task's done callback must not run first
+        self._track_tasks(1)
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._track_tasks(-1, completed=False)
+            raise
+        # Done callbacks run on the executor's management thread
+        future.add_done_callback(lambda _: self._track_tasks(-1))
+        return future
+    
+    def _track_tasks(self, delta: int, completed: bool = True) -> None:
+        with _pool_tasks_lock:
+            in_flight = _pool_tasks_in_flight.get(self, 0) + delta
+            if in_flight > 0:
+                _pool_tasks_in_flight[self] = in_flight
+            else:
+                _pool_tasks_in_flight.pop(self, None)
+            if delta < 0 and completed:
+                self.tasks_completed -= delta
+            
+            busy = sum(min(count, pool.pool_size) for pool, count in _pool_tasks_in_flight.items())
+            queued = sum(max(count - pool.pool_size, 0) for pool, count in _pool_tasks_in_flight.items())
+            PROCESS_POOL_BUSY_WORKERS.set(busy)
+            PROCESS_POOL_QUEUE_DEPTH.set(queued)
+
+
+def get_process_pool_workers() -> int:
+    """Number of worker processes the process pool is created with"""
+    if settings.process_pool_workers > 0:
+        return settings.process_pool_workers
+    # Allow up to 10 workers for better parallelism
+    return min(os.cpu_count() or 1, 10)
+
+
+def _create_process_pool() -> InstrumentedProcessPoolExecutor:
+    cpu_count = os.cpu_count()
+    max_workers = get_process_pool_workers()
+    
+    print(f"Initializing process pool with {max_workers} workers (CPU cores: {cpu_count})")
+    
+    # Forking a server that already runs threads is unsafe; forkserver children start clean
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return InstrumentedProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=warm_up_worker
+    )
+
+
+def _should_recycle(executor: InstrumentedProcessPoolExecutor) -> bool:
+    max_tasks_per_child = settings.process_pool_max_tasks_per_child
+    return max_tasks_per_child > 0 and executor.tasks_completed >= executor.pool_size * max_tasks_per_child
+
+
+def _recycle_process_pool() -> None:
+    """
+    Replace the pool with a fresh, pre-started one to bound worker memory growth
+    
+    ProcessPoolExecutor(max_tasks_per_child=...) can deadlock on Python 3.11
+    when workers exit, so whole pools are recycled instead: after
+    workers * process_pool_max_tasks_per_child tasks new work goes to a new pool
+    and the old one finishes its queued tasks and exits in the background.
+    """
+    global _process_pool
+    
+    retired_pool = _process_pool
+    _process_pool = _create_process_pool()
+    for _ in range(_process_pool.pool_size):
+        _process_pool.submit(ping_worker)
+    
+    retired_pool.shutdown(wait=False)
+
 
 def get_process_pool() -> ProcessPoolExecutor:
     """
@@ -23,24 +149,72 @@ def get_process_pool() -> ProcessPoolExecutor:
     global _process_pool
     
     if _process_pool is None:
-        # Create process pool with optimal worker count
-        # Use more workers for batch processing scripts
-        cpu_count = os.cpu_count()
-        max_workers = min(cpu_count, 10)  # Allow up to 10 workers for better parallelism
-        
-        print(f"Initializing process pool with {max_workers} workers (CPU cores: {cpu_count})")
-        _process_pool = ProcessPoolExecutor(max_workers=max_workers)
+        _process_pool = _create_process_pool()
         
         # Register cleanup on exit
         atexit.register(shutdown_process_pool)
+    elif _should_recycle(_process_pool):
+        _recycle_process_pool()
     
     return _process_pool
 
 
+async def start_process_pool() -> None:
+    """
+    Create the process pool and start every worker up front (FastAPI lifespan)
+    
+    Each worker runs warm_up_worker as its initializer, so the first request
+    does not pay for process start-up, the numpy/cv2/pycocotools imports, or
+    the first decode.
+    """
+    executor = get_process_pool()
+    loop = asyncio.get_event_loop()
+    
+    # Workers are started on demand; one concurrent task per worker starts all of them
+    worker_pids = await asyncio.gather(*[
+        loop.run_in_executor(executor, ping_worker)
+        for _ in range(get_process_pool_workers())
+    ])
+    print(f"Process pool warmed up ({len(set(worker_pids))} of {get_process_pool_workers()} workers answered)")
+
+
 def shutdown_process_pool():
     """Shutdown the process pool gracefully"""
     global _process_pool
     
     if _process_pool is not None:
         _process_pool.shutdown(wait=True)
-        _process_pool = None
\ No newline at end of file
+        _process_pool = None
+        PROCESS_POOL_WORKERS.set(0)
+        with _pool_tasks_lock:
+            _pool_tasks_in_flight.clear()
+            PROCESS_POOL_BUSY_WORKERS.set(0)
+            PROCESS_POOL_QUEUE_DEPTH.set(0)
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Get or create the global thread pool for mask work
+    
+    cv2 and numpy release the GIL for the heavy parts, so a few threads give
+    real parallelism without process IPC.
+    
+    Returns:
+        ThreadPoolExecutor instance
+    """
+    global _thread_pool
+    
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=_THREAD_POOL_WORKERS, thread_name_prefix="mask-worker")
+        atexit.register(shutdown_thread_pool)
+    
+    return _thread_pool
+
+
+def shutdown_thread_pool():
+    """Shutdown the thread pool gracefully"""
+    global _thread_pool
+    
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=True)
+        _thread_pool = None
\ No newline at end of file
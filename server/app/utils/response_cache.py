@@ -0,0 +1,197 @@
+"""
+In-process response cache
+
+LRU cache of serialized (JSON bytes) responses bounded by total size in bytes
+and by entry age. Every uvicorn worker has its own cache, so writes made through
+another worker (or by the loading scripts) become visible after at most one TTL.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+
+CACHE_HITS = Counter(
+    "opengraph_response_cache_hits_total",
+    "Response cache hits",
+    ["cache"]
+)
+
+CACHE_MISSES = Counter(
+    "opengraph_response_cache_misses_total",
+    "Response cache misses",
+    ["cache"]
+)
+
+CACHE_EVICTIONS = Counter(
+    "opengraph_response_cache_evictions_total",
+    "Response cache entries dropped before being invalidated (size = LRU eviction, expired = TTL)",
+    ["cache", "reason"]
+)
+
+CACHE_INVALIDATIONS = Counter(
+    "opengraph_response_cache_invalidations_total",
+    "Response cache entries removed because the underlying data changed",
+    ["cache"]
+)
+
+CACHE_SIZE_BYTES = Gauge(
+    "opengraph_response_cache_size_bytes",
+    "Total size of cached responses in bytes",
+    ["cache"]
+)
+
+CACHE_ENTRIES = Gauge(
+    "opengraph_response_cache_entries",
+    "Number of cached responses",
+    ["cache"]
+)
+
+
+class ResponseCache:
+    """
+    Byte-size bounded LRU cache with TTL
+
+    All methods are synchronous and never await, so they are safe to call from
+    coroutines running on the same event loop without a lock.
+
+    A read that races with a write must not put the pre-write response back into
+    the cache. Callers take `generation()` before querying the database and pass
+    it to `set()`; the value is dropped only if its own key was invalidated (or
+    the cache cleared) in between, so invalidating one image does not reject
+    in-flight reads of every other image.
+
+    Invalidation generations are remembered for the most recently invalidated
+    MAX_TRACKED_INVALIDATIONS keys; a read older than the oldest forgotten one
+    is rejected for any key, which is always safe.
+    """
+
+    MAX_TRACKED_INVALIDATIONS = 4096
+
+    def __init__(self, name: str, max_bytes: int, ttl_seconds: float):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, float]]" = OrderedDict()
+        self._size_bytes = 0
+        self._generation = 0
+        # Generation of the last invalidation per key (most recent last)
+        self._invalidated_at: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Reads that started before this generation are rejected for every key
+        # (clear(), or invalidations no longer tracked per key)
+        self._invalidated_all_at = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def generation(self) -> int:
+        """Current invalidation generation (see class docstring)"""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Cached value or None
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[bytes]: Serialized response, or None on a miss or an expired entry
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_MISSES.labels(cache=self.name).inc()
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            CACHE_EVICTIONS.labels(cache=self.name, reason="expired").inc()
+            CACHE_MISSES.labels(cache=self.name).inc()
+            return None
+
+        self._entries.move_to_end(key)
+        CACHE_HITS.labels(cache=self.name).inc()
+        return value
+
+    def set(self, key: Hashable, value: bytes, generation: Optional[int] = None) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay under max_bytes
+
+        Args:
+            key: Cache key
+            value: Serialized response
+            generation: Value of generation() taken before the data was read
+
+        Returns:
+            bool: True if the value was stored
+        """
+        if not self.enabled or len(value) > self.max_bytes:
+            return False
+        if generation is not None and self._invalidated_since(key, generation):
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._size_bytes += len(value)
+
+        while self._size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            CACHE_EVICTIONS.labels(cache=self.name, reason="size").inc()
+
+        self._update_gauges()
+        return True
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Remove the given keys and reject in-flight `set()` calls
+
+        Args:
+            keys: Cache keys whose underlying data changed
+        """
+        self._generation += 1
+
+        removed = 0
+        for key in keys:
+            self._invalidated_at[key] = self._generation
+            self._invalidated_at.move_to_end(key)
+            if key in self._entries:
+                self._remove(key)
+                removed += 1
+        if removed:
+            CACHE_INVALIDATIONS.labels(cache=self.name).inc(removed)
+
+        while len(self._invalidated_at) > self.MAX_TRACKED_INVALIDATIONS:
+            _, forgotten_at = self._invalidated_at.popitem(last=False)
+            self._invalidated_all_at = max(self._invalidated_all_at, forgotten_at)
+
+    def clear(self) -> None:
+        """Remove all entries and reject every in-flight `set()`"""
+        self._generation += 1
+        self._invalidated_all_at = self._generation
+        self._invalidated_at.clear()
+        self._entries.clear()
+        self._size_bytes = 0
+        self._update_gauges()
+
+    def _invalidated_since(self, key: Hashable, generation: int) -> bool:
+        """Whether key was invalidated after generation() returned `generation`"""
+        return self._invalidated_all_at > generation or self._invalidated_at.get(key, 0) > generation
+
+    def _remove(self, key: Hashable) -> None:
+        value, _ = self._entries.pop(key)
+        self._size_bytes -= len(value)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        CACHE_SIZE_BYTES.labels(cache=self.name).set(self._size_bytes)
+        CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
@@ -0,0 +1,327 @@
+"""
+COCO RLE utilities
+
+Run-length native decoding of COCO compressed RLE strings. Masks are never
+materialized at full image size: runs are painted only into the window that
+actually contains foreground pixels (or into a caller supplied window).
+"""
+
+from typing import List, Optional, Tuple, Union
+import math
+import numpy as np
+
+
+# (x0, y0, x1, y1) half-open pixel window in image coordinates
+Window = Tuple[int, int, int, int]
+
+
+def decode_rle_counts(segmentation_counts: Union[str, bytes]) -> np.ndarray:
+    """
+    COCO compressed RLE 문자열을 run length 배열로 변환 (pycocotools rleFrString 과 동일)
+
+    Args:
+        segmentation_counts: COCO RLE encoding string
+
+    Returns:
+        np.ndarray: int64 run lengths, alternating background/foreground starting with background
+    """
+    if isinstance(segmentation_counts, str):
+        segmentation_counts = segmentation_counts.encode('utf-8')
+
+    chars = np.frombuffer(segmentation_counts, dtype=np.uint8).astype(np.int64) - 48
+    if chars.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Each value is a little-endian sequence of 5-bit groups; bit 0x20 means "more groups follow"
+    is_last = (chars & 0x20) == 0
+    ends = np.flatnonzero(is_last)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group_lengths = ends - starts + 1
+
+    positions = np.arange(chars.size) - np.repeat(starts, group_lengths)
+    values = np.add.reduceat((chars & 0x1f) << (5 * positions), starts)
+
+    # Sign extension of the last group
+    negative = (chars[ends] & 0x10) != 0
+    values[negative] -= np.left_shift(1, 5 * group_lengths[negative])
+
+    # From the third value on, counts are delta-encoded against the value two positions back
+    counts = values.copy()
+    if counts.size > 3:
+        counts[3::2] = np.cumsum(values[1::2])[1:]
+    if counts.size > 4:
+        counts[4::2] = np.cumsum(values[2::2])[1:]
+
+    return counts
+
+
+def rle_foreground_segments(
+    segmentation_counts: Union[str, bytes],
+    segmentation_size: List[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Foreground runs split into per-column segments
+
+    COCO RLE runs are column-major, so a run may wrap over several columns.
+
+    Args:
+        segmentation_counts: COCO RLE encoding string
+        segmentation_size: [height, width] of the segmentation
+
+    Returns:
+        Tuple of (columns, row_starts, row_ends) with half-open row ranges
+    """
+    height = int(segmentation_size[0])
+    counts = decode_rle_counts(segmentation_counts)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    run_starts = offsets[1:-1:2]
+    run_ends = offsets[2::2]
+    run_starts = run_starts[:run_ends.size]
+    non_empty = run_ends > run_starts
+    run_starts, run_ends = run_starts[non_empty], run_ends[non_empty]
+
+    if run_starts.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    first_columns = run_starts // height
+    segment_counts = (run_ends - 1) // height - first_columns + 1
+    run_index = np.repeat(np.arange(run_starts.size), segment_counts)
+    columns = first_columns[run_index] + (
+        np.arange(run_index.size) - np.repeat(np.cumsum(segment_counts) - segment_counts, segment_counts)
+    )
+
+    column_offsets = columns * height
+    row_starts = np.maximum(run_starts[run_index], column_offsets) - column_offsets
+    row_ends = np.minimum(run_ends[run_index], column_offsets + height) - column_offsets
+
+    return columns, row_starts, row_ends
+
+
+def rle_window(
+    segmentation_counts: Union[str, bytes],
+    segmentation_size: List[int]
+) -> Optional[Window]:
+    """
+    Tight window (x0, y0, x1, y1) around the foreground, or None for an empty mask
+    """
+    columns, row_starts, row_ends = rle_foreground_segments(segmentation_counts, segmentation_size)
+    if columns.size == 0:
+        return None
+    return (
+        int(columns.min()),
+        int(row_starts.min()),
+        int(columns.max()) + 1,
+        int(row_ends.max())
+    )
+
+
+def bbox_to_window(bbox: List[float], segmentation_size: List[int], padding: int = 0) -> Window:
+    """
+    [x, y, width, height] bbox를 이미지 경계 안의 정수 window로 변환
+
+    Args:
+        bbox: [x, y, width, height] format
+        segmentation_size: [height, width] of the segmentation
+        padding: Extra pixels on every side
+
+    Returns:
+        Window: (x0, y0, x1, y1)
+    """
+    height, width = int(segmentation_size[0]), int(segmentation_size[1])
+    x, y, box_width, box_height = bbox
+    return (
+        max(int(math.floor(x)) - padding, 0),
+        max(int(math.floor(y)) - padding, 0),
+        min(int(math.ceil(x + box_width)) + padding, width),
+        min(int(math.ceil(y + box_height)) + padding, height)
+    )
+
+
+def decode_rle_window(
+    segmentation_counts: Union[str, bytes],
+    segmentation_size: List[int],
+    window: Optional[Window] = None,
+    padding: int = 0
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    RLE를 window 크기의 binary mask로 디코딩 (전체 이미지 크기 배열을 만들지 않음)
+
+    Args:
+        segmentation_counts: COCO RLE encoding string
+        segmentation_size: [height, width] of the segmentation
+        window: (x0, y0, x1, y1) to decode; defaults to the tight foreground window.
+            Pixels outside the window are dropped (crop-to-bbox mode).
+        padding: Extra background pixels around the window, clipped to the image
+
+    Returns:
+        Tuple of (uint8 row-major mask of the window, (x0, y0) offset in image space)
+    """
+    height, width = int(segmentation_size[0]), int(segmentation_size[1])
+    columns, row_starts, row_ends = rle_foreground_segments(segmentation_counts, segmentation_size)
+
+    if window is None:
+        if columns.size == 0:
+            return np.zeros((0, 0), dtype=np.uint8), (0, 0)
+        window = (
+            int(columns.min()),
+            int(row_starts.min()),
+            int(columns.max()) + 1,
+            int(row_ends.max())
+        )
+
+    x0, y0, x1, y1 = window
+    x0, y0 = max(x0 - padding, 0), max(y0 - padding, 0)
+    x1, y1 = min(x1 + padding, width), min(y1 + padding, height)
+    window_width, window_height = max(x1 - x0, 0), max(y1 - y0, 0)
+
+    # Clip segments to the window
+    clipped_starts = np.maximum(row_starts, y0)
+    clipped_ends = np.minimum(row_ends, y1)
+    keep = (columns >= x0) & (columns < x1) & (clipped_ends > clipped_starts)
+    local_columns = columns[keep] - x0
+    local_starts = clipped_starts[keep] - y0
+    local_ends = clipped_ends[keep] - y0
+
+    # Paint segments with a +1/-1 difference array per column, then prefix-sum down the rows.
+    # Segments in one column never overlap, so the running sum stays 0/1 and fits in int8.
+    diff = np.zeros((window_width, window_height + 1), dtype=np.int8)
+    diff[local_columns, local_starts] = 1
+    np.add.at(diff, (local_columns, local_ends), -1)
+    np.cumsum(diff, axis=1, dtype=np.int8, out=diff)
+
+    return np.ascontiguousarray(diff[:, :window_height].view(np.uint8).T), (x0, y0)
+
+
+def encode_rle_counts(counts: List[int]) -> str:
+    """
+    Run length 목록을 COCO compressed RLE 문자열로 변환 (pycocotools rleToString 과 동일)
+
+    Args:
+        counts: Run lengths, alternating background/foreground starting with background
+
+    Returns:
+        str: COCO RLE encoding string
+    """
+    chars = []
+    for i, count in enumerate(counts):
+        x = int(count)
+        if i > 2:
+            x -= int(counts[i - 2])
+
+        more = True
+        while more:
+            c = x & 0x1f
+            x >>= 5
+            more = (x != -1) if (c & 0x10) else (x != 0)
+            if more:
+                c |= 0x20
+            chars.append(chr(c + 48))
+
+    return ''.join(chars)
+
+
+def encode_rle_window(
+    binary_mask: np.ndarray,
+    offset: Tuple[int, int],
+    segmentation_size: List[int]
+) -> str:
+    """
+    Window 크기의 binary mask를 전체 이미지 기준 COCO RLE 문자열로 인코딩
+
+    Args:
+        binary_mask: Row-major mask of the window
+        offset: (x0, y0) of the window in image space
+        segmentation_size: [height, width] of the full segmentation
+
+    Returns:
+        str: COCO RLE encoding string for the full image
+    """
+    height, width = int(segmentation_size[0]), int(segmentation_size[1])
+    x0, y0 = offset
+    window_height, window_width = binary_mask.shape[:2]
+
+    # Column-major view padded with background so every run has a start and an end
+    padded = np.zeros((window_width, window_height + 2), dtype=np.int8)
+    padded[:, 1:-1] = binary_mask.T != 0
+    transitions = np.diff(padded, axis=1)
+
+    start_columns, start_rows = np.nonzero(transitions == 1)
+    end_columns, end_rows = np.nonzero(transitions == -1)
+    run_starts = (start_columns + x0).astype(np.int64) * height + y0 + start_rows
+    run_ends = (end_columns + x0).astype(np.int64) * height + y0 + end_rows
+
+    # Runs touching the bottom of one column and the top of the next are a single run
+    if run_starts.size > 1:
+        continued = run_starts[1:] == run_ends[:-1]
+        run_starts = run_starts[np.concatenate(([True], ~continued))]
+        run_ends = run_ends[np.concatenate((~continued, [True]))]
+
+    boundaries = np.empty(run_starts.size * 2, dtype=np.int64)
+    boundaries[0::2] = run_starts
+    boundaries[1::2] = run_ends
+    counts = np.diff(np.concatenate(([0], boundaries, [height * width])))
+
+    # pycocotools drops a trailing empty background run
+    if counts.size > 1 and counts[-1] == 0:
+        counts = counts[:-1]
+
+    return encode_rle_counts(counts.tolist())
+
+
+def rle_area(segmentation_counts: Union[str, bytes]) -> int:
+    """Number of foreground pixels, computed from the runs only"""
+    return int(decode_rle_counts(segmentation_counts)[1::2].sum())
+
+
+def rle_to_bbox(segmentation_counts: Union[str, bytes], segmentation_size: List[int]) -> List[float]:
+    """
+    Tight [x, y, width, height] bbox computed from the runs (pycocotools toBbox 과 동일)
+    """
+    window = rle_window(segmentation_counts, segmentation_size)
+    if window is None:
+        return [0.0, 0.0, 0.0, 0.0]
+    x0, y0, x1, y1 = window
+    return [float(x0), float(y0), float(x1 - x0), float(y1 - y0)]
+
+
+def union_rle_masks(
+    segmentation_counts_list: List[Union[str, bytes]],
+    segmentation_size: List[int]
+) -> str:
+    """
+    여러 RLE 마스크의 합집합(logical OR)을 RLE로 반환
+
+    Every mask is decoded into the union of their foreground windows only,
+    so the work is bounded by the merged bbox rather than the image size.
+
+    Args:
+        segmentation_counts_list: COCO RLE encoding strings of the same image
+        segmentation_size: [height, width] shared by all masks
+
+    Returns:
+        str: COCO RLE encoding string of the merged mask
+    """
+    windows = [rle_window(counts, segmentation_size) for counts in segmentation_counts_list]
+    windows = [window for window in windows if window is not None]
+    if not windows:
+        return encode_rle_counts([int(segmentation_size[0]) * int(segmentation_size[1])])
+
+    union_window = (
+        min(window[0] for window in windows),
+        min(window[1] for window in windows),
+        max(window[2] for window in windows),
+        max(window[3] for window in windows)
+    )
+
+    merged_mask = None
+    offset = (union_window[0], union_window[1])
+    for counts in segmentation_counts_list:
+        binary_mask, offset = decode_rle_window(counts, segmentation_size, window=union_window)
+        if merged_mask is None:
+            merged_mask = binary_mask
+        else:
+            np.logical_or(merged_mask, binary_mask, out=merged_mask, casting='unsafe')
+
+    return encode_rle_window(merged_mask, offset, segmentation_size)
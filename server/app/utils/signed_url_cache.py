@@ -0,0 +1,240 @@
+"""
+Signed URL cache for stored images
+
+Every V4 signed URL is an RSA signature. Listing pages ask for the same blobs
+over and over, so signed URLs are cached per blob name, process-wide:
+
+- URLs are signed for Settings.signed_url_expiration_seconds and served from
+  the cache until signed_url_refresh_margin_seconds before they expire, then
+  re-signed. A returned URL always stays valid for at least the margin.
+- The cache is an LRU bounded by signed_url_cache_max_entries.
+- All blobs missing from the cache for one page are signed in a single batch,
+  on the storage executor: signing is CPU bound (and may call IAM), so it must
+  not run on the event loop. Pages served entirely from the cache never leave
+  the event loop.
+
+The signer is pluggable: "storage" signs with the storage backend (V4 signed
+URLs with the service account credentials on GCS), "fake" produces
+deterministic unsigned URLs so everything runs offline.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import List, Optional, Protocol, Tuple
+from urllib.parse import quote
+
+from prometheus_client import Counter, Gauge
+
+from ..config import settings
+
+
+SIGNED_URL_REQUESTS = Counter(
+    "opengraph_signed_url_requests_total",
+    "Signed URL lookups by result (hit = served from cache, signed = signed now)",
+    ["result"]
+)
+
+SIGNED_URL_CACHE_ENTRIES = Gauge(
+    "opengraph_signed_url_cache_entries",
+    "Signed URLs held in the cache"
+)
+
+
+class UrlSigner(Protocol):
+    """Signs blob names into URLs"""
+
+    def sign(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        ...
+
+
+class StorageUrlSigner:
+    """URLs signed by the shared storage backend (see utils.storage)"""
+
+    def sign(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        from .storage import get_storage_backend
+
+        return get_storage_backend().sign_urls(blob_names, expiration)
+
+
+class FakeUrlSigner:
+    """
+    Offline signer for development, tests and benchmarks
+
+    Produces stable URLs shaped like V4 signed URLs without credentials and
+    counts how many blobs it was asked to sign.
+    """
+
+    def __init__(self, base_url: str = "https://storage.example.invalid"):
+        self.base_url = base_url
+        self.signed_count = 0
+
+    def sign(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        self.signed_count += len(blob_names)
+        expires = int(expiration.total_seconds())
+        return [
+            f"{self.base_url}/{settings.gcs_bucket_name}/{quote(blob_name)}"
+            f"?X-Goog-Expires={expires}&X-Goog-Signature={hashlib.sha256(blob_name.encode('utf-8')).hexdigest()}"
+            for blob_name in blob_names
+        ]
+
+
+SIGNERS = {
+    "storage": StorageUrlSigner,
+    "fake": FakeUrlSigner
+}
+
+
+class SignedUrlCache:
+    """
+    Entry-bounded LRU of signed URLs keyed by blob name
+
+    Thread-safe; signing happens outside the lock, so two concurrent misses for
+    the same blob may both sign it (the later result wins, both are valid).
+    """
+
+    def __init__(self, signer: UrlSigner, max_entries: int, expiration_seconds: float, refresh_margin_seconds: float):
+        self.signer = signer
+        self.max_entries = max_entries
+        self.expiration = timedelta(seconds=expiration_seconds)
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, blob_names: List[str]) -> List[str]:
+        """
+        Signed URLs for blobs, signing every missing or expiring one in one batch
+
+        Args:
+            blob_names: Blob names in GCS (duplicates allowed)
+
+        Returns:
+            List[str]: Signed URLs in the order of blob_names
+        """
+        urls, to_sign = self.lookup(blob_names)
+        if not to_sign:
+            return urls
+        return self.sign_missing(blob_names, urls, to_sign)
+
+    def lookup(self, blob_names: List[str]) -> Tuple[List[Optional[str]], List[str]]:
+        """
+        Cached URLs without signing anything
+
+        Args:
+            blob_names: Blob names in GCS (duplicates allowed)
+
+        Returns:
+            Tuple: URLs in the order of blob_names (None where missing or expiring)
+                and the distinct blob names that still need signing
+        """
+        now = time.monotonic()
+        urls: List[Optional[str]] = [None] * len(blob_names)
+        to_sign = []
+
+        with self._lock:
+            for i, blob_name in enumerate(blob_names):
+                entry = self._entries.get(blob_name)
+                # Refresh before expiry so a served URL outlives the margin
+                if entry is not None and entry[1] - self.refresh_margin_seconds > now:
+                    self._entries.move_to_end(blob_name)
+                    urls[i] = entry[0]
+                elif blob_name not in to_sign:
+                    to_sign.append(blob_name)
+
+        SIGNED_URL_REQUESTS.labels(result="hit").inc(len(blob_names) - sum(url is None for url in urls))
+        return urls, to_sign
+
+    def sign_missing(self, blob_names: List[str], urls: List[Optional[str]], to_sign: List[str]) -> List[str]:
+        """
+        Sign the blobs lookup() missed in one batch and cache them (blocking)
+
+        Args:
+            blob_names: Blob names passed to lookup()
+            urls: URLs returned by lookup()
+            to_sign: Blob names returned by lookup()
+
+        Returns:
+            List[str]: Signed URLs in the order of blob_names
+        """
+        signed_at = time.monotonic()
+        signed_urls = dict(zip(to_sign, self.signer.sign(to_sign, self.expiration)))
+        SIGNED_URL_REQUESTS.labels(result="signed").inc(len(to_sign))
+
+        expires_at = signed_at + self.expiration.total_seconds()
+        with self._lock:
+            for blob_name, url in signed_urls.items():
+                self._entries[blob_name] = (url, expires_at)
+                self._entries.move_to_end(blob_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            SIGNED_URL_CACHE_ENTRIES.set(len(self._entries))
+
+        return [url if url is not None else signed_urls[blob_name] for url, blob_name in zip(urls, blob_names)]
+
+    def get(self, blob_name: str) -> str:
+        """Signed URL for one blob"""
+        return self.get_many([blob_name])[0]
+
+    def clear(self) -> None:
+        """Drop all cached URLs"""
+        with self._lock:
+            self._entries.clear()
+            SIGNED_URL_CACHE_ENTRIES.set(0)
+
+
+_signed_url_cache: Optional[SignedUrlCache] = None
+_signed_url_cache_lock = threading.Lock()
+
+
+def get_signed_url_cache() -> SignedUrlCache:
+    """
+    Get or create the process-wide signed URL cache
+
+    Returns:
+        SignedUrlCache instance using the signer selected by Settings.signed_url_signer
+    """
+    global _signed_url_cache
+
+    if _signed_url_cache is None:
+        with _signed_url_cache_lock:
+            if _signed_url_cache is None:
+                _signed_url_cache = SignedUrlCache(
+                    signer=SIGNERS[settings.signed_url_signer](),
+                    max_entries=settings.signed_url_cache_max_entries,
+                    expiration_seconds=settings.signed_url_expiration_seconds,
+                    refresh_margin_seconds=settings.signed_url_refresh_margin_seconds
+                )
+
+    return _signed_url_cache
+
+
+async def get_signed_urls(blob_names: List[str]) -> List[str]:
+    """
+    Signed URLs for a page of blobs
+
+    Cache hits are served on the event loop; misses are signed in one batch on
+    the storage executor.
+
+    Args:
+        blob_names: Blob names in GCS (duplicates allowed)
+
+    Returns:
+        List[str]: Signed URLs in the order of blob_names
+    """
+    from .storage import get_storage_executor
+
+    cache = get_signed_url_cache()
+    urls, to_sign = cache.lookup(blob_names)
+    if not to_sign:
+        return urls
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_storage_executor(), cache.sign_missing, blob_names, urls, to_sign)
+
+
+async def get_signed_url(blob_name: str) -> str:
+    """Signed URL for one blob"""
+    return (await get_signed_urls([blob_name]))[0]
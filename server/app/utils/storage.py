@@ -0,0 +1,430 @@
+"""
+Image storage backends
+
+Blob storage behind one interface, selected by Settings.storage_backend:
+
+    gcs   - the configured GCS bucket through one shared, connection-pooled client
+    local - a directory on disk (Settings.local_storage_root), served under
+            /storage; stands in for GCS in development, tests and benchmarks
+
+Without a GCP project (development) the gcs backend falls back to local, so
+image bytes always go to storage and never into the database.
+
+The backend is created once per process. The API server creates it in the
+FastAPI lifespan (start_storage) and closes it on shutdown; scripts use the
+lazily created get_storage_backend().
+
+Storage clients are blocking, so the async helpers (upload_bytes, upload_file,
+upload_image, download_bytes, delete_blob) run them on a bounded thread pool
+(Settings.storage_io_workers) instead of on the event loop.
+"""
+
+import asyncio
+import base64
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, List, Optional, Tuple
+from urllib.parse import quote
+
+from PIL import Image as PILImage, UnidentifiedImageError
+from prometheus_client import Counter, Histogram
+
+from ..config import settings
+
+
+LOCAL_STORAGE_URL_PATH = "/storage"
+
+# Local copies and GCS resumable upload chunks (GCS needs a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+STORAGE_OPERATIONS = Counter(
+    "opengraph_storage_operations_total",
+    "Storage backend operations by backend, operation and result",
+    ["backend", "operation", "result"]
+)
+
+STORAGE_OPERATION_DURATION = Histogram(
+    "opengraph_storage_operation_duration_seconds",
+    "Storage backend operation duration in seconds (excluding executor queue time)",
+    ["backend", "operation"]
+)
+
+
+class StorageBackend(ABC):
+    """Blob storage used for uploaded images"""
+
+    name: str
+
+    @abstractmethod
+    def upload_bytes(self, blob_name: str, data: bytes, content_type: str) -> None:
+        """Store data under blob_name, replacing an existing blob"""
+
+    @abstractmethod
+    def upload_file(self, blob_name: str, fileobj: BinaryIO, content_type: str) -> None:
+        """Store a file's content from its current position, read in chunks"""
+
+    @abstractmethod
+    def download_bytes(self, blob_name: str) -> bytes:
+        """
+        Content of a blob
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+
+    @abstractmethod
+    def delete(self, blob_name: str) -> bool:
+        """Delete a blob; returns False if it did not exist"""
+
+    @abstractmethod
+    def sign_urls(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        """URLs clients can read the blobs from, valid for at least expiration"""
+
+    def close(self) -> None:
+        """Release connections and other resources"""
+
+
+class GCSStorageBackend(StorageBackend):
+    """GCS bucket through one pooled client shared by all requests"""
+
+    name = "gcs"
+
+    def __init__(self, bucket_name: Optional[str] = None):
+        from google.api_core.exceptions import NotFound
+
+        from .gcs_client import GCSClient, create_storage_client
+
+        self._not_found = NotFound
+        self.gcs_client = GCSClient(bucket_name, client=create_storage_client())
+
+    def upload_bytes(self, blob_name: str, data: bytes, content_type: str) -> None:
+        self.gcs_client.upload_bytes(blob_name, data, content_type=content_type)
+
+    def upload_file(self, blob_name: str, fileobj: BinaryIO, content_type: str) -> None:
+        self.gcs_client.upload_file(blob_name, fileobj, content_type=content_type, chunk_size=UPLOAD_CHUNK_SIZE)
+
+    def download_bytes(self, blob_name: str) -> bytes:
+        try:
+            return self.gcs_client.download_bytes(blob_name)
+        except self._not_found:
+            raise FileNotFoundError(blob_name)
+
+    def delete(self, blob_name: str) -> bool:
+        try:
+            return self.gcs_client.delete_blob(blob_name)
+        except self._not_found:
+            return False
+
+    def sign_urls(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        return self.gcs_client.generate_signed_urls(blob_names, expiration)
+
+    def close(self) -> None:
+        self.gcs_client.close()
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Blobs as files under a root directory
+
+    URLs point at the API server's /storage mount and never expire.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None):
+        self.root = Path(root or settings.local_storage_root).resolve()
+        self.base_url = base_url or f"{settings.server_url}{LOCAL_STORAGE_URL_PATH}"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, blob_name: str) -> Path:
+        """
+        File path of a blob
+
+        Raises:
+            ValueError: If the blob name escapes the storage root
+        """
+        path = (self.root / blob_name).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid blob name: {blob_name}")
+        return path
+
+    def upload_bytes(self, blob_name: str, data: bytes, content_type: str) -> None:
+        self.upload_file(blob_name, io.BytesIO(data), content_type)
+
+    def upload_file(self, blob_name: str, fileobj: BinaryIO, content_type: str) -> None:
+        path = self.path(blob_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file and rename, so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(fileobj, f, UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def download_bytes(self, blob_name: str) -> bytes:
+        return self.path(blob_name).read_bytes()
+
+    def delete(self, blob_name: str) -> bool:
+        try:
+            self.path(blob_name).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def sign_urls(self, blob_names: List[str], expiration: timedelta) -> List[str]:
+        return [f"{self.base_url}/{quote(blob_name)}" for blob_name in blob_names]
+
+
+STORAGE_BACKENDS = {
+    "gcs": GCSStorageBackend,
+    "local": LocalStorageBackend
+}
+
+_storage_backend: Optional[StorageBackend] = None
+_storage_backend_lock = threading.Lock()
+_storage_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_storage_backend_name() -> str:
+    """Configured backend, with gcs falling back to local when no GCP project is set"""
+    if settings.storage_backend == "gcs" and not settings.google_cloud_project:
+        return "local"
+    return settings.storage_backend
+
+
+def get_storage_backend() -> StorageBackend:
+    """
+    Get or create the process-wide storage backend
+
+    Returns:
+        StorageBackend selected by get_storage_backend_name()
+    """
+    global _storage_backend
+
+    if _storage_backend is None:
+        with _storage_backend_lock:
+            if _storage_backend is None:
+                backend_name = get_storage_backend_name()
+                if backend_name != settings.storage_backend:
+                    print(
+                        f"⚠️ STORAGE_BACKEND={settings.storage_backend} but GOOGLE_CLOUD_PROJECT is not set: "
+                        f"storing images locally in {settings.local_storage_root}"
+                    )
+                _storage_backend = STORAGE_BACKENDS[backend_name]()
+
+    return _storage_backend
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the thread pool for blocking storage calls
+
+    Returns:
+        ThreadPoolExecutor with Settings.storage_io_workers threads
+    """
+    global _storage_executor
+
+    if _storage_executor is None:
+        with _storage_backend_lock:
+            if _storage_executor is None:
+                _storage_executor = ThreadPoolExecutor(
+                    max_workers=settings.storage_io_workers,
+                    thread_name_prefix="storage-io"
+                )
+
+    return _storage_executor
+
+
+def start_storage() -> StorageBackend:
+    """Create the storage backend and its executor (FastAPI lifespan startup)"""
+    get_storage_executor()
+    return get_storage_backend()
+
+
+def shutdown_storage() -> None:
+    """Wait for pending storage calls and close the backend"""
+    global _storage_backend, _storage_executor
+
+    with _storage_backend_lock:
+        executor, _storage_executor = _storage_executor, None
+        backend, _storage_backend = _storage_backend, None
+
+    if executor is not None:
+        executor.shutdown(wait=True)
+    if backend is not None:
+        backend.close()
+
+
+def _timed(backend: StorageBackend, operation: str, fn: Callable[[StorageBackend], Any]) -> Any:
+    """Run fn(backend) and record its duration and result"""
+    started_at = time.perf_counter()
+    try:
+        result = fn(backend)
+    except Exception:
+        STORAGE_OPERATIONS.labels(backend=backend.name, operation=operation, result="error").inc()
+        raise
+    STORAGE_OPERATION_DURATION.labels(backend=backend.name, operation=operation).observe(time.perf_counter() - started_at)
+    STORAGE_OPERATIONS.labels(backend=backend.name, operation=operation, result="ok").inc()
+    return result
+
+
+async def _run_storage_io(operation: str, fn: Callable[[StorageBackend], Any]) -> Any:
+    """Run fn(backend), a blocking backend call, on the storage executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_storage_executor(), _timed, get_storage_backend(), operation, fn)
+
+
+async def upload_bytes(blob_name: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+    """
+    Upload bytes to the storage backend without blocking the event loop
+
+    Args:
+        blob_name: Blob name
+        data: Blob content
+        content_type: Content type stored with the blob
+    """
+    await _run_storage_io("upload", lambda backend: backend.upload_bytes(blob_name, data, content_type))
+
+
+async def upload_file(blob_name: str, fileobj: BinaryIO, content_type: str = "application/octet-stream") -> None:
+    """
+    Upload a file in chunks without blocking the event loop
+
+    Args:
+        blob_name: Blob name
+        fileobj: Binary file positioned at the start of the content
+        content_type: Content type stored with the blob
+    """
+    await _run_storage_io("upload", lambda backend: backend.upload_file(blob_name, fileobj, content_type))
+
+
+def read_image_header(fileobj: BinaryIO) -> Tuple[int, int, str]:
+    """
+    Size and MIME type of an image from its header
+
+    PIL only parses the header on open, pixel data is never decoded. The file
+    position is restored afterwards.
+
+    Args:
+        fileobj: Binary file positioned at the start of the image
+
+    Returns:
+        Tuple of (width, height, content_type)
+
+    Raises:
+        ValueError: If the data is not an image PIL can identify, or its pixel
+            count exceeds PIL.Image.MAX_IMAGE_PIXELS (decompression bomb)
+    """
+    position = fileobj.tell()
+    try:
+        img = PILImage.open(fileobj)
+        width, height = img.size
+        content_type = PILImage.MIME.get(img.format, "application/octet-stream")
+    except (UnidentifiedImageError, OSError):
+        raise ValueError("Unsupported or corrupt image")
+    except PILImage.DecompressionBombError:
+        raise ValueError(f"Image exceeds {PILImage.MAX_IMAGE_PIXELS} pixels")
+    finally:
+        fileobj.seek(position)
+
+    return width, height, content_type
+
+
+async def upload_image_file(
+    fileobj: BinaryIO,
+    file_name: Optional[str] = None,
+    folder: str = "first-person-images"
+) -> Tuple[str, int, int]:
+    """
+    Upload an image file without blocking the event loop
+
+    Args:
+        fileobj: Binary file positioned at the start of the image
+        file_name: Optional file name (a random name is generated if omitted)
+        folder: Folder path in the bucket
+
+    Returns:
+        Tuple of (blob_name, width, height)
+
+    Raises:
+        ValueError: If the file is not an image
+    """
+    blob_name = f"{folder}/{file_name or f'{uuid.uuid4()}.jpg'}"
+
+    def upload(backend: StorageBackend) -> Tuple[int, int]:
+        width, height, content_type = read_image_header(fileobj)
+        backend.upload_file(blob_name, fileobj, content_type)
+        return width, height
+
+    width, height = await _run_storage_io("upload", upload)
+    return blob_name, width, height
+
+
+async def upload_image(
+    image_data: str,
+    file_name: Optional[str] = None,
+    folder: str = "first-person-images"
+) -> Tuple[str, int, int]:
+    """
+    Decode a base64 image and upload it without blocking the event loop
+
+    Args:
+        image_data: Base64 encoded image data (data URL or bare base64)
+        file_name: Optional file name (a random name is generated if omitted)
+        folder: Folder path in the bucket
+
+    Returns:
+        Tuple of (blob_name, width, height)
+
+    Raises:
+        ValueError: If the data is not a base64 encoded image
+    """
+    encoded = image_data.split(",", 1)[1] if image_data.startswith("data:") else image_data
+    try:
+        image_bytes = base64.b64decode(encoded)
+    except ValueError:
+        raise ValueError("Invalid base64 image data")
+
+    return await upload_image_file(io.BytesIO(image_bytes), file_name=file_name, folder=folder)
+
+
+async def download_bytes(blob_name: str) -> bytes:
+    """
+    Download a blob without blocking the event loop
+
+    Args:
+        blob_name: Blob name
+
+    Returns:
+        bytes: Blob content
+
+    Raises:
+        FileNotFoundError: If the blob does not exist
+    """
+    return await _run_storage_io("download", lambda backend: backend.download_bytes(blob_name))
+
+
+async def delete_blob(blob_name: str) -> bool:
+    """
+    Delete a blob without blocking the event loop
+
+    Args:
+        blob_name: Blob name
+
+    Returns:
+        bool: False if the blob did not exist
+    """
+    return await _run_storage_io("delete", lambda backend: backend.delete(blob_name))
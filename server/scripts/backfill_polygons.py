@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+polygon 컬럼이 NULL 인 기존 annotation 들의 polygon 을 채우는 backfill 스크립트
+
+Pages through `annotations` by id (keyset cursor), converts RLE to polygons in
+the process pool and writes them back with bulk UPDATEs. Converted rows are no
+longer NULL, so the job can be stopped and re-run at any time; pass
+--start-after-id with the last reported id to skip the already scanned range.
+
+사용법:
+    python backfill_polygons.py --batch-size 2000
+    python backfill_polygons.py --start-after-id 1250000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.annotation import Annotation
+from app.services.annotation_service import AnnotationService
+from app.utils.mask_transport import run_mask_info_batch
+from app.utils.process_manager import get_process_pool
+
+
+async def convert_in_process_pool(segmentation_data_list: List[Dict[str, Any]], chunk_size: int) -> List[Dict[str, Any]]:
+    """segmentation 데이터를 chunk 단위로 process pool 에서 병렬 변환"""
+    tasks = [
+        run_mask_info_batch(
+            get_process_pool(),
+            segmentation_data_list[i:i + chunk_size],
+            settings.mask_result_transport
+        )
+        for i in range(0, len(segmentation_data_list), chunk_size)
+    ]
+
+    mask_infos = []
+    for chunk_result in await asyncio.gather(*tasks):
+        mask_infos.extend(chunk_result)
+    return mask_infos
+
+
+async def backfill_polygons(batch_size: int, chunk_size: int, start_after_id: int, max_batches: int = 0):
+    """keyset cursor 로 NULL polygon annotation 을 배치 단위로 변환 및 저장"""
+    print(f"\n=== Backfilling annotation polygons (batch size {batch_size}, after id {start_after_id}) ===")
+
+    started_at = time.time()
+    last_id = start_after_id
+    total_converted = 0
+    batch_count = 0
+
+    while True:
+        batch_start = time.time()
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(
+                    Annotation.id,
+                    Annotation.segmentation_counts,
+                    Annotation.segmentation_size,
+                    Annotation.bbox
+                )
+                .where(Annotation.id > last_id, Annotation.polygon.is_(None))
+                .order_by(Annotation.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+
+            if not rows:
+                break
+
+            segmentation_data_list = [
+                {
+                    'segmentation_counts': row.segmentation_counts,
+                    'segmentation_size': row.segmentation_size,
+                    'bbox': row.bbox
+                }
+                for row in rows
+            ]
+
+            convert_start = time.time()
+            mask_infos = await convert_in_process_pool(segmentation_data_list, chunk_size)
+            convert_time = time.time() - convert_start
+
+            write_start = time.time()
+            try:
+                await AnnotationService(session).save_polygons({
+                    row.id: mask_info for row, mask_info in zip(rows, mask_infos)
+                })
+            except Exception as e:
+                await session.rollback()
+                print(f"    ✗ Batch after id {last_id} failed: {e}")
+                print(f"    Resume with: --start-after-id {last_id}")
+                raise
+            write_time = time.time() - write_start
+
+        last_id = rows[-1].id
+        total_converted += len(rows)
+        batch_count += 1
+
+        batch_time = time.time() - batch_start
+        elapsed = time.time() - started_at
+        print(
+            f"  Batch {batch_count}: {len(rows)} annotations up to id {last_id} in {batch_time:.2f}s "
+            f"(convert {convert_time:.2f}s, write {write_time:.2f}s) | "
+            f"total {total_converted}, {total_converted / elapsed:.0f} annotations/s"
+        )
+
+        if max_batches and batch_count >= max_batches:
+            print(f"\n  Stopped after {batch_count} batches. Resume with: --start-after-id {last_id}")
+            break
+
+    elapsed = time.time() - started_at
+    print(f"\n=== Backfill finished ===")
+    print(f"   Annotations converted: {total_converted}")
+    print(f"   Last id: {last_id}")
+    print(f"   Total time: {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"   Throughput: {total_converted / elapsed:.0f} annotations/s")
+
+
+async def main():
+    """메인 함수"""
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="Backfill polygons for annotations with a NULL polygon column")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Annotations fetched and updated per batch")
+    parser.add_argument("--chunk-size", type=int, default=max(10, 2000 // min(cpu_count, 10)),
+                        help="Annotations per process pool call")
+    parser.add_argument("--start-after-id", type=int, default=0, help="Resume after this annotation id")
+    parser.add_argument("--max-batches", type=int, default=0, help="Stop after N batches (0 = until done)")
+
+    args = parser.parse_args()
+
+    await backfill_polygons(
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        start_after_id=args.start_after_id,
+        max_batches=args.max_batches
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
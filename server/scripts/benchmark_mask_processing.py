@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Mask processing micro-benchmark
+
+Compares three RLE-to-polygon implementations on synthetic SAM-like masks:
+
+- the original per-mask loop (full-frame pycocotools decode followed by
+  cv2.findContours)
+- the stacked decode that process_mask_info_batch used before the windowed
+  decoder (one pycocotools call per group of same-size masks, contours traced
+  inside each bbox), kept here for comparison
+- the batch engine (process_mask_info_batch, which decodes straight from the
+  RLE runs into a window around each mask)
+
+Reports wall-clock time and peak traced memory.
+
+사용법:
+    python benchmark_mask_processing.py --masks 200 --height 2160 --width 3840
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+import cv2
+import numpy as np
+from pycocotools import mask as maskUtils
+
+from app.utils.mask_processing import _contours_to_polygons, bbox_to_polygon, process_mask_info_batch
+
+
+def generate_segmentation_data(count: int, height: int, width: int, seed: int) -> List[Dict[str, Any]]:
+    """Clustered ellipse blobs covering a few percent of the frame, encoded as COCO RLE"""
+    rng = np.random.default_rng(seed)
+    items = []
+
+    for _ in range(count):
+        mask = np.zeros((height, width), dtype=np.uint8)
+        center_x, center_y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        for _ in range(int(rng.integers(1, 4))):
+            # Main blob plus optional nearby parts, like a SAM mask of one object
+            center = (
+                center_x + int(rng.integers(-width // 40, width // 40 + 1)),
+                center_y + int(rng.integers(-height // 40, height // 40 + 1))
+            )
+            axes = (
+                int(rng.integers(width // 80 + 1, width // 16 + 2)),
+                int(rng.integers(height // 80 + 1, height // 16 + 2))
+            )
+            angle = float(rng.uniform(0, 180))
+            cv2.ellipse(mask, center, axes, angle, 0, 360, 1, -1)
+
+        rle = maskUtils.encode(np.asfortranarray(mask))
+        items.append({
+            'segmentation_counts': rle['counts'].decode('utf-8'),
+            'segmentation_size': [height, width],
+            'bbox': [float(v) for v in maskUtils.toBbox(rle)]
+        })
+
+    return items
+
+
+def legacy_loop(segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The original per-mask loop: full H x W decode for every annotation"""
+    results = []
+    for seg_data in segmentation_data_list:
+        binary_mask = maskUtils.decode({
+            'size': seg_data['segmentation_size'],
+            'counts': seg_data['segmentation_counts'].encode('utf-8')
+        })
+        contours, _ = cv2.findContours(binary_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        polygons = _contours_to_polygons(contours)
+        results.append({
+            "has_segmentation": bool(polygons),
+            "polygons": polygons,
+            "bbox_polygon": bbox_to_polygon(seg_data['bbox'])
+        })
+    return results
+
+
+# Upper bound (bytes) of one stacked decode, as in the removed implementation
+MAX_STACKED_DECODE_BYTES = 256 * 1024 * 1024
+
+
+def stacked_decode(segmentation_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The removed stacked decode: one H x W x N pycocotools decode per group of same-size masks"""
+    results = [
+        {"has_segmentation": False, "polygons": [], "bbox_polygon": bbox_to_polygon(seg_data['bbox'])}
+        for seg_data in segmentation_data_list
+    ]
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, seg_data in enumerate(segmentation_data_list):
+        height, width = seg_data['segmentation_size']
+        groups.setdefault((int(height), int(width)), []).append(i)
+
+    for (height, width), indices in groups.items():
+        chunk_size = max(1, MAX_STACKED_DECODE_BYTES // max(1, height * width))
+        for start in range(0, len(indices), chunk_size):
+            chunk_indices = indices[start:start + chunk_size]
+            rles = [
+                {'size': [height, width], 'counts': segmentation_data_list[i]['segmentation_counts'].encode('utf-8')}
+                for i in chunk_indices
+            ]
+            masks = maskUtils.decode(rles)
+            boxes = maskUtils.toBbox(rles)
+
+            for k, i in enumerate(chunk_indices):
+                x, y, box_width, box_height = (int(v) for v in boxes[k])
+                if box_width <= 0 or box_height <= 0:
+                    continue
+                # 1-pixel background border so contours match the full-frame trace
+                x0, y0 = max(x - 1, 0), max(y - 1, 0)
+                x1, y1 = min(x + box_width + 1, width), min(y + box_height + 1, height)
+                window = np.ascontiguousarray(masks[y0:y1, x0:x1, k], dtype=np.uint8)
+                contours, _ = cv2.findContours(window, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
+                polygons = _contours_to_polygons(contours)
+                if polygons:
+                    results[i]["has_segmentation"] = True
+                    results[i]["polygons"] = polygons
+
+    return results
+
+
+def peak_memory(func, items: List[Dict[str, Any]]) -> int:
+    """Peak traced allocation (bytes) of a single run"""
+    tracemalloc.start()
+    func(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def time_call(func, items: List[Dict[str, Any]], repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RLE to polygon conversion")
+    parser.add_argument("--masks", type=int, default=200, help="Number of masks per image")
+    parser.add_argument("--height", type=int, default=1080, help="Image height")
+    parser.add_argument("--width", type=int, default=1920, help="Image width")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"Generating {args.masks} masks at {args.width}x{args.height}...")
+    items = generate_segmentation_data(args.masks, args.height, args.width, args.seed)
+
+    implementations = [
+        ("per-mask loop ", legacy_loop),
+        ("stacked decode", stacked_decode),
+        ("batch engine  ", process_mask_info_batch)
+    ]
+
+    legacy_result = legacy_loop(items)
+    for name, func in implementations[1:]:
+        if func(items) != legacy_result:
+            raise SystemExit(f"✗ {name.strip()} output differs from the per-mask loop")
+    print("✓ Outputs are identical")
+
+    legacy_time = None
+    print()
+    for name, func in implementations:
+        elapsed = time_call(func, items, args.repeat)
+        peak = peak_memory(func, items)
+        legacy_time = legacy_time or elapsed
+        print(f"  {name} : {elapsed * 1000:9.1f} ms ({elapsed / args.masks * 1000:.2f} ms/mask), "
+              f"peak {peak / 1024 / 1024:6.1f} MB, {legacy_time / elapsed:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
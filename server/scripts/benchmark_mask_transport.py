@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Mask process pool transport benchmark
+
+Runs one page of masks through the process pool the way AnnotationService does
+(chunks of --chunk-size, all chunks in flight at once) and compares the current
+run_in_executor(process_mask_info_batch) path, where polygons come back as
+pickled nested lists, with the shared-memory transport.
+
+사용법:
+    python benchmark_mask_transport.py --masks 2000 --chunk-size 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_mask_processing import generate_segmentation_data
+
+from app.utils.mask_processing import process_mask_info_batch
+from app.utils.mask_transport import MASK_RESULT_TRANSPORTS, run_mask_info_batch
+from app.utils.process_manager import get_process_pool, shutdown_process_pool
+
+
+async def run_page(items: List[Dict[str, Any]], chunk_size: int, transport: str) -> List[Dict[str, Any]]:
+    """Convert one page of masks with every chunk submitted concurrently"""
+    executor = get_process_pool()
+    chunk_results = await asyncio.gather(*[
+        run_mask_info_batch(executor, items[i:i + chunk_size], transport)
+        for i in range(0, len(items), chunk_size)
+    ])
+    return [mask_info for chunk in chunk_results for mask_info in chunk]
+
+
+async def time_page(items: List[Dict[str, Any]], chunk_size: int, transport: str, repeat: int) -> float:
+    """Best wall-clock time of `repeat` pages"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await run_page(items, chunk_size, transport)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark mask process pool result transports")
+    parser.add_argument("--masks", type=int, default=2000, help="Number of masks per page")
+    parser.add_argument("--height", type=int, default=1080, help="Image height")
+    parser.add_argument("--width", type=int, default=1920, help="Image width")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Masks per process pool call")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per transport (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"Generating {args.masks} masks at {args.width}x{args.height}...")
+    items = generate_segmentation_data(args.masks, args.height, args.width, args.seed)
+
+    expected = process_mask_info_batch(items)
+    for transport in MASK_RESULT_TRANSPORTS:
+        # Also warms up the pool workers
+        if await run_page(items, args.chunk_size, transport) != expected:
+            raise SystemExit(f"✗ {transport} transport output differs from process_mask_info_batch")
+    print("✓ Outputs are identical")
+
+    point_count = sum(len(polygon) for mask_info in expected for polygon in mask_info["polygons"])
+    print(f"  {point_count} polygon points per page\n")
+
+    timings = {}
+    for transport in MASK_RESULT_TRANSPORTS:
+        timings[transport] = await time_page(items, args.chunk_size, transport, args.repeat)
+        print(f"  {transport:<14}: {timings[transport] * 1000:9.1f} ms per page "
+              f"({timings[transport] / args.masks * 1000:.3f} ms/mask)")
+
+    baseline = timings[MASK_RESULT_TRANSPORTS[0]]
+    for transport in MASK_RESULT_TRANSPORTS[1:]:
+        print(f"  {transport} speedup: {baseline / timings[transport]:.2f}x")
+
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
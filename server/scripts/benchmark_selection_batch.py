@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+어노테이션 선택 배치 생성 벤치마크 스크립트
+
+Times UserAnnotationSelectionService.create_selections_batch at several batch
+sizes against a scratch Postgres schema seeded with a dataset, a dictionary,
+images and AUTO annotations, and counts the SQL statements (round trips) each
+batch takes. Every batch is submitted twice: once as new selections and once
+again as duplicates of themselves.
+
+The scratch schema is dropped at the end (unless --keep), so it is safe to
+point at a local development database.
+
+사용법:
+    python benchmark_selection_batch.py
+    python benchmark_selection_batch.py --batch-sizes 1 10 100 --rounds 50
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base
+from app.schemas.user_annotation_selection import (
+    UserAnnotationSelectionBatchCreate,
+    UserAnnotationSelectionCreate,
+)
+from app.services.user_annotation_selection_service import UserAnnotationSelectionService
+
+
+SCHEMA = "selection_benchmark"
+ANNOTATIONS_PER_IMAGE = 20
+
+
+async def seed(conn, users: int, images: int, categories: int):
+    """사용자, 딕셔너리, 카테고리, 데이터셋, 이미지, AUTO 어노테이션 생성"""
+    await conn.execute(
+        text("INSERT INTO users (email) SELECT 'bench_' || g || '@example.com' FROM generate_series(1, :users) g"),
+        {"users": users}
+    )
+    await conn.execute(text("INSERT INTO dictionaries (name) VALUES ('benchmark')"))
+    await conn.execute(
+        text("INSERT INTO categories (name) SELECT 'category_' || g FROM generate_series(1, :categories) g"),
+        {"categories": categories}
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO dictionary_categories (dictionary_id, category_id) "
+            "SELECT dictionaries.id, categories.id FROM dictionaries CROSS JOIN categories"
+        )
+    )
+    await conn.execute(text("INSERT INTO datasets (name, dictionary_id) SELECT 'benchmark', id FROM dictionaries"))
+    await conn.execute(
+        text(
+            "INSERT INTO images (file_name, image_url, width, height, dataset_id) "
+            "SELECT 'image_' || g || '.jpg', 'images/image_' || g || '.jpg', 1024, 768, datasets.id "
+            "FROM generate_series(1, :images) g CROSS JOIN datasets"
+        ),
+        {"images": images}
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO annotations (bbox, area, is_crowd, status, source_type, image_id) "
+            "SELECT ARRAY[0, 0, 32, 32]::float8[], 1024, false, 'PENDING', 'AUTO', images.id "
+            "FROM images CROSS JOIN generate_series(1, :per_image) g"
+        ),
+        {"per_image": ANNOTATIONS_PER_IMAGE}
+    )
+    await conn.execute(text("ANALYZE"))
+
+
+async def load_ids(conn, table: str) -> List[int]:
+    result = await conn.execute(text(f"SELECT id FROM {table} ORDER BY id"))
+    return [row[0] for row in result]
+
+
+def make_batch(rng: random.Random, image_annotations: Dict[int, List[int]], category_ids: List[int], size: int):
+    """무작위 선택 배치 (이미지당 어노테이션 1-3개 조합)"""
+    image_ids = list(image_annotations)
+    selections = []
+    for _ in range(size):
+        image_id = rng.choice(image_ids)
+        selections.append(UserAnnotationSelectionCreate(
+            image_id=image_id,
+            selected_annotation_ids=rng.sample(image_annotations[image_id], rng.randint(1, 3)),
+            category_id=rng.choice(category_ids)
+        ))
+    return UserAnnotationSelectionBatchCreate(selections=selections)
+
+
+def summarize(label: str, durations: List[float], statements: List[int]):
+    durations_ms = sorted(d * 1000 for d in durations)
+    p95 = durations_ms[min(len(durations_ms) - 1, int(len(durations_ms) * 0.95))]
+    print(f"  {label:<22} median {statistics.median(durations_ms):8.2f} ms   p95 {p95:8.2f} ms   "
+          f"statements/batch {statistics.mean(statements):6.1f}")
+
+
+async def run_benchmark(database_url: str, batch_sizes: List[int], rounds: int, images: int, categories: int, keep: bool):
+    """스키마 생성, 데이터 시딩, 배치 크기별 측정"""
+    engine = create_async_engine(database_url, connect_args={"server_settings": {"search_path": SCHEMA}})
+    statement_count = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        nonlocal statement_count
+        statement_count += 1
+
+    try:
+        async with engine.begin() as conn:
+            print(f"\n=== Seeding schema '{SCHEMA}' ({images} images, {categories} categories) ===")
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+            await seed(conn, users=len(batch_sizes) * rounds, images=images, categories=categories)
+
+            user_ids = await load_ids(conn, "users")
+            category_ids = await load_ids(conn, "categories")
+            result = await conn.execute(text("SELECT image_id, id FROM annotations ORDER BY image_id, id"))
+            image_annotations: Dict[int, List[int]] = {}
+            for image_id, annotation_id in result:
+                image_annotations.setdefault(image_id, []).append(annotation_id)
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        rng = random.Random(42)
+        users = iter(user_ids)
+
+        print(f"\n=== create_selections_batch ({rounds} rounds per batch size) ===")
+        for batch_size in batch_sizes:
+            timings = {"new": ([], []), "duplicate": ([], [])}
+
+            for _ in range(rounds):
+                # A fresh user per round: the first submission inserts, the second only hits duplicates
+                user_id = next(users)
+                batch = make_batch(rng, image_annotations, category_ids, batch_size)
+
+                for kind in ("new", "duplicate"):
+                    async with session_factory() as session:
+                        service = UserAnnotationSelectionService(session)
+                        statement_count = 0
+                        started_at = time.perf_counter()
+                        await service.create_selections_batch(user_id, batch)
+                        timings[kind][0].append(time.perf_counter() - started_at)
+                        timings[kind][1].append(statement_count)
+
+            print(f"\n  batch size {batch_size}")
+            summarize("new selections", *timings["new"])
+            summarize("duplicate selections", *timings["duplicate"])
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        else:
+            print(f"\n   Kept schema '{SCHEMA}'")
+        await engine.dispose()
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Benchmark batch annotation selection creation")
+    parser.add_argument("--database-url", default=settings.database_url, help="Postgres URL (asyncpg)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100], help="Selections per batch")
+    parser.add_argument("--rounds", type=int, default=30, help="Batches per batch size")
+    parser.add_argument("--images", type=int, default=2000, help="Seeded images")
+    parser.add_argument("--categories", type=int, default=80, help="Seeded categories")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the '{SCHEMA}' schema after the run")
+
+    args = parser.parse_args()
+
+    await run_benchmark(args.database_url, args.batch_sizes, args.rounds, args.images, args.categories, args.keep)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
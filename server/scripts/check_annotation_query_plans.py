@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+annotation 주요 조회 쿼리의 실행 계획 회귀 검사 스크립트
+
+Creates the schema from the models in a scratch Postgres schema, seeds it with
+synthetic images and annotations, runs ANALYZE and checks that the EXPLAIN plan
+of every hot annotation query uses the index it was built for. Everything runs
+in one transaction that is rolled back at the end (unless --keep), so it is
+safe to point at a local development database.
+
+Exits with status 1 if any plan stopped using its index.
+
+사용법:
+    python check_annotation_query_plans.py
+    python check_annotation_query_plans.py --annotations 500000 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import Base
+from app.models import Annotation
+from app.utils.counting import explain_plan
+from app.utils.pagination import apply_keyset_pagination, encode_cursor
+
+
+SCHEMA = "plan_check"
+PAGE_SIZE = 25
+IMAGE_ID = 42
+CATEGORY_ID = 7
+
+
+def build_checks() -> List[Dict[str, Any]]:
+    """(name, statement, index expected in the plan) for each hot query"""
+    approved_user = [Annotation.source_type == "USER", Annotation.status == "APPROVED"]
+
+    def listing(conditions, sort_key, sort_column, nullable=False, cursor=None):
+        return apply_keyset_pagination(
+            select(Annotation).where(*conditions), sort_key, sort_column, Annotation.id,
+            descending=True, cursor=cursor, limit=PAGE_SIZE, nullable=nullable
+        )
+
+    return [
+        {
+            "name": "image approved user annotations",
+            "query": select(Annotation).where(Annotation.image_id == IMAGE_ID, *approved_user),
+            "index": "idx_annotations_image_source_status"
+        },
+        {
+            "name": "image annotations by source type",
+            "query": select(Annotation).where(Annotation.source_type == "AUTO", Annotation.image_id == IMAGE_ID),
+            "index": "idx_annotations_image_source_status"
+        },
+        {
+            "name": "approved user annotations, first page",
+            "query": listing(approved_user, "updated_at", Annotation.updated_at),
+            "index": "idx_annotations_user_approved_updated_at"
+        },
+        {
+            "name": "approved user annotations, cursor page",
+            "query": listing(
+                approved_user, "updated_at", Annotation.updated_at,
+                cursor=encode_cursor("updated_at", datetime.now(timezone.utc) - timedelta(hours=6), 1000)
+            ),
+            "index": "idx_annotations_user_approved_updated_at"
+        },
+        {
+            "name": "status + source type filter sorted by updated_at",
+            "query": listing(
+                [Annotation.status == "REJECTED", Annotation.source_type == "AUTO"],
+                "updated_at", Annotation.updated_at
+            ),
+            "index": "idx_annotations_source_status_updated_at"
+        },
+        {
+            "name": "category filter sorted by updated_at",
+            "query": listing([Annotation.category_id == CATEGORY_ID], "updated_at", Annotation.updated_at),
+            "index": "idx_annotations_category_updated_at_id"
+        },
+        {
+            "name": "category filter sorted by area",
+            "query": listing([Annotation.category_id == CATEGORY_ID], "area", Annotation.area, nullable=True),
+            "index": "idx_annotations_category_area_id"
+        },
+    ]
+
+
+def plan_indexes(plan: Dict[str, Any]) -> Set[str]:
+    """Names of all indexes used anywhere in a plan tree"""
+    indexes = set()
+    if "Index Name" in plan:
+        indexes.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        indexes |= plan_indexes(child)
+    return indexes
+
+
+def plan_summary(plan: Dict[str, Any]) -> str:
+    """One line description of a plan tree (node types and indexes)"""
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node += f" using {plan['Index Name']}"
+    children = [plan_summary(child) for child in plan.get("Plans", [])]
+    return node + (f" -> {', '.join(children)}" if children else "")
+
+
+async def seed(conn, images: int, categories: int, annotations: int):
+    """합성 데이터 생성 (USER+APPROVED 5%, area NULL 5%)"""
+    await conn.execute(
+        text(
+            "INSERT INTO images (file_name, image_url, width, height) "
+            "SELECT 'image_' || g || '.jpg', 'images/image_' || g || '.jpg', 1024, 768 "
+            "FROM generate_series(1, :images) g"
+        ),
+        {"images": images}
+    )
+    await conn.execute(
+        text("INSERT INTO categories (name) SELECT 'category_' || g FROM generate_series(1, :categories) g"),
+        {"categories": categories}
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO annotations "
+            "(bbox, area, is_crowd, status, source_type, image_id, category_id, created_at, updated_at) "
+            "SELECT ARRAY[0, 0, 32, 32]::float8[], "
+            "CASE WHEN g % 20 = 0 THEN NULL ELSE (g % 5000)::float8 END, false, "
+            "CASE WHEN g % 10 < 7 THEN 'PENDING' WHEN g % 10 < 9 THEN 'APPROVED' ELSE 'REJECTED' END, "
+            "CASE WHEN g % 4 = 0 THEN 'USER' ELSE 'AUTO' END, "
+            "1 + g % :images, 1 + g % :categories, "
+            "now() - make_interval(secs => g), now() - make_interval(secs => g / 2) "
+            "FROM generate_series(1, :annotations) g"
+        ),
+        {"images": images, "categories": categories, "annotations": annotations}
+    )
+    await conn.execute(text("ANALYZE images"))
+    await conn.execute(text("ANALYZE categories"))
+    await conn.execute(text("ANALYZE annotations"))
+
+
+async def check_query_plans(database_url: str, images: int, categories: int, annotations: int, keep: bool) -> bool:
+    """스키마 생성, 데이터 시딩, EXPLAIN 검사"""
+    engine = create_async_engine(database_url)
+    failures = 0
+
+    try:
+        async with engine.connect() as conn:
+            print(f"\n=== Seeding schema '{SCHEMA}' ({images} images, {annotations} annotations) ===")
+            started_at = time.time()
+
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            # Unqualified tables, types and indexes resolve to the scratch schema only
+            await conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+            await seed(conn, images, categories, annotations)
+            print(f"   Seeded in {time.time() - started_at:.1f}s")
+
+            print(f"\n=== Checking query plans ===")
+            for check in build_checks():
+                plan = await explain_plan(conn, check["query"])
+                if check["index"] in plan_indexes(plan):
+                    print(f"  ✓ {check['name']}")
+                else:
+                    failures += 1
+                    print(f"  ✗ {check['name']}: expected {check['index']}")
+                    print(f"      plan: {plan_summary(plan)}")
+
+            if keep:
+                await conn.commit()
+                print(f"\n   Kept schema '{SCHEMA}'")
+            else:
+                await conn.rollback()
+    finally:
+        await engine.dispose()
+
+    print(f"\n=== {failures} plan regression(s) ===" if failures else "\n=== All plans use their indexes ===")
+    return failures == 0
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Check that annotation hot queries use their indexes")
+    parser.add_argument("--database-url", default=settings.database_url, help="Postgres URL (asyncpg)")
+    parser.add_argument("--images", type=int, default=20000, help="Seeded images")
+    parser.add_argument("--categories", type=int, default=80, help="Seeded categories")
+    parser.add_argument("--annotations", type=int, default=300000, help="Seeded annotations")
+    parser.add_argument("--keep", action="store_true", help=f"Commit the seeded '{SCHEMA}' schema instead of rolling back")
+
+    args = parser.parse_args()
+
+    ok = await check_query_plans(args.database_url, args.images, args.categories, args.annotations, args.keep)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+데이터셋을 COCO JSON 파일로 내보내는 스크립트
+
+Streams the same document as GET /datasets/{id}/export?format=coco straight to a
+file, so memory use does not grow with the dataset. Output ending in .gz is
+gzip-compressed on the fly.
+
+사용법:
+    python export_coco.py --dataset-id 1 --output dataset_1.json
+    python export_coco.py --dataset-id 1 --output dataset_1.json.gz --segmentation polygon
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.services.export_service import SEGMENTATION_FORMATS, DatasetExportService, gzip_stream
+
+
+async def export_coco(dataset_id: int, output: Path, segmentation: str, status: str, gzip: bool):
+    """COCO 문서를 chunk 단위로 파일에 기록"""
+    print(f"\n=== Exporting dataset {dataset_id} to {output} (segmentation: {segmentation}) ===")
+
+    started_at = time.time()
+    bytes_written = 0
+
+    async with AsyncSessionLocal() as session:
+        chunks = DatasetExportService(session).stream_coco(dataset_id, segmentation=segmentation, status=status)
+        if gzip:
+            chunks = gzip_stream(chunks)
+
+        with open(output, "wb") as f:
+            try:
+                async for chunk in chunks:
+                    f.write(chunk)
+                    bytes_written += len(chunk)
+            except ValueError as e:
+                print(f"  ✗ {e}")
+                output.unlink(missing_ok=True)
+                return
+
+    elapsed = time.time() - started_at
+    print(f"\n=== Export finished ===")
+    print(f"   File: {output} ({bytes_written / 1024 / 1024:.1f} MB)")
+    print(f"   Total time: {elapsed:.2f}s")
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Export a dataset as a COCO JSON document")
+    parser.add_argument("--dataset-id", type=int, required=True, help="Dataset to export")
+    parser.add_argument("--output", type=Path, required=True, help="Output file (.gz suffix enables gzip)")
+    parser.add_argument("--segmentation", choices=SEGMENTATION_FORMATS, default="rle",
+                        help="Segmentation encoding")
+    parser.add_argument("--status", default=None, help="Only export annotations with this status")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output regardless of the file suffix")
+
+    args = parser.parse_args()
+
+    await export_coco(
+        dataset_id=args.dataset_id,
+        output=args.output,
+        segmentation=args.segmentation,
+        status=args.status,
+        gzip=args.gzip or args.output.suffix == ".gz"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
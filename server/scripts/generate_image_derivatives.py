@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+기존 이미지의 썸네일/중간 크기 파생본 생성 스크립트
+
+New first-person uploads get their derivatives right after upload. This
+script backfills images stored in the storage backend that have none yet
+(or all of them with --force), walking images in id order with a few images
+in flight at a time.
+
+사용법:
+    python generate_image_derivatives.py
+    python generate_image_derivatives.py --dataset-id 1 --concurrency 8
+    python generate_image_derivatives.py --force --limit 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Image
+from app.services.image_service import ImageService
+from app.utils.process_manager import shutdown_process_pool
+from app.utils.storage import shutdown_storage
+
+
+async def generate_one(image_id: int, semaphore: asyncio.Semaphore) -> bool:
+    """이미지 1개의 파생본 생성 (이미지마다 별도 세션)"""
+    async with semaphore:
+        async with AsyncSessionLocal() as session:
+            try:
+                await ImageService(session).generate_derivatives(image_id)
+                return True
+            except Exception as e:
+                print(f"  ✗ image {image_id}: {e}")
+                return False
+
+
+async def generate_derivatives(
+    dataset_id: Optional[int],
+    batch_size: int,
+    concurrency: int,
+    limit: Optional[int],
+    force: bool
+):
+    """파생본이 없는 이미지를 id 순서로 처리"""
+    print(f"\n=== Generating {settings.image_derivative_format} derivatives "
+          f"(thumbnail {settings.image_thumbnail_size}px, medium {settings.image_medium_size}px) ===")
+
+    started_at = time.time()
+    semaphore = asyncio.Semaphore(concurrency)
+    last_id = 0
+    done = 0
+    failed = 0
+
+    while limit is None or done + failed < limit:
+        query = select(Image.id).where(
+            Image.id > last_id,
+            ~Image.image_url.startswith("http"),
+            ~Image.image_url.startswith("data:")
+        )
+        if not force:
+            query = query.where(Image.has_derivatives.is_(False))
+        if dataset_id is not None:
+            query = query.where(Image.dataset_id == dataset_id)
+
+        page_size = batch_size if limit is None else min(batch_size, limit - done - failed)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(query.order_by(Image.id).limit(page_size))
+            image_ids = list(result.scalars().all())
+        if not image_ids:
+            break
+
+        results = await asyncio.gather(*[generate_one(image_id, semaphore) for image_id in image_ids])
+        done += sum(results)
+        failed += len(results) - sum(results)
+        last_id = image_ids[-1]
+
+        elapsed = time.time() - started_at
+        print(f"  {done} done, {failed} failed ({done / elapsed:.1f} images/s)")
+
+    elapsed = time.time() - started_at
+    print(f"\n=== Finished ===")
+    print(f"   Images: {done} done, {failed} failed")
+    print(f"   Total time: {elapsed:.2f}s")
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Backfill thumbnail and medium image derivatives")
+    parser.add_argument("--dataset-id", type=int, default=None, help="Only images of this dataset")
+    parser.add_argument("--batch-size", type=int, default=200, help="Image ids fetched per query")
+    parser.add_argument("--concurrency", type=int, default=4, help="Images processed at the same time")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many images")
+    parser.add_argument("--force", action="store_true", help="Regenerate images that already have derivatives")
+
+    args = parser.parse_args()
+
+    try:
+        await generate_derivatives(
+            dataset_id=args.dataset_id,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            limit=args.limit,
+            force=args.force
+        )
+    finally:
+        shutdown_storage()
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
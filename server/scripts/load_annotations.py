@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import AsyncSessionLocal
 from app.schemas.image import ImageCreate
 from app.schemas.annotation import AnnotationCreate
+from app.services.dataset_service import DatasetService
 from app.utils.mask_processing import process_mask_info_batch
 from app.utils.process_manager import get_process_pool
 
@@ -315,6 +316,11 @@ async def process_batch_streaming(image_files: List[Path], annotation_files: Lis
     ann_create_time = time.time() - ann_create_start
     print(f"\n   All annotation batches completed in {ann_create_time:.2f}s")
     
+    # 일괄 적재는 서비스 쓰기 경로를 거치지 않으므로 데이터셋 통계를 재계산
+    async with AsyncSessionLocal() as session:
+        await DatasetService(session).refresh_counts(dataset_id)
+    print(f"   Dataset {dataset_id} image/annotation counts refreshed")
+    
     total_time = time.time() - batch_start_time
     print(f"\n=== Streaming batch processing completed successfully ===")
     print(f"   Files processed: {len(image_files)}")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+선택 병합 작업 워커
+
+Drains the merge_jobs queue filled by auto-approval of annotation selections
+(selection_merge_mode = "queue"): claims runnable jobs with FOR UPDATE SKIP
+LOCKED, merges each job's masks on the mask process pool and writes the merged
+annotation. Any number of workers can run side by side. Jobs of a worker that
+died are requeued after merge_job_lease_seconds.
+
+Queue depth, job latency and outcomes are exported as opengraph_merge_job_*
+metrics on --metrics-port. SIGINT/SIGTERM finish the jobs in flight and stop.
+
+사용법:
+    python merge_worker.py
+    python merge_worker.py --batch-size 8 --metrics-port 9102
+    python merge_worker.py --once
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+from collections import Counter
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from prometheus_client import start_http_server
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.merge_job_service import MergeJobService
+from app.utils.process_manager import get_process_pool_workers, shutdown_process_pool
+
+
+async def process_jobs(session_factory: async_sessionmaker, worker_id: str, batch_size: int) -> Counter:
+    """
+    Requeue stale jobs, claim up to batch_size jobs and run them concurrently
+
+    Returns:
+        Counter: Jobs per outcome (empty if nothing was runnable)
+    """
+    async with session_factory() as session:
+        service = MergeJobService(session)
+        requeued = await service.requeue_stale_jobs()
+        if requeued:
+            print(f"  ↺ requeued {requeued} stale jobs")
+        jobs = await service.claim_jobs(worker_id, batch_size)
+
+    async def run(job):
+        # One session per job: each job commits or rolls back on its own
+        async with session_factory() as session:
+            return await MergeJobService(session).run_job(job)
+
+    return Counter(await asyncio.gather(*[run(job) for job in jobs]))
+
+
+async def update_metrics(session_factory: async_sessionmaker) -> None:
+    async with session_factory() as session:
+        await MergeJobService(session).update_queue_metrics()
+
+
+async def run_worker(batch_size: int, poll_interval: float, once: bool):
+    """큐가 빌 때마다 poll_interval 동안 대기하며 작업 처리"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"\n=== Merge worker {worker_id} (batch {batch_size}, max attempts {settings.merge_job_max_attempts}) ===")
+    totals = Counter()
+
+    while not stop.is_set():
+        outcomes = await process_jobs(AsyncSessionLocal, worker_id, batch_size)
+        await update_metrics(AsyncSessionLocal)
+
+        if outcomes:
+            totals.update(outcomes)
+            print(f"  {sum(outcomes.values())} jobs: " + ", ".join(f"{count} {outcome}" for outcome, count in outcomes.items()))
+            continue
+        if once:
+            break
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    print(f"\n=== Stopped ===")
+    print(f"   Jobs: " + (", ".join(f"{count} {outcome}" for outcome, count in totals.items()) or "none"))
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Run merge jobs of approved annotation selections")
+    parser.add_argument("--batch-size", type=int, default=get_process_pool_workers(), help="Jobs claimed and run at a time (default: process pool workers)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--once", action="store_true", help="Exit once no job is runnable")
+
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+        print(f"📊 Prometheus metrics on :{args.metrics_port}/metrics")
+
+    try:
+        await run_worker(batch_size=args.batch_size, poll_interval=args.poll_interval, once=args.once)
+    finally:
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+어노테이션 선택 자동 승인 동시성 스트레스 테스트 스크립트
+
+Fires hundreds of annotation selections at once, many users choosing the same
+(image, annotations, category) groups, through UserAnnotationSelectionService
+against a scratch Postgres schema, and checks that every group was approved
+and merged into exactly one annotation, no matter how many requests saw it
+cross the approval threshold together.
+
+Each seeded image has AUTO annotations with real RLE masks (vertical stripes)
+and one selection group. In "single" mode every user submits each group as a
+separate create_selection call; in "batch" mode every user submits all groups
+in one create_selections_batch call. With selection_merge_mode = "queue" the
+queued merge jobs are then drained in-process (as scripts/merge_worker.py
+would) and every group must have exactly one DONE job. Exits with status 1 if
+any check fails.
+
+The scratch schema is dropped at the end (unless --keep), so it is safe to
+point at a local development database.
+
+사용법:
+    python stress_selection_approval.py
+    python stress_selection_approval.py --groups 50 --users 20 --modes single
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base
+from app.schemas.user_annotation_selection import (
+    UserAnnotationSelectionBatchCreate,
+    UserAnnotationSelectionCreate,
+)
+from app.services.user_annotation_selection_service import APPROVAL_THRESHOLD, UserAnnotationSelectionService
+from app.utils.process_manager import shutdown_process_pool
+from app.utils.rle import encode_rle_counts
+from merge_worker import process_jobs
+
+
+SCHEMA = "selection_stress"
+IMAGE_SIZE = 64
+STRIPE_WIDTH = 4
+ANNOTATIONS_PER_IMAGE = 8
+MODES = ["single", "batch"]
+
+
+def stripe_annotation(index: int) -> dict:
+    """이미지의 index번째 세로 줄무늬 마스크 (COCO RLE는 column-major)"""
+    start = index * STRIPE_WIDTH * IMAGE_SIZE
+    length = STRIPE_WIDTH * IMAGE_SIZE
+    return {
+        "counts": encode_rle_counts([start, length, IMAGE_SIZE * IMAGE_SIZE - start - length]),
+        "x": index * STRIPE_WIDTH,
+        "area": length
+    }
+
+
+async def seed(conn, users: int, groups: int):
+    """사용자, 딕셔너리, 카테고리, 데이터셋, 이미지(그룹당 1개), 마스크가 있는 AUTO 어노테이션 생성"""
+    await conn.execute(
+        text("INSERT INTO users (email) SELECT 'stress_' || g || '@example.com' FROM generate_series(1, :users) g"),
+        {"users": users}
+    )
+    await conn.execute(text("INSERT INTO dictionaries (name) VALUES ('stress')"))
+    await conn.execute(text("INSERT INTO categories (name) VALUES ('stress')"))
+    await conn.execute(
+        text(
+            "INSERT INTO dictionary_categories (dictionary_id, category_id) "
+            "SELECT dictionaries.id, categories.id FROM dictionaries CROSS JOIN categories"
+        )
+    )
+    await conn.execute(text("INSERT INTO datasets (name, dictionary_id) SELECT 'stress', id FROM dictionaries"))
+    await conn.execute(
+        text(
+            "INSERT INTO images (file_name, image_url, width, height, dataset_id) "
+            "SELECT 'image_' || g || '.png', 'images/image_' || g || '.png', :size, :size, datasets.id "
+            "FROM generate_series(1, :groups) g CROSS JOIN datasets"
+        ),
+        {"groups": groups, "size": IMAGE_SIZE}
+    )
+    for index in range(ANNOTATIONS_PER_IMAGE):
+        stripe = stripe_annotation(index)
+        await conn.execute(
+            text(
+                "INSERT INTO annotations (bbox, area, segmentation_size, segmentation_counts, "
+                "is_crowd, status, source_type, image_id) "
+                "SELECT ARRAY[:x, 0, :width, :size]::float8[], :area, ARRAY[:size, :size]::bigint[], :counts, "
+                "false, 'PENDING', 'AUTO', images.id FROM images"
+            ),
+            {"x": stripe["x"], "width": STRIPE_WIDTH, "size": IMAGE_SIZE, "area": stripe["area"], "counts": stripe["counts"]}
+        )
+
+
+async def load_ids(conn, table: str) -> List[int]:
+    result = await conn.execute(text(f"SELECT id FROM {table} ORDER BY id"))
+    return [row[0] for row in result]
+
+
+async def fire_selections(session_factory, mode: str, user_ids: List[int], selections: List[UserAnnotationSelectionCreate]):
+    """모든 요청을 동시에 실행하고 (소요 시간, 실패 목록) 반환"""
+    async def create_one(user_id: int, selection: UserAnnotationSelectionCreate):
+        async with session_factory() as session:
+            await UserAnnotationSelectionService(session).create_selection(user_id, selection)
+
+    async def create_batch(user_id: int):
+        async with session_factory() as session:
+            await UserAnnotationSelectionService(session).create_selections_batch(
+                user_id,
+                UserAnnotationSelectionBatchCreate(selections=selections)
+            )
+
+    if mode == "single":
+        requests = [create_one(user_id, selection) for user_id in user_ids for selection in selections]
+    else:
+        requests = [create_batch(user_id) for user_id in user_ids]
+
+    print(f"   Firing {len(requests)} concurrent {mode} requests")
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*requests, return_exceptions=True)
+    elapsed = time.perf_counter() - started_at
+
+    return elapsed, [result for result in results if isinstance(result, BaseException)]
+
+
+async def drain_merge_jobs(session_factory) -> int:
+    """큐가 빌 때까지 병합 작업 실행, 실행한 작업 수 반환"""
+    processed = 0
+    while True:
+        outcomes = await process_jobs(session_factory, "stress", batch_size=16)
+        if not outcomes:
+            return processed
+        processed += sum(outcomes.values())
+
+
+async def verify(conn, groups: int, users: int) -> List[str]:
+    """그룹마다 병합 어노테이션 1개, 승인 상태, 집계값 일치 여부 확인"""
+    problems = []
+
+    result = await conn.execute(
+        text(
+            "SELECT images.id, count(annotations.id) FROM images "
+            "LEFT JOIN annotations ON annotations.image_id = images.id AND annotations.source_type = 'USER' "
+            "GROUP BY images.id ORDER BY images.id"
+        )
+    )
+    for image_id, merged in result:
+        if merged != 1:
+            problems.append(f"image {image_id}: {merged} merged annotations (expected 1)")
+
+    result = await conn.execute(
+        text(
+            "SELECT consensus.image_id, consensus.status, consensus.merged_annotation_id, "
+            "consensus.selection_count, consensus.pending_count, "
+            "count(selections.id), count(selections.id) FILTER (WHERE selections.status = 'PENDING'), "
+            "count(selections.id) FILTER (WHERE selections.status = 'APPROVED') "
+            "FROM selection_consensus consensus "
+            "JOIN user_annotation_selections selections "
+            "  ON selections.image_id = consensus.image_id "
+            " AND selections.selection_hash = consensus.selection_hash "
+            " AND selections.category_id IS NOT DISTINCT FROM consensus.category_id "
+            "GROUP BY consensus.id ORDER BY consensus.image_id"
+        )
+    )
+    rows = result.all()
+    if len(rows) != groups:
+        problems.append(f"{len(rows)} consensus groups (expected {groups})")
+
+    for image_id, status, merged_annotation_id, selection_count, pending_count, total, pending, approved in rows:
+        if status != "APPROVED" or merged_annotation_id is None:
+            problems.append(f"image {image_id}: group {status}, merged_annotation_id={merged_annotation_id}")
+        if total != users or selection_count != total:
+            problems.append(f"image {image_id}: {total} selections, selection_count={selection_count} (expected {users})")
+        if pending_count != pending:
+            problems.append(f"image {image_id}: pending_count={pending_count} but {pending} PENDING selections")
+        if approved < APPROVAL_THRESHOLD:
+            problems.append(f"image {image_id}: only {approved} approved selections")
+
+    if settings.selection_merge_mode == "queue":
+        result = await conn.execute(
+            text(
+                "SELECT consensus.image_id, count(jobs.id), count(jobs.id) FILTER (WHERE jobs.status = 'DONE') "
+                "FROM selection_consensus consensus LEFT JOIN merge_jobs jobs ON jobs.consensus_id = consensus.id "
+                "GROUP BY consensus.image_id ORDER BY consensus.image_id"
+            )
+        )
+        for image_id, jobs, done in result:
+            if jobs != 1 or done != 1:
+                problems.append(f"image {image_id}: {jobs} merge jobs, {done} done (expected 1)")
+
+    return problems
+
+
+async def run_stress(database_url: str, modes: List[str], groups: int, users: int, connections: int, keep: bool) -> bool:
+    """모드별로 스키마 생성, 시딩, 동시 요청, 검증"""
+    engine = create_async_engine(
+        database_url,
+        pool_size=connections,
+        max_overflow=0,
+        pool_timeout=300,
+        connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    passed = True
+
+    try:
+        for mode in modes:
+            async with engine.begin() as conn:
+                print(f"\n=== {mode}: seeding schema '{SCHEMA}' ({groups} groups x {users} users) ===")
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+                await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+                await seed(conn, users=users, groups=groups)
+
+                user_ids = await load_ids(conn, "users")
+                category_id = (await load_ids(conn, "categories"))[0]
+                result = await conn.execute(
+                    text("SELECT image_id, min(id), max(id) FROM annotations GROUP BY image_id ORDER BY image_id")
+                )
+                # One group per image: its first and last stripe
+                selections = [
+                    UserAnnotationSelectionCreate(
+                        image_id=image_id,
+                        selected_annotation_ids=[first_id, last_id],
+                        category_id=category_id
+                    )
+                    for image_id, first_id, last_id in result
+                ]
+
+            elapsed, failures = await fire_selections(session_factory, mode, user_ids, selections)
+            print(f"   Finished in {elapsed:.2f}s, {len(failures)} failed requests")
+            for failure in failures[:5]:
+                print(f"   ✗ {type(failure).__name__}: {failure}")
+
+            if settings.selection_merge_mode == "queue":
+                processed = await drain_merge_jobs(session_factory)
+                print(f"   Drained {processed} merge jobs")
+
+            async with engine.connect() as conn:
+                problems = await verify(conn, groups=groups, users=users)
+
+            if failures or problems:
+                passed = False
+                print(f"   ❌ {len(problems)} problems")
+                for problem in problems[:20]:
+                    print(f"      - {problem}")
+            else:
+                print(f"   ✅ {groups} groups approved, exactly one merged annotation each")
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        else:
+            print(f"\n   Kept schema '{SCHEMA}'")
+        await engine.dispose()
+        shutdown_process_pool()
+
+    return passed
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Stress concurrent auto-approval of annotation selections")
+    parser.add_argument("--database-url", default=settings.database_url, help="Postgres URL (asyncpg)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Request types to run")
+    parser.add_argument("--groups", type=int, default=20, help="Selection groups (one image each)")
+    parser.add_argument("--users", type=int, default=15, help=f"Users selecting every group (threshold {APPROVAL_THRESHOLD})")
+    parser.add_argument("--connections", type=int, default=40, help="Database connections shared by the requests")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the '{SCHEMA}' schema after the run")
+
+    args = parser.parse_args()
+
+    passed = await run_stress(args.database_url, args.modes, args.groups, args.users, args.connections, args.keep)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())